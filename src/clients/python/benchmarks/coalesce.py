@@ -0,0 +1,69 @@
+"""
+Measures how throughput scales with the number of coroutines each creating one transfer at a time,
+comparing `ClientAsync` directly against coalescing through `BatcherAsync`.
+
+Needs a running cluster, with its address in `TB_ADDRESS`. Batches grow up to one transfer per
+coroutine, so a development cluster needs `--experimental --limit-request=1MiB`:
+
+    TB_ADDRESS=3000 PYTHONPATH=src python3 benchmarks/coalesce.py
+"""
+import asyncio
+import os
+import time
+
+import tigerbeetle as tb
+
+TRANSFERS_PER_COROUTINE = 100
+COROUTINES = [1, 16, 64, 256, 1024]
+
+
+async def create_transfers(client, debit_account_id, credit_account_id):
+    for _ in range(TRANSFERS_PER_COROUTINE):
+        results = await client.create_transfers([tb.Transfer(
+            id=tb.id(),
+            debit_account_id=debit_account_id,
+            credit_account_id=credit_account_id,
+            amount=1,
+            ledger=1,
+            code=1,
+        )])
+        assert results[0].status == tb.CreateTransferStatus.CREATED
+
+
+async def benchmark(name, client, coroutines, debit_account_id, credit_account_id):
+    start = time.perf_counter_ns()
+    await asyncio.gather(*[
+        create_transfers(client, debit_account_id, credit_account_id)
+        for _ in range(coroutines)
+    ])
+    duration_ns = time.perf_counter_ns() - start
+
+    transfers_per_second = (coroutines * TRANSFERS_PER_COROUTINE * 1_000_000_000) // duration_ns
+    print(f"{name:<12} {coroutines:>6} coroutines {transfers_per_second:>12,} transfers/s")
+    return transfers_per_second
+
+
+async def main():
+    client = tb.ClientAsync(cluster_id=0, replica_addresses=os.getenv("TB_ADDRESS", "3000"))
+    batcher = tb.BatcherAsync(client)
+
+    debit_account_id = tb.id()
+    credit_account_id = tb.id()
+    results = await client.create_accounts([
+        tb.Account(id=debit_account_id, ledger=1, code=1),
+        tb.Account(id=credit_account_id, ledger=1, code=1),
+    ])
+    assert all(result.status == tb.CreateAccountStatus.CREATED for result in results)
+
+    for coroutines in COROUTINES:
+        baseline = await benchmark("ClientAsync", client, coroutines,
+                                   debit_account_id, credit_account_id)
+        coalesced = await benchmark("BatcherAsync", batcher, coroutines,
+                                    debit_account_id, credit_account_id)
+        print(f"{'speedup':<12} {coroutines:>6} coroutines {coalesced / baseline:>12.2f}x")
+
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
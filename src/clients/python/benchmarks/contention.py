@@ -0,0 +1,71 @@
+"""
+Measures the client's per-request bookkeeping under contention: acquiring a packet, registering it
+as in flight, correlating its completion back to the client and packet, and releasing it - from 1,
+8 and 64 threads sharing a single client.
+
+This is the work every request does on either side of the FFI call, apart from encoding and
+decoding, so the round trip itself (and the echo client's ~10ms tick, which would hide everything
+else) is left out: completions are correlated here exactly as `Client._c_on_completion` does.
+
+Doesn't need a running cluster:
+
+    PYTHONPATH=src python3 benchmarks/contention.py
+"""
+import argparse
+import threading
+import time
+
+import tigerbeetle as tb
+
+THREADS = [1, 8, 64]
+
+
+def run(client, requests):
+    events = [1]
+    operation = tb.Operation.LOOKUP_ACCOUNTS
+    c_event_type, c_result_type = tb.bindings.OPERATION_CTYPES[operation]
+    for _ in range(requests):
+        inflight_packet = client._acquire_packet(operation, events, c_event_type, c_result_type,
+                                                 tb.ResultFormat.OBJECTS)
+        client._inflight_packets[inflight_packet.packet.user_data] = inflight_packet
+
+        # The completion, as seen from the client's thread.
+        completed = tb.ClientSync._clients[client._client_key]
+        assert completed._inflight_packets[inflight_packet.packet.user_data] is inflight_packet
+
+        del client._inflight_packets[inflight_packet.packet.user_data]
+        client._pool.release(inflight_packet)
+
+
+def benchmark(client, threads, requests):
+    # Warm up the pools.
+    run(client, 100)
+
+    workers = [threading.Thread(target=run, args=(client, requests)) for _ in range(threads)]
+    start = time.perf_counter_ns()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    duration_ns = time.perf_counter_ns() - start
+
+    count = requests * threads
+    print(f"threads={threads:<3} {duration_ns / count:8.1f} ns/request "
+          f"{count * 1e9 / duration_ns:12.0f} requests/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20_000,
+                        help="the number of requests per thread")
+    parser.add_argument("--threads", nargs="+", type=int, default=THREADS)
+    args = parser.parse_args()
+
+    with tb.ClientSync.echo() as client:
+        for threads in args.threads:
+            benchmark(client, threads, args.requests)
+        print(client.pool_stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Measures the Python client's own overhead - encoding, the FFI round trip and decoding - for each
+operation, apart from any cluster, by running it against an echo client, which replies to every
+request with its events (decoded as such).
+
+The echo client still batches and ticks like a real one, so latencies include its ~10ms tick, and
+small batches are bound by it. `cpu_ns_per_event` (the process CPU time spent per event, mostly in
+Python) is the figure least affected by this, and the best one to track for regressions.
+
+Every combination of operation, batch size, mode (`ClientSync` or `ClientAsync`) and concurrency
+(threads or coroutines submitting at once) is run for about `--duration` seconds. Each result is
+written to stdout as a line of JSON, to be kept and compared between releases, and summarized on
+stderr:
+
+    PYTHONPATH=src python3 benchmarks/echo.py > echo.jsonl
+    PYTHONPATH=src python3 benchmarks/echo.py --operations create_transfers --batch-sizes 8189 \
+        --modes async --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import threading
+import time
+
+import tigerbeetle as tb
+
+BATCH_MAX = 8189
+BATCH_SIZES = [1, 16, 256, 1024, BATCH_MAX]
+# The number of threads (sync) or coroutines (async) submitting at once.
+CONCURRENCY = [1, 8]
+
+# Operations which take a single filter, rather than a batch of events.
+FILTER_OPERATIONS = {
+    tb.Operation.GET_ACCOUNT_TRANSFERS: tb.AccountFilter(
+        account_id=1, user_data_128=0, user_data_64=0, user_data_32=0, code=0, timestamp_min=0,
+        timestamp_max=0, limit=BATCH_MAX, flags=tb.AccountFilterFlags.DEBITS),
+    tb.Operation.GET_ACCOUNT_BALANCES: tb.AccountFilter(
+        account_id=1, user_data_128=0, user_data_64=0, user_data_32=0, code=0, timestamp_min=0,
+        timestamp_max=0, limit=BATCH_MAX, flags=tb.AccountFilterFlags.DEBITS),
+    tb.Operation.QUERY_ACCOUNTS: tb.QueryFilter(
+        user_data_128=0, user_data_64=0, user_data_32=0, ledger=1, code=0, timestamp_min=0,
+        timestamp_max=0, limit=BATCH_MAX, flags=tb.QueryFilterFlags.NONE),
+    tb.Operation.QUERY_TRANSFERS: tb.QueryFilter(
+        user_data_128=0, user_data_64=0, user_data_32=0, ledger=1, code=0, timestamp_min=0,
+        timestamp_max=0, limit=BATCH_MAX, flags=tb.QueryFilterFlags.NONE),
+    tb.Operation.GET_CHANGE_EVENTS: tb.ChangeEventsFilter(limit=tb.CHANGE_EVENTS_MAX),
+}
+
+OPERATIONS = [
+    tb.Operation.CREATE_ACCOUNTS,
+    tb.Operation.CREATE_TRANSFERS,
+    tb.Operation.LOOKUP_ACCOUNTS,
+    tb.Operation.LOOKUP_TRANSFERS,
+    *FILTER_OPERATIONS,
+]
+
+
+def make_events(operation, batch_size):
+    if operation in FILTER_OPERATIONS:
+        return [FILTER_OPERATIONS[operation]]
+    if operation == tb.Operation.CREATE_ACCOUNTS:
+        return [tb.Account(id=id, ledger=1, code=1) for id in tb.ids(batch_size)]
+    if operation == tb.Operation.CREATE_TRANSFERS:
+        return [
+            tb.Transfer(id=id, debit_account_id=1, credit_account_id=2, amount=10, ledger=1,
+                        code=1, flags=tb.TransferFlags.LINKED if i % 2 == 0 else 0)
+            for i, id in enumerate(tb.ids(batch_size))
+        ]
+    assert operation in (tb.Operation.LOOKUP_ACCOUNTS, tb.Operation.LOOKUP_TRANSFERS)
+    return tb.ids(batch_size)
+
+
+def percentile(latencies_ns, fraction):
+    return latencies_ns[min(len(latencies_ns) - 1, int(len(latencies_ns) * fraction))]
+
+
+def run_sync(client, operation, events, concurrency, duration):
+    """
+    Submits `events` back to back from each of `concurrency` threads, for `duration` seconds.
+    Returns the latency of every request.
+    """
+    latencies = [[] for _ in range(concurrency)]
+    deadline = time.perf_counter() + duration
+
+    def submit(thread_latencies):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter_ns()
+            client.submit(operation, events)
+            thread_latencies.append(time.perf_counter_ns() - start)
+
+    threads = [threading.Thread(target=submit, args=(l,)) for l in latencies]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [latency for thread_latencies in latencies for latency in thread_latencies]
+
+
+async def run_async(client, operation, events, concurrency, duration):
+    """
+    Like `run_sync`, from `concurrency` coroutines.
+    """
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def submit():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter_ns()
+            await client.submit(operation, events)
+            latencies.append(time.perf_counter_ns() - start)
+
+    await asyncio.gather(*[submit() for _ in range(concurrency)])
+    return latencies
+
+
+def benchmark(mode, concurrency, operation, batch_size, duration):
+    events = make_events(operation, batch_size)
+
+    start = time.perf_counter_ns()
+    start_cpu = time.process_time_ns()
+    if mode == "sync":
+        with tb.ClientSync.echo(reply=None) as client:
+            # Warm up.
+            client.submit(operation, events)
+            start = time.perf_counter_ns()
+            start_cpu = time.process_time_ns()
+            latencies = run_sync(client, operation, events, concurrency, duration)
+    else:
+        async def run():
+            nonlocal start, start_cpu
+            async with tb.ClientAsync.echo(reply=None) as client:
+                await client.submit(operation, events)
+                start = time.perf_counter_ns()
+                start_cpu = time.process_time_ns()
+                return await run_async(client, operation, events, concurrency, duration)
+        latencies = asyncio.run(run())
+    duration_ns = time.perf_counter_ns() - start
+    cpu_ns = time.process_time_ns() - start_cpu
+
+    latencies.sort()
+    return {
+        "operation": operation.name.lower(),
+        "mode": mode,
+        "concurrency": concurrency,
+        "batch_size": len(events),
+        "requests": len(latencies),
+        "events_per_second": round(len(latencies) * len(events) * 1e9 / duration_ns),
+        "cpu_ns_per_event": round(cpu_ns / (len(latencies) * len(events))),
+        "latency_p50_us": round(percentile(latencies, 0.50) / 1000, 1),
+        "latency_p99_us": round(percentile(latencies, 0.99) / 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--operations", nargs="+",
+                        default=[operation.name.lower() for operation in OPERATIONS])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=BATCH_SIZES)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"],
+                        choices=["sync", "async"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=0.25,
+                        help="seconds to run each combination for")
+    args = parser.parse_args()
+
+    environment = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+    }
+    print(f"{'operation':<22} {'mode':<6} {'conc':>4} {'batch':>5} {'events/s':>12} "
+          f"{'cpu ns/ev':>10} {'p50 us':>9} {'p99 us':>9}", file=sys.stderr)
+    for name in args.operations:
+        operation = tb.Operation[name.upper()]
+        batch_sizes = [1] if operation in FILTER_OPERATIONS else args.batch_sizes
+        for batch_size in batch_sizes:
+            for mode in args.modes:
+                for concurrency in args.concurrency:
+                    result = benchmark(mode, concurrency, operation, batch_size, args.duration)
+                    print(json.dumps({**result, **environment}), flush=True)
+                    print(f"{result['operation']:<22} {mode:<6} {concurrency:>4} "
+                          f"{result['batch_size']:>5} {result['events_per_second']:>12,} "
+                          f"{result['cpu_ns_per_event']:>10,} {result['latency_p50_us']:>9} "
+                          f"{result['latency_p99_us']:>9}",
+                          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
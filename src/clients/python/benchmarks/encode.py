@@ -0,0 +1,69 @@
+"""
+Measures how fast a batch of events is encoded into the contiguous buffer handed to tb_client,
+comparing the per-event `from_param` path against the bulk `pack_array` encoder.
+
+Doesn't need a running cluster:
+
+    PYTHONPATH=src python3 benchmarks/encode.py
+"""
+import time
+
+import tigerbeetle as tb
+from tigerbeetle import bindings
+
+BATCH_MAX = 8189
+REPETITIONS = 20
+
+
+def encode_from_param(c_event_type, events):
+    return (c_event_type * len(events))(*map(c_event_type.from_param, events))
+
+
+def encode_pack_array(c_event_type, events):
+    events_array = (c_event_type * len(events))()
+    c_event_type.pack_array(events_array, events)
+    return events_array
+
+
+def benchmark(name, encode, c_event_type, events):
+    # Warm up, and check both encoders agree on the bytes produced.
+    assert bytes(encode(c_event_type, events)) == bytes(encode_from_param(c_event_type, events))
+
+    start = time.perf_counter_ns()
+    for _ in range(REPETITIONS):
+        encode(c_event_type, events)
+    duration_ns = time.perf_counter_ns() - start
+
+    events_per_second = (REPETITIONS * len(events) * 1_000_000_000) // duration_ns
+    print(f"{c_event_type.__name__:<10} {name:<12} {events_per_second:>12,} events/s")
+    return events_per_second
+
+
+def main():
+    transfers = [
+        tb.Transfer(
+            id=tb.id(),
+            debit_account_id=1,
+            credit_account_id=2,
+            amount=10,
+            ledger=1,
+            code=1,
+            flags=tb.TransferFlags.LINKED if i % 2 == 0 else tb.TransferFlags.NONE,
+        )
+        for i in range(BATCH_MAX)
+    ]
+    accounts = [tb.Account(id=tb.id(), ledger=1, code=1) for _ in range(BATCH_MAX)]
+    ids = [tb.id() for _ in range(BATCH_MAX)]
+
+    for c_event_type, events in [
+        (bindings.CTransfer, transfers),
+        (bindings.CAccount, accounts),
+        (tb.lib.c_uint128, ids),
+    ]:
+        baseline = benchmark("from_param", encode_from_param, c_event_type, events)
+        packed = benchmark("pack_array", encode_pack_array, c_event_type, events)
+        print(f"{c_event_type.__name__:<10} speedup      {packed / baseline:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures how fast IDs are generated, comparing `tb.id()` called in a loop against generating a batch
+at once with `tb.ids()` and `tb.ids_numpy()`, from one and from several threads.
+
+Doesn't need a running cluster:
+
+    PYTHONPATH=src python3 benchmarks/ids.py
+"""
+import threading
+import time
+
+import tigerbeetle as tb
+
+BATCH_MAX = 8189
+REPETITIONS = 20
+THREADS = 8
+
+
+def ids_loop(count):
+    return [tb.id() for _ in range(count)]
+
+
+def ids_batch(count):
+    return tb.ids(count)
+
+
+def ids_numpy(count):
+    return tb.ids_numpy(count)
+
+
+def benchmark(name, generate, threads):
+    def run():
+        for _ in range(REPETITIONS):
+            generate(BATCH_MAX)
+
+    # Warm up.
+    generate(BATCH_MAX)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    start = time.perf_counter_ns()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    duration_ns = time.perf_counter_ns() - start
+
+    count = BATCH_MAX * REPETITIONS * threads
+    print(f"{name:>12} threads={threads:<2} {duration_ns / count:8.1f} ns/id "
+          f"{count * 1e9 / duration_ns:12.0f} ids/s")
+    return duration_ns
+
+
+def main():
+    generators = [("id() loop", ids_loop), ("ids()", ids_batch)]
+    try:
+        import numpy  # noqa: F401
+        generators.append(("ids_numpy()", ids_numpy))
+    except ImportError:
+        print("NumPy not installed, skipping ids_numpy()")
+
+    for threads in [1, THREADS]:
+        baseline_ns = None
+        for name, generate in generators:
+            duration_ns = benchmark(name, generate, threads)
+            if baseline_ns is None:
+                baseline_ns = duration_ns
+            else:
+                print(f"{'':>12} speedup: {baseline_ns / duration_ns:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures the cold start cost of the package: `import tigerbeetle` alone, as reported by
+`python -X importtime`, and the work deferred until the first client is constructed (loading the
+native library, binding its functions and registering the log callback), each in a fresh
+interpreter.
+
+Doesn't need a running cluster, as the first client is an echo client:
+
+    PYTHONPATH=src python3 benchmarks/import_time.py
+    PYTHONPATH=src python3 benchmarks/import_time.py --runs 50 --top 20
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+FIRST_CLIENT = """
+import time
+import tigerbeetle as tb
+start = time.perf_counter_ns()
+tb.ClientSync.echo().close()
+print(time.perf_counter_ns() - start)
+"""
+
+
+def import_times(env):
+    """
+    Imports the package in a fresh interpreter, and returns the `-X importtime` report as a dict of
+    module name to (self, cumulative) microseconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import tigerbeetle"],
+                            env=env, check=True, capture_output=True, text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def first_client_ns(env):
+    result = subprocess.run([sys.executable, "-c", FIRST_CLIENT],
+                            env=env, check=True, capture_output=True, text=True)
+    return int(result.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10,
+                        help="the number of modules with the largest self time to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pycache:
+        # Measure an installed package, whose bytecode is already compiled, without writing to the
+        # source tree.
+        env = {**os.environ, "PYTHONPYCACHEPREFIX": pycache}
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        # Warm up the bytecode cache.
+        import_times(env)
+
+        runs = [import_times(env) for _ in range(args.runs)]
+        first_client = [first_client_ns(env) / 1000 for _ in range(args.runs)]
+
+    total = [times["tigerbeetle"][1] for times in runs]
+    print(f"import tigerbeetle:  median {statistics.median(total) / 1000:7.1f} ms "
+          f"min {min(total) / 1000:7.1f} ms")
+    print(f"first client:        median {statistics.median(first_client) / 1000:7.1f} ms "
+          f"min {min(first_client) / 1000:7.1f} ms")
+
+    print("\nslowest modules by median self time (cumulative):")
+    names = set.intersection(*[set(times) for times in runs])
+    medians = {
+        name: (statistics.median(times[name][0] for times in runs),
+               statistics.median(times[name][1] for times in runs))
+        for name in names
+    }
+    slowest = sorted(medians.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[:args.top]:
+        print(f"  {name:<32} {self_us / 1000:7.1f} ms ({cumulative_us / 1000:7.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
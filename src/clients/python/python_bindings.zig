@@ -33,10 +33,16 @@ const mappings_state_machine = .{
     .{ tb.AccountFilter, "AccountFilter" },
     .{ tb.AccountBalance, "AccountBalance" },
     .{ tb.QueryFilter, "QueryFilter" },
+    .{ tb.ChangeEventType, "ChangeEventType" },
+    .{ tb.ChangeEvent, "ChangeEvent" },
+    .{ tb.ChangeEventsFilter, "ChangeEventsFilter" },
 };
 
 const mappings_all = mappings_vsr ++ mappings_state_machine;
 
+/// The `line-length` ruff checks the generated code against (see pyproject.toml).
+const line_length_max = 100;
+
 const Buffer = struct {
     inner: std.ArrayList(u8),
 
@@ -193,22 +199,36 @@ fn emit_enum(
     }
 
     buffer.print("\n\n", .{});
+
+    // Enums which appear in results are decoded through an `EnumDecoder`, a table which is filled
+    // in as each value is first seen, see `convert_ctypes_to_python`.
+    if (comptime mapping_name_from_type(mappings_state_machine, Type) != null) {
+        buffer.print("_decode_{[name]s} = EnumDecoder({[name]s})\n\n\n", .{
+            .name = python_name,
+        });
+    }
 }
 
 fn emit_struct_ctypes(
     buffer: *Buffer,
+    comptime Type: type,
     comptime type_info: anytype,
     comptime python_name: []const u8,
-    generate_ctypes_to_python: bool,
+    comptime generate_ctypes_to_python: bool,
 ) !void {
+    buffer.print("class C{s}(ctypes.Structure):\n", .{python_name});
+    if (generate_ctypes_to_python) {
+        buffer.print("    _struct = struct.Struct(\"<", .{});
+        inline for (type_info.fields) |field| {
+            buffer.print("{s}", .{zig_to_struct_format(field.name, field.type)});
+        }
+        buffer.print("\")\n\n", .{});
+    }
     buffer.print(
-        \\class C{[type_name]s}(ctypes.Structure):
         \\    @classmethod
         \\    def from_param(cls, obj: Any) -> Self:
         \\
-    , .{
-        .type_name = python_name,
-    });
+    , .{});
 
     inline for (type_info.fields) |field| {
         const field_type_info = @typeInfo(field.type);
@@ -217,11 +237,20 @@ fn emit_struct_ctypes(
         // That has an explicit check built in, but the standard Python ctypes ones (eg,
         // ctypes.c_uint64) don't and will happily overflow otherwise.
         if (comptime !std.mem.eql(u8, field.name, "reserved") and field_type_info == .int) {
-            buffer.print("        validate_uint(bits={[int_bits]}, name=\"{[field_name]s}\", " ++
-                "number=obj.{[field_name]s})\n", .{
-                .field_name = field.name,
-                .int_bits = field_type_info.int.bits,
-            });
+            const check_head = std.fmt.comptimePrint(
+                "        validate_uint(bits={d}, name=\"{s}\",",
+                .{ field_type_info.int.bits, field.name },
+            );
+            const check_tail = "number=obj." ++ field.name ++ ")";
+            if (check_head.len + 1 + check_tail.len <= line_length_max) {
+                buffer.print("{s} {s}\n", .{ check_head, check_tail });
+            } else {
+                buffer.print("{s}\n{s}{s}\n", .{
+                    check_head,
+                    " " ** "        validate_uint(".len,
+                    check_tail,
+                });
+            }
         }
     }
 
@@ -263,6 +292,8 @@ fn emit_struct_ctypes(
             }
         }
         buffer.print("        )\n\n", .{});
+
+        emit_struct_pack_array(buffer, Type, type_info);
     }
 
     buffer.print("C{s}._fields_ = [ # noqa: SLF001\n", .{python_name});
@@ -279,12 +310,84 @@ fn emit_struct_ctypes(
     buffer.print("]\n\n\n", .{});
 }
 
+/// Emits a method which packs a whole batch straight into a contiguous buffer in a single pass,
+/// without constructing an intermediate ctypes struct per event. `struct` range checks every value
+/// (including both halves of a u128), so overflows still surface as an exception.
+fn emit_struct_pack_array(
+    buffer: *Buffer,
+    comptime Type: type,
+    comptime type_info: anytype,
+) void {
+    buffer.print(
+        \\
+        \\    @classmethod
+        \\    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        \\        pack_into = cls._struct.pack_into
+        \\        for index, obj in enumerate(objs):
+        \\            pack_into(
+        \\                buffer,
+        \\                index * {[size]d},
+        \\
+    , .{
+        .size = @sizeOf(Type),
+    });
+
+    inline for (type_info.fields) |field| {
+        const field_type_info = @typeInfo(field.type);
+        const field_is_u128 = field_type_info == .int and field_type_info.int.bits == 128;
+
+        if (comptime std.mem.eql(u8, field.name, "reserved")) {
+            // Zeroed padding, emitted by the format string.
+        } else if (field_is_u128) {
+            const low = "                obj." ++ field.name ++ " & 0xFFFFFFFFFFFFFFFF,";
+            const high = "obj." ++ field.name ++ " >> 64,";
+            if (low.len + 1 + high.len <= line_length_max) {
+                buffer.print("{s} {s}\n", .{ low, high });
+            } else {
+                buffer.print("{s}\n                {s}\n", .{ low, high });
+            }
+        } else {
+            buffer.print("                obj.{s},\n", .{field.name});
+        }
+    }
+    buffer.print("            )\n\n", .{});
+}
+
+/// Resolves a struct field into a format string for Python's `struct` module, matching the layout
+/// of the ctypes declaration: u128s are split into their low and high u64 halves (see `c_uint128`)
+/// and reserved fields become zeroed padding.
+fn zig_to_struct_format(comptime name: []const u8, comptime Type: type) []const u8 {
+    if (comptime std.mem.eql(u8, name, "reserved")) {
+        return std.fmt.comptimePrint("{d}x", .{@sizeOf(Type)});
+    }
+
+    switch (@typeInfo(Type)) {
+        .@"enum" => |info| return zig_to_struct_format(name, info.tag_type),
+        .@"struct" => return zig_to_struct_format(
+            name,
+            std.meta.Int(.unsigned, @bitSizeOf(Type)),
+        ),
+        .int => |info| {
+            assert(info.signedness == .unsigned);
+            return switch (info.bits) {
+                8 => "B",
+                16 => "H",
+                32 => "I",
+                64 => "Q",
+                128 => "QQ",
+                else => @compileError("invalid int type"),
+            };
+        },
+        else => @compileError("Unhandled type: " ++ @typeName(Type)),
+    }
+}
+
 fn convert_ctypes_to_python(comptime name: []const u8, comptime Type: type) []const u8 {
     inline for (mappings_state_machine) |type_mapping| {
         const ZigType, const python_name = type_mapping;
 
         if (ZigType == Type) {
-            return python_name ++ "(" ++ name ++ ")";
+            return "_decode_" ++ python_name ++ "[" ++ name ++ "]";
         }
     }
     if (@typeInfo(Type) == .int and @typeInfo(Type).int.bits == 128) {
@@ -347,18 +450,34 @@ fn ctype_type_name(comptime Type: type) []const u8 {
     return comptime "C" ++ mapping_name_from_type(mappings_all, Type).?;
 }
 
+/// The state machine operations exposed by the client.
+const operations: []const tb.Operation = &.{
+    .create_accounts,
+    .create_transfers,
+    .lookup_accounts,
+    .lookup_transfers,
+    .get_account_transfers,
+    .get_account_balances,
+    .query_accounts,
+    .query_transfers,
+    .get_change_events,
+};
+
 fn emit_method(
     buffer: *Buffer,
     comptime operation: tb.Operation,
-    options: struct { is_async: bool },
+    comptime options: struct { is_async: bool, is_future: bool = false },
 ) void {
+    // Batchable operations also accept any buffer with the ctype's layout, eg a NumPy array.
     const event_type = comptime if (operation.is_batchable())
-        "list[" ++ zig_to_python(operation.EventType()) ++ "]"
+        "list[" ++ zig_to_python(operation.EventType()) ++ "] | Buffer"
     else
         zig_to_python(operation.EventType());
 
-    const result_type =
-        comptime "list[" ++ zig_to_python(operation.ResultType()) ++ "]";
+    const result_type = comptime if (options.is_future)
+        "Future[list[" ++ zig_to_python(operation.ResultType()) ++ "]]"
+    else
+        "list[" ++ zig_to_python(operation.ResultType()) ++ "]";
 
     // For ergonomics, the client allows calling things like .query_accounts(filter) even
     // though the _submit function requires a list for everything. Wrap them here.
@@ -367,10 +486,22 @@ fn emit_method(
     else
         event_name(operation);
 
+    // Signatures which would be too long put the return type on a line of its own, aligned with
+    // the parameters.
+    const signature_head = comptime (if (options.is_async) "    async " else "    ") ++ "def " ++
+        @tagName(operation) ++ (if (options.is_future) "_future" else "") ++ "(";
+    const signature_params = comptime "self, " ++ event_name(operation) ++ ": " ++ event_type;
+    const signature_tail = comptime ") -> " ++ result_type ++ ":";
+    const signature = comptime if (signature_head.len + signature_params.len +
+        signature_tail.len <= line_length_max)
+        signature_head ++ signature_params ++ signature_tail
+    else
+        signature_head ++ signature_params ++ "\n" ++ " " ** signature_head.len ++ signature_tail;
+
     // NB: _submit is loosely annotated, the operations define interfaces for the Python developer.
     buffer.print(
-        \\    {[prefix_fn]s}def {[fn_name]s}(self, {[event_name]s}: {[event_type]s}) -> {[result_type]s}:
-        \\        return {[prefix_call]s}self._submit(  # type: ignore[no-any-return]
+        \\{[signature]s}
+        \\        return {[prefix_call]s}self.{[submit_fn]s}(  # type: ignore[no-any-return]
         \\            Operation.{[uppercase_name]s},
         \\            {[event_name_or_list]s},
         \\            {[event_type_c]s},
@@ -380,11 +511,8 @@ fn emit_method(
         \\
     ,
         .{
-            .prefix_fn = if (options.is_async) "async " else "",
-            .fn_name = @tagName(operation),
-            .event_name = event_name(operation),
-            .event_type = event_type,
-            .result_type = result_type,
+            .signature = signature,
+            .submit_fn = if (options.is_future) "_submit_future" else "_submit",
             .event_name_or_list = event_name_or_list,
             .prefix_call = if (options.is_async) "await " else "",
             .uppercase_name = to_uppercase(@tagName(operation)),
@@ -411,16 +539,20 @@ pub fn main() !void {
         \\
         \\import ctypes
         \\import enum
+        \\import struct
         \\import sys
         \\from dataclasses import dataclass
         \\from collections.abc import Callable # noqa: TCH003
-        \\from typing import Any
+        \\from typing import TYPE_CHECKING, Any
         \\if sys.version_info >= (3, 11):
         \\    from typing import Self
         \\else:
         \\    from typing_extensions import Self
+        \\if TYPE_CHECKING:
+        \\    from concurrent.futures import Future
+        \\    from typing_extensions import Buffer
         \\
-        \\from .lib import c_uint128, tbclient, validate_uint
+        \\from .lib import EnumDecoder, c_uint128, load_tbclient, validate_uint
         \\
         \\# Use slots=True if the version of Python is new enough (3.10+) to support it.
         \\if sys.version_info >= (3, 10):
@@ -489,7 +621,7 @@ pub fn main() !void {
         const ZigType, const python_name = type_mapping;
 
         // VSR ctype structs don't have a corresponding Python dataclass - so don't generate the
-        // `def to_python(self):` method for them.
+        // `def to_python(self):` or `def pack_array(cls, ...)` methods for them.
         const generate_ctypes_to_python = comptime mapping_name_from_type(
             mappings_state_machine,
             ZigType,
@@ -501,6 +633,7 @@ pub fn main() !void {
                 .@"packed" => continue,
                 .@"extern" => try emit_struct_ctypes(
                     &buffer,
+                    ZigType,
                     info,
                     python_name,
                     generate_ctypes_to_python,
@@ -522,50 +655,87 @@ pub fn main() !void {
         \\    _fields_ = [("cluster_id", c_uint128), ("client_id", c_uint128),
         \\                ("addresses_ptr", ctypes.c_void_p), ("addresses_len", ctypes.c_uint64)]
         \\
-        \\# Initialize a new TigerBeetle client which connects to the addresses provided and
-        \\# completes submitted packets by invoking the callback with the given context.
-        \\tb_client_init = tbclient.tb_client_init
-        \\tb_client_init.restype = InitStatus
-        \\tb_client_init.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(ctypes.c_uint8 * 16),
-        \\                           ctypes.c_char_p, ctypes.c_uint32, ctypes.c_void_p,
-        \\                           OnCompletion]
+        \\def __getattr__(name: str) -> Any:
+        \\    """
+        \\    Binds the functions exported by tb_client on first use rather than on import, as doing so
+        \\    loads the native library.
+        \\    """
+        \\    if not name.startswith("tb_client_"):
+        \\        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+        \\
+        \\    tbclient = load_tbclient()
+        \\
+        \\    # Initialize a new TigerBeetle client which connects to the addresses provided and
+        \\    # completes submitted packets by invoking the callback with the given context.
+        \\    tb_client_init = tbclient.tb_client_init
+        \\    tb_client_init.restype = InitStatus
+        \\    tb_client_init.argtypes = [ctypes.POINTER(CClient),
+        \\                               ctypes.POINTER(ctypes.c_uint8 * 16), ctypes.c_char_p,
+        \\                               ctypes.c_uint32, ctypes.c_void_p, OnCompletion]
         \\
-        \\# Initialize a new TigerBeetle client which echos back any data submitted.
-        \\tb_client_init_echo = tbclient.tb_client_init_echo
-        \\tb_client_init_echo.restype = InitStatus
-        \\tb_client_init_echo.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(ctypes.c_uint8 * 16),
-        \\                                ctypes.c_char_p, ctypes.c_uint32, ctypes.c_void_p,
-        \\                                OnCompletion]
+        \\    # Initialize a new TigerBeetle client which echos back any data submitted.
+        \\    tb_client_init_echo = tbclient.tb_client_init_echo
+        \\    tb_client_init_echo.restype = InitStatus
+        \\    tb_client_init_echo.argtypes = [ctypes.POINTER(CClient),
+        \\                                    ctypes.POINTER(ctypes.c_uint8 * 16), ctypes.c_char_p,
+        \\                                    ctypes.c_uint32, ctypes.c_void_p, OnCompletion]
         \\
-        \\# Returns the cluster_id and addresses passed in to either tb_client_init or
-        \\# tb_client_init_echo.
-        \\tb_client_init_parameters = tbclient.tb_client_init_parameters
-        \\tb_client_init_parameters.restype = ClientStatus
-        \\tb_client_init_parameters.argtypes = [ctypes.POINTER(CClient),
-        \\                                      ctypes.POINTER(InitParameters)]
+        \\    # Returns the cluster_id and addresses passed in to either tb_client_init or
+        \\    # tb_client_init_echo.
+        \\    tb_client_init_parameters = tbclient.tb_client_init_parameters
+        \\    tb_client_init_parameters.restype = ClientStatus
+        \\    tb_client_init_parameters.argtypes = [ctypes.POINTER(CClient),
+        \\                                          ctypes.POINTER(InitParameters)]
         \\
-        \\# Closes the client, causing any previously submitted packets to be completed with
-        \\# `TB_PACKET_CLIENT_SHUTDOWN` before freeing any allocated client resources from init.
-        \\# It is undefined behavior to use any functions on the client once deinit is called.
-        \\tb_client_deinit = tbclient.tb_client_deinit
-        \\tb_client_deinit.restype = ClientStatus
-        \\tb_client_deinit.argtypes = [ctypes.POINTER(CClient)]
+        \\    # Closes the client, causing any previously submitted packets to be completed with
+        \\    # `TB_PACKET_CLIENT_SHUTDOWN` before freeing any allocated client resources from init.
+        \\    # It is undefined behavior to use any functions on the client once deinit is called.
+        \\    tb_client_deinit = tbclient.tb_client_deinit
+        \\    tb_client_deinit.restype = ClientStatus
+        \\    tb_client_deinit.argtypes = [ctypes.POINTER(CClient)]
         \\
-        \\# Submit a packet with its operation, data, and data_size fields set.
-        \\# Once completed, `on_completion` will be invoked with `on_completion_ctx` and the given
-        \\# packet on the `tb_client` thread (separate from caller's thread).
-        \\tb_client_submit = tbclient.tb_client_submit
-        \\tb_client_submit.restype = ClientStatus
-        \\tb_client_submit.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(CPacket)]
+        \\    # Submit a packet with its operation, data, and data_size fields set.
+        \\    # Once completed, `on_completion` will be invoked with `on_completion_ctx` and the given
+        \\    # packet on the `tb_client` thread (separate from caller's thread).
+        \\    tb_client_submit = tbclient.tb_client_submit
+        \\    tb_client_submit.restype = ClientStatus
+        \\    tb_client_submit.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(CPacket)]
         \\
-        \\tb_client_register_log_callback = tbclient.tb_client_register_log_callback
-        \\tb_client_register_log_callback.restype = RegisterLogCallbackStatus
-        \\# Need to pass in None to clear - ctypes will error if argtypes is set.
-        \\# tb_client_register_log_callback.argtypes = [LogHandler, ctypes.c_bool]
+        \\    tb_client_register_log_callback = tbclient.tb_client_register_log_callback
+        \\    tb_client_register_log_callback.restype = RegisterLogCallbackStatus
+        \\    # Need to pass in None to clear - ctypes will error if argtypes is set.
+        \\    # tb_client_register_log_callback.argtypes = [LogHandler, ctypes.c_bool]
         \\
+        \\    # Later lookups find these directly, without calling back into __getattr__.
+        \\    globals().update(
+        \\        tb_client_init=tb_client_init,
+        \\        tb_client_init_echo=tb_client_init_echo,
+        \\        tb_client_init_parameters=tb_client_init_parameters,
+        \\        tb_client_deinit=tb_client_deinit,
+        \\        tb_client_submit=tb_client_submit,
+        \\        tb_client_register_log_callback=tb_client_register_log_callback,
+        \\    )
+        \\    if name not in globals():
+        \\        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+        \\    return globals()[name]
         \\
         \\
+        \\
+    , .{});
+
+    buffer.print(
+        \\# The event and result ctypes of every operation, for submitting them generically.
+        \\OPERATION_CTYPES: dict[Operation, tuple[Any, Any]] = {{
+        \\
     , .{});
+    inline for (operations) |operation| {
+        buffer.print("    Operation.{s}: ({s}, {s}),\n", .{
+            to_uppercase(@tagName(operation)),
+            ctype_type_name(operation.EventType()),
+            ctype_type_name(operation.ResultType()),
+        });
+    }
+    buffer.print("}}\n\n\n", .{});
 
     inline for (.{ true, false }) |is_async| {
         const prefix_class = if (is_async) "Async" else "";
@@ -578,20 +748,25 @@ pub fn main() !void {
             \\
         , .{prefix_class});
 
-        const operations: []const tb.Operation = &.{
-            .create_accounts,
-            .create_transfers,
-            .lookup_accounts,
-            .lookup_transfers,
-            .get_account_transfers,
-            .get_account_balances,
-            .query_accounts,
-            .query_transfers,
-        };
+        if (!is_async) {
+            buffer.print(
+                \\    _submit_future: Callable[[Operation, Any, Any, Any], Any]
+                \\
+            , .{});
+        }
+
         inline for (operations) |operation| {
             emit_method(&buffer, operation, .{ .is_async = is_async });
         }
 
+        // The sync client can also start requests without blocking, returning a
+        // concurrent.futures.Future.
+        if (!is_async) {
+            inline for (operations) |operation| {
+                emit_method(&buffer, operation, .{ .is_async = false, .is_future = true });
+            }
+        }
+
         buffer.print("\n\n", .{});
     }
 
@@ -611,6 +786,7 @@ fn event_name(comptime operation: tb.Operation) []const u8 {
         .get_account_balances => "filter",
         .query_accounts => "query_filter",
         .query_transfers => "query_filter",
+        .get_change_events => "filter",
         else => comptime unreachable,
     };
 }
@@ -1,15 +1,32 @@
 from .bindings import * # noqa
-from .client import ClientAsync, ClientSync, id, AMOUNT_MAX, configure_logging
+from .client import (
+    ClientAsync, ClientSync, BatcherAsync, BatcherSync, CreateResultsSummary, PoolStats,
+    ResultFormat, id, ids, validate, AMOUNT_MAX, BATCH_MAX, CHANGE_EVENTS_MAX, configure_logging,
+)
 from .client import ClientClosedError, ClientEvictedError, ClientReleaseTooHighError, ClientReleaseTooLowError, TooMuchDataError # noqa
 from .lib import IntegerOverflowError, NativeError
+from .arrays import ids_numpy, numpy_dtype
+from .views import RecordView, RecordViews
+from .cache import AccountCache, AccountCacheStats
+from .echo import EchoReply, synthesize_reply
+from .metrics import MetricsRegistry, OperationMetrics, RequestMetrics
 
 # Explicitly declare public exports:
 __all__ = [
     # from .client:
     "ClientAsync",
     "ClientSync",
+    "BatcherAsync",
+    "BatcherSync",
+    "CreateResultsSummary",
+    "PoolStats",
+    "ResultFormat",
     "id",
+    "ids",
+    "validate",
     "AMOUNT_MAX",
+    "BATCH_MAX",
+    "CHANGE_EVENTS_MAX",
     "configure_logging",
     "ClientClosedError",
     "ClientEvictedError",
@@ -19,6 +36,22 @@ __all__ = [
     # from .lib:
     "IntegerOverflowError",
     "NativeError",
+    # from .arrays:
+    "ids_numpy",
+    "numpy_dtype",
+    # from .views:
+    "RecordView",
+    "RecordViews",
+    # from .cache:
+    "AccountCache",
+    "AccountCacheStats",
+    # from .echo:
+    "EchoReply",
+    "synthesize_reply",
+    # from .metrics:
+    "MetricsRegistry",
+    "OperationMetrics",
+    "RequestMetrics",
     # from .bindings:
     "Operation",
     "InitStatus",
@@ -38,6 +71,9 @@ __all__ = [
     "AccountFilter",
     "AccountBalance",
     "QueryFilter",
+    "ChangeEventType",
+    "ChangeEvent",
+    "ChangeEventsFilter",
     "InitParameters",
     "AsyncStateMachineMixin",
     "StateMachineMixin",
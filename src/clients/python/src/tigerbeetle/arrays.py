@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import ctypes
+import functools
+from typing import Any
+
+from .lib import c_uint128
+from .ulid import id_generator
+
+
+@functools.lru_cache(maxsize=None)
+def numpy_dtype(c_type: Any) -> Any:
+    """
+    Returns a NumPy structured dtype with the exact layout of the given ctypes struct (eg,
+    `tb.bindings.CTransfer`), so arrays of it can be passed directly to `create_transfers` and
+    friends. 128-bit integers are represented as two little endian u64s: `[low, high]`.
+
+    NumPy is an optional dependency, and is only imported here.
+    """
+    import numpy as np
+
+    names = []
+    formats = []
+    offsets = []
+    for name, field_type in c_type._fields_:
+        if field_type is c_uint128:
+            field_format = "(2,)<u8"
+        elif issubclass(field_type, ctypes.Array):
+            field_format = f"V{ctypes.sizeof(field_type)}"
+        else:
+            field_format = f"<u{ctypes.sizeof(field_type)}"
+
+        names.append(name)
+        formats.append(field_format)
+        offsets.append(getattr(c_type, name).offset)
+
+    return np.dtype({
+        "names": names,
+        "formats": formats,
+        "offsets": offsets,
+        "itemsize": ctypes.sizeof(c_type),
+    })
+
+
+def _validate_dtype(dtype: Any, c_type: Any) -> None:
+    """
+    Checks that a structured dtype has the layout of `c_type`, field for field.
+    """
+    if dtype.itemsize != ctypes.sizeof(c_type):
+        raise ValueError(f"dtype itemsize {dtype.itemsize} does not match "
+                         f"sizeof({c_type.__name__}) == {ctypes.sizeof(c_type)}")
+
+    if not dtype.isnative:
+        raise ValueError("dtype must use native (little endian) byte order")
+
+    expected = numpy_dtype(c_type)
+    for name, _ in c_type._fields_:
+        field = getattr(c_type, name)
+        if name not in dtype.fields:
+            if name == "reserved":
+                continue
+            raise ValueError(f"dtype is missing field '{name}'")
+
+        field_dtype, field_offset = dtype.fields[name][:2]
+        if field_offset != field.offset or field_dtype != expected.fields[name][0]:
+            raise ValueError(f"dtype field '{name}' does not match the layout of "
+                             f"{c_type.__name__}: expected offset={field.offset} "
+                             f"dtype={expected.fields[name][0]}, got offset={field_offset} "
+                             f"dtype={field_dtype}")
+
+    for name in dtype.names:
+        if not hasattr(c_type, name):
+            raise ValueError(f"dtype has unknown field '{name}'")
+
+
+def _is_ids_layout(events: Any, c_event_type: Any) -> bool:
+    """
+    Whether `events` is a NumPy array of 128-bit ids, as either `(n, 2)` little endian u64s
+    (`[low, high]`, see `ids_numpy`) or `(n, 16)` bytes.
+    """
+    if c_event_type is not c_uint128 or events.ndim != 2:
+        return False
+    dtype = events.dtype
+    if dtype.kind != "u" or not dtype.isnative:
+        return False
+    return bool((dtype.itemsize == 8 and events.shape[1] == 2) or
+                (dtype.itemsize == 1 and events.shape[1] == 16))
+
+
+def events_from_buffer(events: Any, c_event_type: Any) -> Any:
+    """
+    If `events` is a buffer which already has the layout of `c_event_type`, returns a ctypes array
+    of it over the same memory - no per-event work is done. That's either:
+
+    - a ctypes array of `c_event_type`,
+    - raw bytes (eg, `bytes`, `bytearray`), whose size must be a multiple of the event size,
+    - a NumPy structured array whose dtype matches the event's layout (see `numpy_dtype`),
+    - for ids, a NumPy array of `(n, 2)` little endian u64s or `(n, 16)` bytes.
+
+    Read-only buffers are copied once. Returns None for anything else (eg, a list of dataclasses,
+    or a NumPy array of ints or objects), which is packed event by event instead.
+
+    The caller must not modify writable buffers until the request has completed.
+    """
+    if isinstance(events, (list, tuple)):
+        return None
+    if isinstance(events, ctypes.Array) and events._type_ is c_event_type:
+        return events
+
+    dtype = getattr(events, "dtype", None)
+    if dtype is not None:
+        if dtype.names is not None:
+            _validate_dtype(dtype, c_event_type)
+        elif not _is_ids_layout(events, c_event_type):
+            return None
+
+    try:
+        view = memoryview(events)
+    except TypeError:
+        return None
+    if dtype is None and view.format not in ("B", "b", "c"):
+        # A typed buffer (eg, `array.array("Q")`) holds values rather than events.
+        return None
+
+    if not view.c_contiguous:
+        raise ValueError("events buffer must be C contiguous")
+
+    event_size = ctypes.sizeof(c_event_type)
+    if view.nbytes % event_size != 0:
+        raise ValueError(f"events buffer size {view.nbytes} is not a multiple of "
+                         f"sizeof({c_event_type.__name__}) == {event_size}")
+
+    events_array_type = c_event_type * (view.nbytes // event_size)
+    if view.readonly:
+        return events_array_type.from_buffer_copy(view)
+    return events_array_type.from_buffer(view.cast("B"))
+
+
+def results_to_numpy(c_result_type: Any, data: Any, size: int) -> Any:
+    """
+    Copies `size` bytes of results from `data` into a new NumPy structured array, with no per-row
+    work.
+    """
+    import numpy as np
+
+    results = np.empty(size // ctypes.sizeof(c_result_type), dtype=numpy_dtype(c_result_type))
+    if size > 0:
+        ctypes.memmove(results.ctypes.data, data, size)
+    return results
+
+
+def ids_numpy(count: int) -> Any:
+    """
+    Generates `count` strictly increasing IDs, as `tb.ids()` would, as a `(count, 2)` NumPy array of
+    little endian u64s: `[low, high]`. This is the representation `numpy_dtype` uses for 128-bit
+    fields, so it can be assigned directly to eg, the `id` column of a transfers array.
+    """
+    import numpy as np
+
+    ids = id_generator.generate_many(count)
+    result = np.empty((count, 2), dtype="<u8")
+    if not isinstance(ids, range):
+        result[:, 0] = [id & 0xFFFFFFFFFFFFFFFF for id in ids]
+        result[:, 1] = [id >> 64 for id in ids]
+        return result
+
+    # The IDs are consecutive, so the low halves count up from the first and carry at most once
+    # into the high half.
+    if count > 0:
+        low_first = np.uint64(ids.start & 0xFFFFFFFFFFFFFFFF)
+        result[:, 0] = np.arange(count, dtype="<u8")
+        result[:, 0] += low_first
+        result[:, 1] = ids.start >> 64
+        result[:, 1] += result[:, 0] < low_first
+    return result
@@ -6,16 +6,20 @@ from __future__ import annotations
 
 import ctypes
 import enum
+import struct
 import sys
 from dataclasses import dataclass
 from collections.abc import Callable # noqa: TCH003
-from typing import Any
+from typing import TYPE_CHECKING, Any
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
     from typing_extensions import Self
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from typing_extensions import Buffer
 
-from .lib import c_uint128, tbclient, validate_uint
+from .lib import EnumDecoder, c_uint128, load_tbclient, validate_uint
 
 # Use slots=True if the version of Python is new enough (3.10+) to support it.
 if sys.version_info >= (3, 10):
@@ -85,6 +89,9 @@ class AccountFlags(enum.IntFlag):
     CLOSED = 1 << 5
 
 
+_decode_AccountFlags = EnumDecoder(AccountFlags)
+
+
 class TransferFlags(enum.IntFlag):
     NONE = 0
     LINKED = 1 << 0
@@ -98,6 +105,9 @@ class TransferFlags(enum.IntFlag):
     IMPORTED = 1 << 8
 
 
+_decode_TransferFlags = EnumDecoder(TransferFlags)
+
+
 class AccountFilterFlags(enum.IntFlag):
     NONE = 0
     DEBITS = 1 << 0
@@ -105,11 +115,17 @@ class AccountFilterFlags(enum.IntFlag):
     REVERSED = 1 << 2
 
 
+_decode_AccountFilterFlags = EnumDecoder(AccountFilterFlags)
+
+
 class QueryFilterFlags(enum.IntFlag):
     NONE = 0
     REVERSED = 1 << 0
 
 
+_decode_QueryFilterFlags = EnumDecoder(QueryFilterFlags)
+
+
 class CreateAccountStatus(enum.IntEnum):
     CREATED = 0xFFFFFFFF
     LINKED_EVENT_FAILED = 1
@@ -140,6 +156,9 @@ class CreateAccountStatus(enum.IntEnum):
     IMPORTED_EVENT_TIMESTAMP_MUST_NOT_REGRESS = 26
 
 
+_decode_CreateAccountStatus = EnumDecoder(CreateAccountStatus)
+
+
 class CreateTransferStatus(enum.IntEnum):
     CREATED = 0xFFFFFFFF
     LINKED_EVENT_FAILED = 1
@@ -211,6 +230,20 @@ class CreateTransferStatus(enum.IntEnum):
     EXCEEDS_DEBITS = 55
 
 
+_decode_CreateTransferStatus = EnumDecoder(CreateTransferStatus)
+
+
+class ChangeEventType(enum.IntEnum):
+    SINGLE_PHASE = 0
+    TWO_PHASE_PENDING = 1
+    TWO_PHASE_POSTED = 2
+    TWO_PHASE_VOIDED = 3
+    TWO_PHASE_EXPIRED = 4
+
+
+_decode_ChangeEventType = EnumDecoder(ChangeEventType)
+
+
 @dataclass
 class Account:
     id: int = 0
@@ -291,6 +324,52 @@ class QueryFilter:
     flags: QueryFilterFlags
 
 
+@dataclass
+class ChangeEvent:
+    transfer_id: int = 0
+    transfer_amount: int = 0
+    transfer_pending_id: int = 0
+    transfer_user_data_128: int = 0
+    transfer_user_data_64: int = 0
+    transfer_user_data_32: int = 0
+    transfer_timeout: int = 0
+    transfer_code: int = 0
+    transfer_flags: TransferFlags = TransferFlags.NONE
+    ledger: int = 0
+    type: ChangeEventType = ChangeEventType.SINGLE_PHASE
+    debit_account_id: int = 0
+    debit_account_debits_pending: int = 0
+    debit_account_debits_posted: int = 0
+    debit_account_credits_pending: int = 0
+    debit_account_credits_posted: int = 0
+    debit_account_user_data_128: int = 0
+    debit_account_user_data_64: int = 0
+    debit_account_user_data_32: int = 0
+    debit_account_code: int = 0
+    debit_account_flags: AccountFlags = AccountFlags.NONE
+    credit_account_id: int = 0
+    credit_account_debits_pending: int = 0
+    credit_account_debits_posted: int = 0
+    credit_account_credits_pending: int = 0
+    credit_account_credits_posted: int = 0
+    credit_account_user_data_128: int = 0
+    credit_account_user_data_64: int = 0
+    credit_account_user_data_32: int = 0
+    credit_account_code: int = 0
+    credit_account_flags: AccountFlags = AccountFlags.NONE
+    timestamp: int = 0
+    transfer_timestamp: int = 0
+    debit_account_timestamp: int = 0
+    credit_account_timestamp: int = 0
+
+
+@dataclass
+class ChangeEventsFilter:
+    timestamp_min: int = 0
+    timestamp_max: int = 0
+    limit: int = 0
+
+
 class CPacket(ctypes.Structure):
     @classmethod
     def from_param(cls, obj: Any) -> Self:
@@ -331,6 +410,8 @@ CClient._fields_ = [ # noqa: SLF001
 
 
 class CAccount(ctypes.Structure):
+    _struct = struct.Struct("<QQQQQQQQQQQQQI4xIHHQ")
+
     @classmethod
     def from_param(cls, obj: Any) -> Self:
         validate_uint(bits=128, name="id", number=obj.id)
@@ -372,10 +453,32 @@ class CAccount(ctypes.Structure):
             user_data_32=self.user_data_32,
             ledger=self.ledger,
             code=self.code,
-            flags=AccountFlags(self.flags),
+            flags=_decode_AccountFlags[self.flags],
             timestamp=self.timestamp,
         )
 
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 128,
+                obj.id & 0xFFFFFFFFFFFFFFFF, obj.id >> 64,
+                obj.debits_pending & 0xFFFFFFFFFFFFFFFF, obj.debits_pending >> 64,
+                obj.debits_posted & 0xFFFFFFFFFFFFFFFF, obj.debits_posted >> 64,
+                obj.credits_pending & 0xFFFFFFFFFFFFFFFF, obj.credits_pending >> 64,
+                obj.credits_posted & 0xFFFFFFFFFFFFFFFF, obj.credits_posted >> 64,
+                obj.user_data_128 & 0xFFFFFFFFFFFFFFFF, obj.user_data_128 >> 64,
+                obj.user_data_64,
+                obj.user_data_32,
+                obj.ledger,
+                obj.code,
+                obj.flags,
+                obj.timestamp,
+            )
+
 CAccount._fields_ = [ # noqa: SLF001
     ("id", c_uint128),
     ("debits_pending", c_uint128),
@@ -394,6 +497,8 @@ CAccount._fields_ = [ # noqa: SLF001
 
 
 class CTransfer(ctypes.Structure):
+    _struct = struct.Struct("<QQQQQQQQQQQQQIIIHHQ")
+
     @classmethod
     def from_param(cls, obj: Any) -> Self:
         validate_uint(bits=128, name="id", number=obj.id)
@@ -438,10 +543,33 @@ class CTransfer(ctypes.Structure):
             timeout=self.timeout,
             ledger=self.ledger,
             code=self.code,
-            flags=TransferFlags(self.flags),
+            flags=_decode_TransferFlags[self.flags],
             timestamp=self.timestamp,
         )
 
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 128,
+                obj.id & 0xFFFFFFFFFFFFFFFF, obj.id >> 64,
+                obj.debit_account_id & 0xFFFFFFFFFFFFFFFF, obj.debit_account_id >> 64,
+                obj.credit_account_id & 0xFFFFFFFFFFFFFFFF, obj.credit_account_id >> 64,
+                obj.amount & 0xFFFFFFFFFFFFFFFF, obj.amount >> 64,
+                obj.pending_id & 0xFFFFFFFFFFFFFFFF, obj.pending_id >> 64,
+                obj.user_data_128 & 0xFFFFFFFFFFFFFFFF, obj.user_data_128 >> 64,
+                obj.user_data_64,
+                obj.user_data_32,
+                obj.timeout,
+                obj.ledger,
+                obj.code,
+                obj.flags,
+                obj.timestamp,
+            )
+
 CTransfer._fields_ = [ # noqa: SLF001
     ("id", c_uint128),
     ("debit_account_id", c_uint128),
@@ -460,6 +588,8 @@ CTransfer._fields_ = [ # noqa: SLF001
 
 
 class CCreateAccountResult(ctypes.Structure):
+    _struct = struct.Struct("<QI4x")
+
     @classmethod
     def from_param(cls, obj: Any) -> Self:
         validate_uint(bits=64, name="timestamp", number=obj.timestamp)
@@ -472,9 +602,21 @@ class CCreateAccountResult(ctypes.Structure):
     def to_python(self) -> CreateAccountResult:
         return CreateAccountResult(
             timestamp=self.timestamp,
-            status=CreateAccountStatus(self.status),
+            status=_decode_CreateAccountStatus[self.status],
         )
 
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 16,
+                obj.timestamp,
+                obj.status,
+            )
+
 CCreateAccountResult._fields_ = [ # noqa: SLF001
     ("timestamp", ctypes.c_uint64),
     ("status", ctypes.c_uint32),
@@ -483,6 +625,8 @@ CCreateAccountResult._fields_ = [ # noqa: SLF001
 
 
 class CCreateTransferResult(ctypes.Structure):
+    _struct = struct.Struct("<QI4x")
+
     @classmethod
     def from_param(cls, obj: Any) -> Self:
         validate_uint(bits=64, name="timestamp", number=obj.timestamp)
@@ -495,9 +639,21 @@ class CCreateTransferResult(ctypes.Structure):
     def to_python(self) -> CreateTransferResult:
         return CreateTransferResult(
             timestamp=self.timestamp,
-            status=CreateTransferStatus(self.status),
+            status=_decode_CreateTransferStatus[self.status],
         )
 
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 16,
+                obj.timestamp,
+                obj.status,
+            )
+
 CCreateTransferResult._fields_ = [ # noqa: SLF001
     ("timestamp", ctypes.c_uint64),
     ("status", ctypes.c_uint32),
@@ -506,6 +662,8 @@ CCreateTransferResult._fields_ = [ # noqa: SLF001
 
 
 class CAccountFilter(ctypes.Structure):
+    _struct = struct.Struct("<QQQQQIH58xQQII")
+
     @classmethod
     def from_param(cls, obj: Any) -> Self:
         validate_uint(bits=128, name="account_id", number=obj.account_id)
@@ -539,9 +697,28 @@ class CAccountFilter(ctypes.Structure):
             timestamp_min=self.timestamp_min,
             timestamp_max=self.timestamp_max,
             limit=self.limit,
-            flags=AccountFilterFlags(self.flags),
+            flags=_decode_AccountFilterFlags[self.flags],
         )
 
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 128,
+                obj.account_id & 0xFFFFFFFFFFFFFFFF, obj.account_id >> 64,
+                obj.user_data_128 & 0xFFFFFFFFFFFFFFFF, obj.user_data_128 >> 64,
+                obj.user_data_64,
+                obj.user_data_32,
+                obj.code,
+                obj.timestamp_min,
+                obj.timestamp_max,
+                obj.limit,
+                obj.flags,
+            )
+
 CAccountFilter._fields_ = [ # noqa: SLF001
     ("account_id", c_uint128),
     ("user_data_128", c_uint128),
@@ -557,6 +734,8 @@ CAccountFilter._fields_ = [ # noqa: SLF001
 
 
 class CAccountBalance(ctypes.Structure):
+    _struct = struct.Struct("<QQQQQQQQQ56x")
+
     @classmethod
     def from_param(cls, obj: Any) -> Self:
         validate_uint(bits=128, name="debits_pending", number=obj.debits_pending)
@@ -582,6 +761,21 @@ class CAccountBalance(ctypes.Structure):
             timestamp=self.timestamp,
         )
 
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 128,
+                obj.debits_pending & 0xFFFFFFFFFFFFFFFF, obj.debits_pending >> 64,
+                obj.debits_posted & 0xFFFFFFFFFFFFFFFF, obj.debits_posted >> 64,
+                obj.credits_pending & 0xFFFFFFFFFFFFFFFF, obj.credits_pending >> 64,
+                obj.credits_posted & 0xFFFFFFFFFFFFFFFF, obj.credits_posted >> 64,
+                obj.timestamp,
+            )
+
 CAccountBalance._fields_ = [ # noqa: SLF001
     ("debits_pending", c_uint128),
     ("debits_posted", c_uint128),
@@ -593,6 +787,8 @@ CAccountBalance._fields_ = [ # noqa: SLF001
 
 
 class CQueryFilter(ctypes.Structure):
+    _struct = struct.Struct("<QQQIIH6xQQII")
+
     @classmethod
     def from_param(cls, obj: Any) -> Self:
         validate_uint(bits=128, name="user_data_128", number=obj.user_data_128)
@@ -626,9 +822,28 @@ class CQueryFilter(ctypes.Structure):
             timestamp_min=self.timestamp_min,
             timestamp_max=self.timestamp_max,
             limit=self.limit,
-            flags=QueryFilterFlags(self.flags),
+            flags=_decode_QueryFilterFlags[self.flags],
         )
 
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 64,
+                obj.user_data_128 & 0xFFFFFFFFFFFFFFFF, obj.user_data_128 >> 64,
+                obj.user_data_64,
+                obj.user_data_32,
+                obj.ledger,
+                obj.code,
+                obj.timestamp_min,
+                obj.timestamp_max,
+                obj.limit,
+                obj.flags,
+            )
+
 CQueryFilter._fields_ = [ # noqa: SLF001
     ("user_data_128", c_uint128),
     ("user_data_64", ctypes.c_uint64),
@@ -643,6 +858,272 @@ CQueryFilter._fields_ = [ # noqa: SLF001
 ]
 
 
+class CChangeEvent(ctypes.Structure):
+    _struct = struct.Struct("<QQQQQQQQQIIHHIB39xQQQQQQQQQQQQQIHHQQQQQQQQQQQQQIHHQQQQ")
+
+    @classmethod
+    def from_param(cls, obj: Any) -> Self:
+        validate_uint(bits=128, name="transfer_id", number=obj.transfer_id)
+        validate_uint(bits=128, name="transfer_amount", number=obj.transfer_amount)
+        validate_uint(bits=128, name="transfer_pending_id", number=obj.transfer_pending_id)
+        validate_uint(bits=128, name="transfer_user_data_128", number=obj.transfer_user_data_128)
+        validate_uint(bits=64, name="transfer_user_data_64", number=obj.transfer_user_data_64)
+        validate_uint(bits=32, name="transfer_user_data_32", number=obj.transfer_user_data_32)
+        validate_uint(bits=32, name="transfer_timeout", number=obj.transfer_timeout)
+        validate_uint(bits=16, name="transfer_code", number=obj.transfer_code)
+        validate_uint(bits=32, name="ledger", number=obj.ledger)
+        validate_uint(bits=128, name="debit_account_id", number=obj.debit_account_id)
+        validate_uint(bits=128, name="debit_account_debits_pending",
+                      number=obj.debit_account_debits_pending)
+        validate_uint(bits=128, name="debit_account_debits_posted",
+                      number=obj.debit_account_debits_posted)
+        validate_uint(bits=128, name="debit_account_credits_pending",
+                      number=obj.debit_account_credits_pending)
+        validate_uint(bits=128, name="debit_account_credits_posted",
+                      number=obj.debit_account_credits_posted)
+        validate_uint(bits=128, name="debit_account_user_data_128",
+                      number=obj.debit_account_user_data_128)
+        validate_uint(bits=64, name="debit_account_user_data_64",
+                      number=obj.debit_account_user_data_64)
+        validate_uint(bits=32, name="debit_account_user_data_32",
+                      number=obj.debit_account_user_data_32)
+        validate_uint(bits=16, name="debit_account_code", number=obj.debit_account_code)
+        validate_uint(bits=128, name="credit_account_id", number=obj.credit_account_id)
+        validate_uint(bits=128, name="credit_account_debits_pending",
+                      number=obj.credit_account_debits_pending)
+        validate_uint(bits=128, name="credit_account_debits_posted",
+                      number=obj.credit_account_debits_posted)
+        validate_uint(bits=128, name="credit_account_credits_pending",
+                      number=obj.credit_account_credits_pending)
+        validate_uint(bits=128, name="credit_account_credits_posted",
+                      number=obj.credit_account_credits_posted)
+        validate_uint(bits=128, name="credit_account_user_data_128",
+                      number=obj.credit_account_user_data_128)
+        validate_uint(bits=64, name="credit_account_user_data_64",
+                      number=obj.credit_account_user_data_64)
+        validate_uint(bits=32, name="credit_account_user_data_32",
+                      number=obj.credit_account_user_data_32)
+        validate_uint(bits=16, name="credit_account_code", number=obj.credit_account_code)
+        validate_uint(bits=64, name="timestamp", number=obj.timestamp)
+        validate_uint(bits=64, name="transfer_timestamp", number=obj.transfer_timestamp)
+        validate_uint(bits=64, name="debit_account_timestamp", number=obj.debit_account_timestamp)
+        validate_uint(bits=64, name="credit_account_timestamp", number=obj.credit_account_timestamp)
+        return cls(
+            transfer_id=c_uint128.from_param(obj.transfer_id),
+            transfer_amount=c_uint128.from_param(obj.transfer_amount),
+            transfer_pending_id=c_uint128.from_param(obj.transfer_pending_id),
+            transfer_user_data_128=c_uint128.from_param(obj.transfer_user_data_128),
+            transfer_user_data_64=obj.transfer_user_data_64,
+            transfer_user_data_32=obj.transfer_user_data_32,
+            transfer_timeout=obj.transfer_timeout,
+            transfer_code=obj.transfer_code,
+            transfer_flags=obj.transfer_flags,
+            ledger=obj.ledger,
+            type=obj.type,
+            debit_account_id=c_uint128.from_param(obj.debit_account_id),
+            debit_account_debits_pending=c_uint128.from_param(obj.debit_account_debits_pending),
+            debit_account_debits_posted=c_uint128.from_param(obj.debit_account_debits_posted),
+            debit_account_credits_pending=c_uint128.from_param(obj.debit_account_credits_pending),
+            debit_account_credits_posted=c_uint128.from_param(obj.debit_account_credits_posted),
+            debit_account_user_data_128=c_uint128.from_param(obj.debit_account_user_data_128),
+            debit_account_user_data_64=obj.debit_account_user_data_64,
+            debit_account_user_data_32=obj.debit_account_user_data_32,
+            debit_account_code=obj.debit_account_code,
+            debit_account_flags=obj.debit_account_flags,
+            credit_account_id=c_uint128.from_param(obj.credit_account_id),
+            credit_account_debits_pending=c_uint128.from_param(obj.credit_account_debits_pending),
+            credit_account_debits_posted=c_uint128.from_param(obj.credit_account_debits_posted),
+            credit_account_credits_pending=c_uint128.from_param(obj.credit_account_credits_pending),
+            credit_account_credits_posted=c_uint128.from_param(obj.credit_account_credits_posted),
+            credit_account_user_data_128=c_uint128.from_param(obj.credit_account_user_data_128),
+            credit_account_user_data_64=obj.credit_account_user_data_64,
+            credit_account_user_data_32=obj.credit_account_user_data_32,
+            credit_account_code=obj.credit_account_code,
+            credit_account_flags=obj.credit_account_flags,
+            timestamp=obj.timestamp,
+            transfer_timestamp=obj.transfer_timestamp,
+            debit_account_timestamp=obj.debit_account_timestamp,
+            credit_account_timestamp=obj.credit_account_timestamp,
+        )
+
+
+    def to_python(self) -> ChangeEvent:
+        return ChangeEvent(
+            transfer_id=self.transfer_id.to_python(),
+            transfer_amount=self.transfer_amount.to_python(),
+            transfer_pending_id=self.transfer_pending_id.to_python(),
+            transfer_user_data_128=self.transfer_user_data_128.to_python(),
+            transfer_user_data_64=self.transfer_user_data_64,
+            transfer_user_data_32=self.transfer_user_data_32,
+            transfer_timeout=self.transfer_timeout,
+            transfer_code=self.transfer_code,
+            transfer_flags=_decode_TransferFlags[self.transfer_flags],
+            ledger=self.ledger,
+            type=_decode_ChangeEventType[self.type],
+            debit_account_id=self.debit_account_id.to_python(),
+            debit_account_debits_pending=self.debit_account_debits_pending.to_python(),
+            debit_account_debits_posted=self.debit_account_debits_posted.to_python(),
+            debit_account_credits_pending=self.debit_account_credits_pending.to_python(),
+            debit_account_credits_posted=self.debit_account_credits_posted.to_python(),
+            debit_account_user_data_128=self.debit_account_user_data_128.to_python(),
+            debit_account_user_data_64=self.debit_account_user_data_64,
+            debit_account_user_data_32=self.debit_account_user_data_32,
+            debit_account_code=self.debit_account_code,
+            debit_account_flags=_decode_AccountFlags[self.debit_account_flags],
+            credit_account_id=self.credit_account_id.to_python(),
+            credit_account_debits_pending=self.credit_account_debits_pending.to_python(),
+            credit_account_debits_posted=self.credit_account_debits_posted.to_python(),
+            credit_account_credits_pending=self.credit_account_credits_pending.to_python(),
+            credit_account_credits_posted=self.credit_account_credits_posted.to_python(),
+            credit_account_user_data_128=self.credit_account_user_data_128.to_python(),
+            credit_account_user_data_64=self.credit_account_user_data_64,
+            credit_account_user_data_32=self.credit_account_user_data_32,
+            credit_account_code=self.credit_account_code,
+            credit_account_flags=_decode_AccountFlags[self.credit_account_flags],
+            timestamp=self.timestamp,
+            transfer_timestamp=self.transfer_timestamp,
+            debit_account_timestamp=self.debit_account_timestamp,
+            credit_account_timestamp=self.credit_account_timestamp,
+        )
+
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 384,
+                obj.transfer_id & 0xFFFFFFFFFFFFFFFF, obj.transfer_id >> 64,
+                obj.transfer_amount & 0xFFFFFFFFFFFFFFFF, obj.transfer_amount >> 64,
+                obj.transfer_pending_id & 0xFFFFFFFFFFFFFFFF, obj.transfer_pending_id >> 64,
+                obj.transfer_user_data_128 & 0xFFFFFFFFFFFFFFFF, obj.transfer_user_data_128 >> 64,
+                obj.transfer_user_data_64,
+                obj.transfer_user_data_32,
+                obj.transfer_timeout,
+                obj.transfer_code,
+                obj.transfer_flags,
+                obj.ledger,
+                obj.type,
+                obj.debit_account_id & 0xFFFFFFFFFFFFFFFF, obj.debit_account_id >> 64,
+                obj.debit_account_debits_pending & 0xFFFFFFFFFFFFFFFF,
+                obj.debit_account_debits_pending >> 64,
+                obj.debit_account_debits_posted & 0xFFFFFFFFFFFFFFFF,
+                obj.debit_account_debits_posted >> 64,
+                obj.debit_account_credits_pending & 0xFFFFFFFFFFFFFFFF,
+                obj.debit_account_credits_pending >> 64,
+                obj.debit_account_credits_posted & 0xFFFFFFFFFFFFFFFF,
+                obj.debit_account_credits_posted >> 64,
+                obj.debit_account_user_data_128 & 0xFFFFFFFFFFFFFFFF,
+                obj.debit_account_user_data_128 >> 64,
+                obj.debit_account_user_data_64,
+                obj.debit_account_user_data_32,
+                obj.debit_account_code,
+                obj.debit_account_flags,
+                obj.credit_account_id & 0xFFFFFFFFFFFFFFFF, obj.credit_account_id >> 64,
+                obj.credit_account_debits_pending & 0xFFFFFFFFFFFFFFFF,
+                obj.credit_account_debits_pending >> 64,
+                obj.credit_account_debits_posted & 0xFFFFFFFFFFFFFFFF,
+                obj.credit_account_debits_posted >> 64,
+                obj.credit_account_credits_pending & 0xFFFFFFFFFFFFFFFF,
+                obj.credit_account_credits_pending >> 64,
+                obj.credit_account_credits_posted & 0xFFFFFFFFFFFFFFFF,
+                obj.credit_account_credits_posted >> 64,
+                obj.credit_account_user_data_128 & 0xFFFFFFFFFFFFFFFF,
+                obj.credit_account_user_data_128 >> 64,
+                obj.credit_account_user_data_64,
+                obj.credit_account_user_data_32,
+                obj.credit_account_code,
+                obj.credit_account_flags,
+                obj.timestamp,
+                obj.transfer_timestamp,
+                obj.debit_account_timestamp,
+                obj.credit_account_timestamp,
+            )
+
+CChangeEvent._fields_ = [ # noqa: SLF001
+    ("transfer_id", c_uint128),
+    ("transfer_amount", c_uint128),
+    ("transfer_pending_id", c_uint128),
+    ("transfer_user_data_128", c_uint128),
+    ("transfer_user_data_64", ctypes.c_uint64),
+    ("transfer_user_data_32", ctypes.c_uint32),
+    ("transfer_timeout", ctypes.c_uint32),
+    ("transfer_code", ctypes.c_uint16),
+    ("transfer_flags", ctypes.c_uint16),
+    ("ledger", ctypes.c_uint32),
+    ("type", ctypes.c_uint8),
+    ("reserved", ctypes.c_uint8 * 39),
+    ("debit_account_id", c_uint128),
+    ("debit_account_debits_pending", c_uint128),
+    ("debit_account_debits_posted", c_uint128),
+    ("debit_account_credits_pending", c_uint128),
+    ("debit_account_credits_posted", c_uint128),
+    ("debit_account_user_data_128", c_uint128),
+    ("debit_account_user_data_64", ctypes.c_uint64),
+    ("debit_account_user_data_32", ctypes.c_uint32),
+    ("debit_account_code", ctypes.c_uint16),
+    ("debit_account_flags", ctypes.c_uint16),
+    ("credit_account_id", c_uint128),
+    ("credit_account_debits_pending", c_uint128),
+    ("credit_account_debits_posted", c_uint128),
+    ("credit_account_credits_pending", c_uint128),
+    ("credit_account_credits_posted", c_uint128),
+    ("credit_account_user_data_128", c_uint128),
+    ("credit_account_user_data_64", ctypes.c_uint64),
+    ("credit_account_user_data_32", ctypes.c_uint32),
+    ("credit_account_code", ctypes.c_uint16),
+    ("credit_account_flags", ctypes.c_uint16),
+    ("timestamp", ctypes.c_uint64),
+    ("transfer_timestamp", ctypes.c_uint64),
+    ("debit_account_timestamp", ctypes.c_uint64),
+    ("credit_account_timestamp", ctypes.c_uint64),
+]
+
+
+class CChangeEventsFilter(ctypes.Structure):
+    _struct = struct.Struct("<QQI44x")
+
+    @classmethod
+    def from_param(cls, obj: Any) -> Self:
+        validate_uint(bits=64, name="timestamp_min", number=obj.timestamp_min)
+        validate_uint(bits=64, name="timestamp_max", number=obj.timestamp_max)
+        validate_uint(bits=32, name="limit", number=obj.limit)
+        return cls(
+            timestamp_min=obj.timestamp_min,
+            timestamp_max=obj.timestamp_max,
+            limit=obj.limit,
+        )
+
+
+    def to_python(self) -> ChangeEventsFilter:
+        return ChangeEventsFilter(
+            timestamp_min=self.timestamp_min,
+            timestamp_max=self.timestamp_max,
+            limit=self.limit,
+        )
+
+
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(
+                buffer,
+                index * 64,
+                obj.timestamp_min,
+                obj.timestamp_max,
+                obj.limit,
+            )
+
+CChangeEventsFilter._fields_ = [ # noqa: SLF001
+    ("timestamp_min", ctypes.c_uint64),
+    ("timestamp_max", ctypes.c_uint64),
+    ("limit", ctypes.c_uint32),
+    ("reserved", ctypes.c_uint8 * 44),
+]
+
+
 # Don't be tempted to use c_char_p for bytes_ptr - it's for null terminated strings only.
 OnCompletion = ctypes.CFUNCTYPE(None, ctypes.c_void_p, ctypes.POINTER(CPacket),
                                 ctypes.c_uint64, ctypes.c_void_p, ctypes.c_uint32)
@@ -652,51 +1133,88 @@ class InitParameters(ctypes.Structure):
     _fields_ = [("cluster_id", c_uint128), ("client_id", c_uint128),
                 ("addresses_ptr", ctypes.c_void_p), ("addresses_len", ctypes.c_uint64)]
 
-# Initialize a new TigerBeetle client which connects to the addresses provided and
-# completes submitted packets by invoking the callback with the given context.
-tb_client_init = tbclient.tb_client_init
-tb_client_init.restype = InitStatus
-tb_client_init.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(ctypes.c_uint8 * 16),
-                           ctypes.c_char_p, ctypes.c_uint32, ctypes.c_void_p,
-                           OnCompletion]
-
-# Initialize a new TigerBeetle client which echos back any data submitted.
-tb_client_init_echo = tbclient.tb_client_init_echo
-tb_client_init_echo.restype = InitStatus
-tb_client_init_echo.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(ctypes.c_uint8 * 16),
-                                ctypes.c_char_p, ctypes.c_uint32, ctypes.c_void_p,
-                                OnCompletion]
-
-# Returns the cluster_id and addresses passed in to either tb_client_init or
-# tb_client_init_echo.
-tb_client_init_parameters = tbclient.tb_client_init_parameters
-tb_client_init_parameters.restype = ClientStatus
-tb_client_init_parameters.argtypes = [ctypes.POINTER(CClient),
-                                      ctypes.POINTER(InitParameters)]
-
-# Closes the client, causing any previously submitted packets to be completed with
-# `TB_PACKET_CLIENT_SHUTDOWN` before freeing any allocated client resources from init.
-# It is undefined behavior to use any functions on the client once deinit is called.
-tb_client_deinit = tbclient.tb_client_deinit
-tb_client_deinit.restype = ClientStatus
-tb_client_deinit.argtypes = [ctypes.POINTER(CClient)]
-
-# Submit a packet with its operation, data, and data_size fields set.
-# Once completed, `on_completion` will be invoked with `on_completion_ctx` and the given
-# packet on the `tb_client` thread (separate from caller's thread).
-tb_client_submit = tbclient.tb_client_submit
-tb_client_submit.restype = ClientStatus
-tb_client_submit.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(CPacket)]
-
-tb_client_register_log_callback = tbclient.tb_client_register_log_callback
-tb_client_register_log_callback.restype = RegisterLogCallbackStatus
-# Need to pass in None to clear - ctypes will error if argtypes is set.
-# tb_client_register_log_callback.argtypes = [LogHandler, ctypes.c_bool]
+def __getattr__(name: str) -> Any:
+    """
+    Binds the functions exported by tb_client on first use rather than on import, as doing so
+    loads the native library.
+    """
+    if not name.startswith("tb_client_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    tbclient = load_tbclient()
+
+    # Initialize a new TigerBeetle client which connects to the addresses provided and
+    # completes submitted packets by invoking the callback with the given context.
+    tb_client_init = tbclient.tb_client_init
+    tb_client_init.restype = InitStatus
+    tb_client_init.argtypes = [ctypes.POINTER(CClient),
+                               ctypes.POINTER(ctypes.c_uint8 * 16), ctypes.c_char_p,
+                               ctypes.c_uint32, ctypes.c_void_p, OnCompletion]
+
+    # Initialize a new TigerBeetle client which echos back any data submitted.
+    tb_client_init_echo = tbclient.tb_client_init_echo
+    tb_client_init_echo.restype = InitStatus
+    tb_client_init_echo.argtypes = [ctypes.POINTER(CClient),
+                                    ctypes.POINTER(ctypes.c_uint8 * 16), ctypes.c_char_p,
+                                    ctypes.c_uint32, ctypes.c_void_p, OnCompletion]
+
+    # Returns the cluster_id and addresses passed in to either tb_client_init or
+    # tb_client_init_echo.
+    tb_client_init_parameters = tbclient.tb_client_init_parameters
+    tb_client_init_parameters.restype = ClientStatus
+    tb_client_init_parameters.argtypes = [ctypes.POINTER(CClient),
+                                          ctypes.POINTER(InitParameters)]
+
+    # Closes the client, causing any previously submitted packets to be completed with
+    # `TB_PACKET_CLIENT_SHUTDOWN` before freeing any allocated client resources from init.
+    # It is undefined behavior to use any functions on the client once deinit is called.
+    tb_client_deinit = tbclient.tb_client_deinit
+    tb_client_deinit.restype = ClientStatus
+    tb_client_deinit.argtypes = [ctypes.POINTER(CClient)]
+
+    # Submit a packet with its operation, data, and data_size fields set.
+    # Once completed, `on_completion` will be invoked with `on_completion_ctx` and the given
+    # packet on the `tb_client` thread (separate from caller's thread).
+    tb_client_submit = tbclient.tb_client_submit
+    tb_client_submit.restype = ClientStatus
+    tb_client_submit.argtypes = [ctypes.POINTER(CClient), ctypes.POINTER(CPacket)]
+
+    tb_client_register_log_callback = tbclient.tb_client_register_log_callback
+    tb_client_register_log_callback.restype = RegisterLogCallbackStatus
+    # Need to pass in None to clear - ctypes will error if argtypes is set.
+    # tb_client_register_log_callback.argtypes = [LogHandler, ctypes.c_bool]
+
+    # Later lookups find these directly, without calling back into __getattr__.
+    globals().update(
+        tb_client_init=tb_client_init,
+        tb_client_init_echo=tb_client_init_echo,
+        tb_client_init_parameters=tb_client_init_parameters,
+        tb_client_deinit=tb_client_deinit,
+        tb_client_submit=tb_client_submit,
+        tb_client_register_log_callback=tb_client_register_log_callback,
+    )
+    if name not in globals():
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals()[name]
+
+
+# The event and result ctypes of every operation, for submitting them generically.
+OPERATION_CTYPES: dict[Operation, tuple[Any, Any]] = {
+    Operation.CREATE_ACCOUNTS: (CAccount, CCreateAccountResult),
+    Operation.CREATE_TRANSFERS: (CTransfer, CCreateTransferResult),
+    Operation.LOOKUP_ACCOUNTS: (c_uint128, CAccount),
+    Operation.LOOKUP_TRANSFERS: (c_uint128, CTransfer),
+    Operation.GET_ACCOUNT_TRANSFERS: (CAccountFilter, CTransfer),
+    Operation.GET_ACCOUNT_BALANCES: (CAccountFilter, CAccountBalance),
+    Operation.QUERY_ACCOUNTS: (CQueryFilter, CAccount),
+    Operation.QUERY_TRANSFERS: (CQueryFilter, CTransfer),
+    Operation.GET_CHANGE_EVENTS: (CChangeEventsFilter, CChangeEvent),
+}
 
 
 class AsyncStateMachineMixin:
     _submit: Callable[[Operation, Any, Any, Any], Any]
-    async def create_accounts(self, accounts: list[Account]) -> list[CreateAccountResult]:
+    async def create_accounts(self, accounts: list[Account] | Buffer) -> list[CreateAccountResult]:
         return await self._submit(  # type: ignore[no-any-return]
             Operation.CREATE_ACCOUNTS,
             accounts,
@@ -704,7 +1222,8 @@ class AsyncStateMachineMixin:
             CCreateAccountResult,
         )
 
-    async def create_transfers(self, transfers: list[Transfer]) -> list[CreateTransferResult]:
+    async def create_transfers(self, transfers: list[Transfer] | Buffer
+                               ) -> list[CreateTransferResult]:
         return await self._submit(  # type: ignore[no-any-return]
             Operation.CREATE_TRANSFERS,
             transfers,
@@ -712,7 +1231,7 @@ class AsyncStateMachineMixin:
             CCreateTransferResult,
         )
 
-    async def lookup_accounts(self, accounts: list[int]) -> list[Account]:
+    async def lookup_accounts(self, accounts: list[int] | Buffer) -> list[Account]:
         return await self._submit(  # type: ignore[no-any-return]
             Operation.LOOKUP_ACCOUNTS,
             accounts,
@@ -720,7 +1239,7 @@ class AsyncStateMachineMixin:
             CAccount,
         )
 
-    async def lookup_transfers(self, transfers: list[int]) -> list[Transfer]:
+    async def lookup_transfers(self, transfers: list[int] | Buffer) -> list[Transfer]:
         return await self._submit(  # type: ignore[no-any-return]
             Operation.LOOKUP_TRANSFERS,
             transfers,
@@ -760,11 +1279,20 @@ class AsyncStateMachineMixin:
             CTransfer,
         )
 
+    async def get_change_events(self, filter: ChangeEventsFilter) -> list[ChangeEvent]:
+        return await self._submit(  # type: ignore[no-any-return]
+            Operation.GET_CHANGE_EVENTS,
+            [filter],
+            CChangeEventsFilter,
+            CChangeEvent,
+        )
+
 
 
 class StateMachineMixin:
     _submit: Callable[[Operation, Any, Any, Any], Any]
-    def create_accounts(self, accounts: list[Account]) -> list[CreateAccountResult]:
+    _submit_future: Callable[[Operation, Any, Any, Any], Any]
+    def create_accounts(self, accounts: list[Account] | Buffer) -> list[CreateAccountResult]:
         return self._submit(  # type: ignore[no-any-return]
             Operation.CREATE_ACCOUNTS,
             accounts,
@@ -772,7 +1300,7 @@ class StateMachineMixin:
             CCreateAccountResult,
         )
 
-    def create_transfers(self, transfers: list[Transfer]) -> list[CreateTransferResult]:
+    def create_transfers(self, transfers: list[Transfer] | Buffer) -> list[CreateTransferResult]:
         return self._submit(  # type: ignore[no-any-return]
             Operation.CREATE_TRANSFERS,
             transfers,
@@ -780,7 +1308,7 @@ class StateMachineMixin:
             CCreateTransferResult,
         )
 
-    def lookup_accounts(self, accounts: list[int]) -> list[Account]:
+    def lookup_accounts(self, accounts: list[int] | Buffer) -> list[Account]:
         return self._submit(  # type: ignore[no-any-return]
             Operation.LOOKUP_ACCOUNTS,
             accounts,
@@ -788,7 +1316,7 @@ class StateMachineMixin:
             CAccount,
         )
 
-    def lookup_transfers(self, transfers: list[int]) -> list[Transfer]:
+    def lookup_transfers(self, transfers: list[int] | Buffer) -> list[Transfer]:
         return self._submit(  # type: ignore[no-any-return]
             Operation.LOOKUP_TRANSFERS,
             transfers,
@@ -828,5 +1356,87 @@ class StateMachineMixin:
             CTransfer,
         )
 
+    def get_change_events(self, filter: ChangeEventsFilter) -> list[ChangeEvent]:
+        return self._submit(  # type: ignore[no-any-return]
+            Operation.GET_CHANGE_EVENTS,
+            [filter],
+            CChangeEventsFilter,
+            CChangeEvent,
+        )
+
+    def create_accounts_future(self, accounts: list[Account] | Buffer
+                               ) -> Future[list[CreateAccountResult]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.CREATE_ACCOUNTS,
+            accounts,
+            CAccount,
+            CCreateAccountResult,
+        )
+
+    def create_transfers_future(self, transfers: list[Transfer] | Buffer
+                                ) -> Future[list[CreateTransferResult]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.CREATE_TRANSFERS,
+            transfers,
+            CTransfer,
+            CCreateTransferResult,
+        )
+
+    def lookup_accounts_future(self, accounts: list[int] | Buffer) -> Future[list[Account]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.LOOKUP_ACCOUNTS,
+            accounts,
+            c_uint128,
+            CAccount,
+        )
+
+    def lookup_transfers_future(self, transfers: list[int] | Buffer) -> Future[list[Transfer]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.LOOKUP_TRANSFERS,
+            transfers,
+            c_uint128,
+            CTransfer,
+        )
+
+    def get_account_transfers_future(self, filter: AccountFilter) -> Future[list[Transfer]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.GET_ACCOUNT_TRANSFERS,
+            [filter],
+            CAccountFilter,
+            CTransfer,
+        )
+
+    def get_account_balances_future(self, filter: AccountFilter) -> Future[list[AccountBalance]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.GET_ACCOUNT_BALANCES,
+            [filter],
+            CAccountFilter,
+            CAccountBalance,
+        )
+
+    def query_accounts_future(self, query_filter: QueryFilter) -> Future[list[Account]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.QUERY_ACCOUNTS,
+            [query_filter],
+            CQueryFilter,
+            CAccount,
+        )
+
+    def query_transfers_future(self, query_filter: QueryFilter) -> Future[list[Transfer]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.QUERY_TRANSFERS,
+            [query_filter],
+            CQueryFilter,
+            CTransfer,
+        )
+
+    def get_change_events_future(self, filter: ChangeEventsFilter) -> Future[list[ChangeEvent]]:
+        return self._submit_future(  # type: ignore[no-any-return]
+            Operation.GET_CHANGE_EVENTS,
+            [filter],
+            CChangeEventsFilter,
+            CChangeEvent,
+        )
+
 
 
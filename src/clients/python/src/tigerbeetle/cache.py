@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import threading
+import time
+from collections.abc import Iterable  # noqa: TCH003
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from . import bindings
+from .lib import tb_assert
+if TYPE_CHECKING:
+    from .client import ClientSync
+
+
+@dataclass
+class AccountCacheStats:
+    # Lookups answered from the cache.
+    hits: int = 0
+    # Lookups which had to go to the cluster.
+    misses: int = 0
+    # Misses which waited for another caller's lookup of the same account, instead of their own.
+    coalesced: int = 0
+    # Balances dropped to stay within `maxsize`, or because they outlived `ttl`.
+    evictions: int = 0
+    # Balances dropped because a change event touched their account.
+    invalidations: int = 0
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = dataclasses.field(default_factory=threading.Event)
+    account: bindings.Account | None = None
+    error: Exception | None = None
+
+
+class AccountCache:
+    """
+    A read-through cache in front of `ClientSync.lookup_accounts`, safe to share between threads.
+
+    Fields which never change after an account is created (`id`, `ledger`, `code`, `user_data_*`
+    and `timestamp`) are kept for as long as the cache lives. Balances are only trusted for up to
+    `maxsize` accounts (least recently used are dropped first), for at most `ttl` seconds if set,
+    and until a change event for the account is passed to `apply_change_events`.
+
+    Concurrent misses for the same account are coalesced into a single lookup.
+    """
+
+    def __init__(self, client: ClientSync, *, maxsize: int = 10_000,
+                 ttl: float | None = None) -> None:
+        tb_assert(maxsize > 0)
+        tb_assert(ttl is None or ttl > 0)
+        self._client = client
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+        self._lock = threading.Lock()
+        # Every account looked up so far.
+        self._accounts: dict[int, bindings.Account] = {}
+        # The accounts whose balances are still fresh, by the time they were looked up, in least
+        # recently used order.
+        self._balances: collections.OrderedDict[int, float] = collections.OrderedDict()
+        # The lookups in flight, by account.
+        self._flights: dict[int, _Flight] = {}
+        # Counts every invalidation. Lookups in flight which are invalidated (by sequence number)
+        # aren't cached when they complete, as they might predate the change.
+        self._sequence = 0
+        self._invalidated: dict[int, int] = {}
+        self._stats = AccountCacheStats()
+
+    def lookup_accounts(self, ids: list[int]) -> list[bindings.Account]:
+        """
+        Like `ClientSync.lookup_accounts`, but answered from the cache where the balances are fresh.
+        """
+        return self._lookup(ids, immutable=False)
+
+    def lookup_immutable(self, ids: list[int]) -> list[bindings.Account]:
+        """
+        Like `lookup_accounts`, but any account which was ever looked up is a hit, however old its
+        balances. Only use the fields which never change: `flags` is kept up to date by
+        `apply_change_events`, but may otherwise miss an account being closed.
+        """
+        return self._lookup(ids, immutable=True)
+
+    def apply_change_events(self, events: Iterable[bindings.ChangeEvent]) -> None:
+        """
+        Drops the cached balances of the accounts touched by `events` (eg, from
+        `ClientSync.iter_change_events`), and updates their flags.
+        """
+        with self._lock:
+            for event in events:
+                self._sequence += 1
+                self._invalidate(event.debit_account_id, event.debit_account_flags)
+                self._invalidate(event.credit_account_id, event.credit_account_flags)
+
+    def stats(self) -> AccountCacheStats:
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def _lookup(self, ids: list[int], *, immutable: bool) -> list[bindings.Account]:
+        found: dict[int, bindings.Account] = {}
+        flights: dict[int, _Flight] = {}
+        owned: list[int] = []
+
+        with self._lock:
+            now = time.monotonic()
+            sequence = self._sequence
+            for account_id in ids:
+                if account_id in found or account_id in flights:
+                    continue
+
+                account = self._get(account_id, now, immutable=immutable)
+                if account is not None:
+                    self._stats.hits += 1
+                    found[account_id] = account
+                    continue
+
+                self._stats.misses += 1
+                flight = self._flights.get(account_id)
+                if flight is None:
+                    flight = _Flight()
+                    self._flights[account_id] = flight
+                    owned.append(account_id)
+                else:
+                    self._stats.coalesced += 1
+                flights[account_id] = flight
+
+        if len(owned) > 0:
+            self._fetch(owned, sequence)
+
+        for account_id, flight in flights.items():
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            if flight.account is not None:
+                found[account_id] = flight.account
+
+        # As with lookup_accounts, accounts which don't exist are left out.
+        return [found[account_id] for account_id in ids if account_id in found]
+
+    def _fetch(self, ids: list[int], sequence: int) -> None:
+        try:
+            accounts = {account.id: account for account in self._client.lookup_accounts(ids)}
+        except Exception as error:
+            with self._lock:
+                for account_id in ids:
+                    flight = self._flights.pop(account_id)
+                    self._invalidated.pop(account_id, None)
+                    flight.error = error
+                    flight.done.set()
+            raise
+
+        with self._lock:
+            now = time.monotonic()
+            for account_id in ids:
+                account = accounts.get(account_id)
+                if account is not None and self._invalidated.get(account_id, -1) <= sequence:
+                    self._put(account, now)
+
+                flight = self._flights.pop(account_id)
+                self._invalidated.pop(account_id, None)
+                flight.account = account
+                flight.done.set()
+
+    def _get(self, account_id: int, now: float, *, immutable: bool) -> bindings.Account | None:
+        account = self._accounts.get(account_id)
+        if account is None or immutable:
+            return account
+
+        looked_up_at = self._balances.get(account_id)
+        if looked_up_at is None:
+            return None
+        if self._ttl is not None and now - looked_up_at > self._ttl:
+            del self._balances[account_id]
+            self._stats.evictions += 1
+            return None
+
+        self._balances.move_to_end(account_id)
+        return account
+
+    def _put(self, account: bindings.Account, now: float) -> None:
+        self._accounts[account.id] = account
+        self._balances[account.id] = now
+        self._balances.move_to_end(account.id)
+        while len(self._balances) > self._maxsize:
+            self._balances.popitem(last=False)
+            self._stats.evictions += 1
+
+    def _invalidate(self, account_id: int, flags: bindings.AccountFlags) -> None:
+        if self._balances.pop(account_id, None) is not None:
+            self._stats.invalidations += 1
+
+        account = self._accounts.get(account_id)
+        if account is not None and account.flags != flags:
+            self._accounts[account_id] = dataclasses.replace(account, flags=flags)
+
+        if account_id in self._flights:
+            self._invalidated[account_id] = self._sequence
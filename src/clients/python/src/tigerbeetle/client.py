@@ -1,35 +1,65 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+import concurrent.futures
 import ctypes
+import dataclasses
+import enum
+import itertools
 import logging
-import os
+import queue
+import struct
 import sys
 import threading
 import time
-from collections.abc import Callable  # noqa: TCH003
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator  # noqa: TCH003
+from dataclasses import dataclass, field
 from typing import Any
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
     from typing_extensions import Self
 
-from . import bindings
-from .lib import tb_assert, c_uint128
+from . import arrays, bindings, views
+from .echo import EchoReply, synthesize_reply
+from .metrics import RequestMetrics
+from .lib import tb_assert, c_uint128, IntegerOverflowError
+from .ulid import id_generator
 
 logger = logging.getLogger("tigerbeetle")
 
+# False on free-threaded builds running without the GIL (PEP 703).
+_GIL_ENABLED: bool = getattr(sys, "_is_gil_enabled", lambda: True)()
+
 
 class AtomicInteger:
+    """
+    A counter which threads can increment without taking a lock.
+
+    This relies on the GIL: `next()` on an `itertools.count` is a single call into C, so increments
+    can't be lost or repeated. Free-threaded builds don't guarantee that, so there they take a lock.
+    """
+
     def __init__(self, value: int = 0) -> None:
-        self._value = value
-        self._lock = threading.Lock()
+        self._count = itertools.count(value + 1)
+        self._lock = None if _GIL_ENABLED else threading.Lock()
 
     def increment(self) -> int:
+        """
+        Returns the new value.
+        """
+        if self._lock is None:
+            return next(self._count)
         with self._lock:
-            self._value += 1
-            return self._value
+            return next(self._count)
+
+    def value(self) -> int:
+        """
+        Returns the current value, without changing it. An `itertools.count` can only be peeked at
+        through its repr, `count(<next value>)`.
+        """
+        return int(repr(self._count)[len("count("):-1]) - 1
 
 
 @dataclass
@@ -37,12 +67,54 @@ class CompletionContextSync:
     event: threading.Event
 
 
+@dataclass
+class CompletionContextFuture:
+    future: concurrent.futures.Future[Any]
+
+
 @dataclass
 class CompletionContextAsync:
     loop: asyncio.AbstractEventLoop
     event: asyncio.Event
 
 
+class ResultFormat(enum.Enum):
+    """
+    How the results of a request are decoded, for `ClientSync.submit` and `ClientAsync.submit`.
+    """
+
+    # A list of dataclasses, eg `list[Transfer]`. This is what the operation methods return.
+    OBJECTS = enum.auto()
+
+    # A NumPy structured array with the layout of the result ctype, filled with a single copy of the
+    # reply. See `numpy_dtype` for how fields are represented.
+    NUMPY = enum.auto()
+
+    # A `RecordViews` sequence over a single owned copy of the reply, whose items decode each field
+    # only when it's first accessed.
+    VIEWS = enum.auto()
+
+    # Only for `create_accounts` and `create_transfers`: a `CreateResultsSummary`, counting the
+    # events created and holding the results of the others. Only those results are decoded.
+    ERRORS = enum.auto()
+
+
+@dataclass
+class CreateResultsSummary:
+    """
+    The results of a `create_accounts` or `create_transfers` request, in `ResultFormat.ERRORS`.
+    """
+
+    # The number of events created.
+    created: int = 0
+    # The number of events which already existed, with the same fields (status `EXISTS`).
+    exists: int = 0
+    # The index of the first event which was neither created nor existed, if any.
+    first_failure: int | None = None
+    # The results of every event which wasn't created, including `EXISTS`, by event index.
+    errors: dict[int, Any] = field(default_factory=dict)
+
+
 @dataclass
 class InflightPacket:
     packet: bindings.CPacket
@@ -50,57 +122,142 @@ class InflightPacket:
     operation: bindings.Operation
     c_event_type: Any
     c_result_type: Any
+    result_format: ResultFormat
     on_completion: Callable[[Self], None] | None
-    on_completion_context: CompletionContextSync | CompletionContextAsync | None
+    on_completion_context: (CompletionContextSync | CompletionContextAsync |
+                            CompletionContextFuture | None)
+    # The pooled buffer backing `packet.data`, if any, returned to the pool with the packet.
+    events_buffer: Any = None
+    # Only measured if the client has an `on_request` hook.
+    encode_ns: int = 0
+    submitted_ns: int = 0
 
-class _IDGenerator:
-    """
-    Generator for Universally Unique and Sortable Identifiers as a 128-bit integers, based on ULIDs.
 
-    Keeps a monotonically increasing millisecond timestamp between calls to `.generate()`.
+@dataclass
+class PoolStats:
+    # Packets reused from the pool.
+    packet_hits: int = 0
+    # Packets allocated because the pool was empty.
+    packet_misses: int = 0
+    # Event buffers reused from the pool.
+    buffer_hits: int = 0
+    # Event buffers allocated because the pool had none of the right type and capacity.
+    buffer_misses: int = 0
+
+
+class _PacketPool:
+    """
+    Recycles the packets of completed requests, along with their sync completion context, and the
+    buffers their events were packed into. Safe to share between threads, without a lock: popping
+    from and appending to the free lists are atomic, so under contention the pool can only
+    overshoot its limits by a few.
+
+    Buffers are kept per event type and capacity. Capacities are powers of two of at least
+    `BUFFER_CAPACITY_MIN` events, capped at the client's batch size limit, so a buffer is reused
+    for any batch of up to twice the size it was allocated for.
     """
-    _last_time_ms: int
-    _last_random: int
-
-    def __init__(self) -> None:
-        self._last_time_ms = time.time_ns() // (1000 * 1000)
-        self._last_random = int.from_bytes(os.urandom(10), 'little')
-        assert self._last_time_ms < (1 << 48)
-        assert self._last_random < (1 << 80)
-
-    def generate(self) -> int:
-        time_ms = time.time_ns() // (1000 * 1000)
 
-        # Ensure time_ms monotonically increases.
-        if time_ms <= self._last_time_ms:
-            time_ms = self._last_time_ms
-        else:
-            self._last_time_ms = time_ms
-            self._last_random = int.from_bytes(os.urandom(10), 'little')
+    BUFFER_CAPACITY_MIN = 16
 
-        self._last_random += 1
-        if self._last_random == 2 ** 80:
-            time_ms += 1
-            self._last_time_ms = time_ms
-            self._last_random = 0
-            if time_ms == 1 << 48:
-                raise Exception('Timestamp bits overflow on monotonic increment')
+    def __init__(self, packets_max: int, buffers_max: int, buffer_capacity_max: int) -> None:
+        tb_assert(packets_max >= 0)
+        tb_assert(buffers_max >= 0)
+        self._packets_max = packets_max
+        self._buffers_max = buffers_max
+        self._buffer_capacity_max = buffer_capacity_max
 
-        return (time_ms << 80) | self._last_random
+        self._packets: list[InflightPacket] = []
+        self._buffers: dict[tuple[Any, int], list[Any]] = {}
+        self._packet_hits = AtomicInteger()
+        self._packet_misses = AtomicInteger()
+        self._buffer_hits = AtomicInteger()
+        self._buffer_misses = AtomicInteger()
 
-# Module-level singleton instance.
-_id_generator = _IDGenerator()
+    def acquire_packet(self) -> InflightPacket | None:
+        """
+        Returns a recycled packet, or None if a new one must be allocated.
+        """
+        try:
+            inflight_packet = self._packets.pop()
+        except IndexError:
+            self._packet_misses.increment()
+            return None
+        self._packet_hits.increment()
+        return inflight_packet
+
+    def acquire_buffer(self, c_event_type: Any, count: int) -> Any:
+        """
+        Returns a buffer of at least `count` events of `c_event_type`.
+        """
+        capacity = max(self.BUFFER_CAPACITY_MIN, 1 << (count - 1).bit_length())
+        capacity = min(capacity, max(count, self._buffer_capacity_max))
+        buffers = self._buffers.get((c_event_type, capacity))
+        if buffers:
+            try:
+                events_buffer = buffers.pop()
+            except IndexError:
+                # Taken by another thread in the meantime.
+                pass
+            else:
+                self._buffer_hits.increment()
+                return events_buffer
+        self._buffer_misses.increment()
+        return (c_event_type * capacity)()
+
+    def release(self, inflight_packet: InflightPacket) -> None:
+        """
+        Returns `inflight_packet` and its events buffer to the pool, once its request has completed.
+        """
+        events_buffer = inflight_packet.events_buffer
+        inflight_packet.events_buffer = None
+        inflight_packet.packet.data = None
+        # Drop any references to the results and the caller's future or event loop.
+        inflight_packet.response = None
+        inflight_packet.on_completion = None
+        if not isinstance(inflight_packet.on_completion_context, CompletionContextSync):
+            inflight_packet.on_completion_context = None
+
+        if len(self._packets) < self._packets_max:
+            self._packets.append(inflight_packet)
+
+        if events_buffer is not None:
+            buffers = self._buffers.setdefault((events_buffer._type_, len(events_buffer)), [])
+            if len(buffers) < self._buffers_max:
+                buffers.append(events_buffer)
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            packet_hits=self._packet_hits.value(),
+            packet_misses=self._packet_misses.value(),
+            buffer_hits=self._buffer_hits.value(),
+            buffer_misses=self._buffer_misses.value(),
+        )
 
 
 def id() -> int:
     """
     Generates a Universally Unique and Sortable Identifier as a 128-bit integer. Based on ULIDs.
     """
-    return _id_generator.generate()
+    return id_generator.generate()
+
+
+def ids(count: int) -> list[int]:
+    """
+    Generates `count` strictly increasing IDs, as `id()` would, but with the per-ID overhead of
+    reading the clock and taking the lock paid only once.
+    """
+    return list(id_generator.generate_many(count))
 
 
 AMOUNT_MAX = (2 ** 128) - 1
 
+# The maximum number of 128 byte events (accounts, transfers) in a single request.
+BATCH_MAX = 8189
+
+# The maximum `limit` of a `get_change_events` request: as many 384 byte change events as fit in a
+# single reply.
+CHANGE_EVENTS_MAX = 2730
+
 
 class InitError(Exception):
     pass
@@ -129,16 +286,53 @@ class Client:
     _clients: dict[int, Any] = {}
     _counter = AtomicInteger()
 
-    def __init__(self, cluster_id: int, replica_addresses: str) -> None:
+    def __init__(self, cluster_id: int, replica_addresses: str, *,
+                 batch_size_limit: int = BATCH_MAX, split_concurrency: int = 4,
+                 packet_pool_size: int = 64, buffer_pool_size: int = 4,
+                 on_request: Callable[[RequestMetrics], None] | None = None,
+                 _echo: bool = False, _echo_reply: EchoReply | None = None) -> None:
+        """
+        Batches of more than `batch_size_limit` events are split into several requests, keeping
+        linked chains together, with up to `split_concurrency` of them submitted at once.
+
+        Up to `packet_pool_size` packets, and `buffer_pool_size` event buffers of each event type
+        and capacity, are kept for reuse once their requests complete. See `pool_stats`.
+
+        If set, `on_request` is called with the `RequestMetrics` of every request, on the client's
+        thread once the request's caller has been handed its results, so it must not block (see
+        `MetricsRegistry.record`). Without it, nothing is measured.
+        """
+        tb_assert(batch_size_limit > 0)
+        tb_assert(split_concurrency > 0)
+        self._batch_size_limit = batch_size_limit
+        self._split_concurrency = split_concurrency
+        self._pool = _PacketPool(packet_pool_size, buffer_pool_size, batch_size_limit)
+        self._on_request = on_request
+        # Echo clients reply to every request with its events: see `echo`.
+        self._echo = _echo
+        self._echo_reply = _echo_reply
+
+        _configure_logging_default()
         self._client_key = Client._counter.increment()
         self._client = bindings.CClient()
 
         self._inflight_packets: dict[int, InflightPacket] = {}
 
+        # tb_client can't have more than one `get_change_events` request in flight per client: the
+        # others are queued here, and submitted in turn as each completes.
+        self._change_events_lock = threading.Lock()
+        self._change_events_inflight = False
+        self._change_events_queue: collections.deque[InflightPacket] = collections.deque()
+        # tb_client doesn't accept requests from its own thread, where requests complete: so the
+        # next one is handed to a thread of its own to submit, started the first time one is queued.
+        self._change_events_ready: queue.SimpleQueue[InflightPacket | None] = queue.SimpleQueue()
+        self._change_events_submitter: threading.Thread | None = None
+
         # ctypes needs a reference to keep this alive through the FFI call. Having it as a temporary
         # within the call _does not_ work.
         cluster_id_u128 = c_uint128.from_param(cluster_id)
-        init_status = bindings.tb_client_init(
+        init = bindings.tb_client_init_echo if _echo else bindings.tb_client_init
+        init_status = init(
             ctypes.byref(self._client),
             ctypes.cast(
                 ctypes.byref(cluster_id_u128), ctypes.POINTER(ctypes.c_uint8 * 16)
@@ -155,28 +349,170 @@ class Client:
 
 
     def _acquire_packet(self, operation: bindings.Operation, operations: Any,
-                        c_event_type: Any, c_result_type: Any) -> InflightPacket:
-        packet = bindings.CPacket()
+                        c_event_type: Any, c_result_type: Any,
+                        result_format: ResultFormat) -> InflightPacket:
+        if result_format == ResultFormat.NUMPY:
+            # Build (and cache) the dtype here, so a missing NumPy is raised to the caller rather
+            # than on the completion thread.
+            arrays.numpy_dtype(c_result_type)
+        if result_format == ResultFormat.ERRORS and c_result_type not in _EXISTS_STATUS:
+            raise ValueError(f"ResultFormat.ERRORS is not supported for {operation.name}")
+        if self._echo and self._echo_reply is None:
+            c_result_type = c_event_type
+
+        encode_start_ns = 0
+        if self._on_request is not None:
+            encode_start_ns = time.perf_counter_ns()
+
+        # Buffers (eg, NumPy structured arrays) already have the right layout and are passed
+        # through as is.
+        events_buffer = None
+        operations_array = arrays.events_from_buffer(operations, c_event_type)
+        if operations_array is None:
+            events_buffer = self._pool.acquire_buffer(c_event_type, len(operations))
+            _pack_events(c_event_type, events_buffer, operations)
+            operations_array = events_buffer
+
+        inflight_packet = self._pool.acquire_packet()
+        if inflight_packet is None:
+            packet = bindings.CPacket()
+            packet.user_data = Client._counter.increment()
+            inflight_packet = InflightPacket(
+                packet=packet,
+                response=None,
+                on_completion=None,
+                on_completion_context=None,
+                operation=operation,
+                c_event_type=c_event_type,
+                c_result_type=c_result_type,
+                result_format=result_format)
+        else:
+            inflight_packet.operation = operation
+            inflight_packet.c_event_type = c_event_type
+            inflight_packet.c_result_type = c_result_type
+            inflight_packet.result_format = result_format
+
+        packet = inflight_packet.packet
         packet.next = None
-        packet.user_data = Client._counter.increment()
         packet.user_tag = 0
         packet.operation = operation
         packet.status = bindings.PacketStatus.OK
+        if events_buffer is None:
+            packet.data_size = ctypes.sizeof(operations_array)
+        else:
+            # A pooled buffer may be larger than the batch.
+            packet.data_size = len(operations) * ctypes.sizeof(c_event_type)
+        packet.data = ctypes.cast(operations_array, ctypes.c_void_p)
+        inflight_packet.events_buffer = events_buffer
+
+        if self._on_request is not None:
+            if events_buffer is not None:
+                inflight_packet.encode_ns = time.perf_counter_ns() - encode_start_ns
+            else:
+                # A chunk of a list which `_split_events` packed carries its share of that time.
+                inflight_packet.encode_ns = getattr(operations_array, "_encode_ns", 0)
+            inflight_packet.submitted_ns = time.perf_counter_ns()
+        return inflight_packet
+
+    def _submit_inflight(self, inflight_packet: InflightPacket) -> bindings.ClientStatus:
+        """
+        Submits `inflight_packet` to tb_client, unless it's a `get_change_events` request and
+        another is in flight: then it's queued, to be submitted once that one completes, and OK is
+        returned as it will be completed either way.
+        """
+        _check_log_debug()
+        if inflight_packet.operation == bindings.Operation.GET_CHANGE_EVENTS:
+            with self._change_events_lock:
+                if self._change_events_inflight:
+                    self._change_events_queue.append(inflight_packet)
+                    if self._change_events_submitter is None:
+                        self._change_events_submitter = threading.Thread(
+                            target=self._submit_change_events, name="tigerbeetle-change-events",
+                            daemon=True)
+                        self._change_events_submitter.start()
+                    return bindings.ClientStatus.OK
+                self._change_events_inflight = True
+
+        client_status: bindings.ClientStatus = bindings.tb_client_submit(
+            ctypes.byref(self._client), ctypes.byref(inflight_packet.packet))
+        if (inflight_packet.operation == bindings.Operation.GET_CHANGE_EVENTS and
+                client_status != bindings.ClientStatus.OK):
+            self._change_events_completed()
+        return client_status
+
+    def _change_events_completed(self) -> None:
+        """
+        Called once the `get_change_events` request in flight is done, to submit the next one
+        queued, if any.
+        """
+        with self._change_events_lock:
+            if len(self._change_events_queue) == 0:
+                self._change_events_inflight = False
+                return
+            inflight_packet = self._change_events_queue.popleft()
+        self._change_events_ready.put(inflight_packet)
+
+    def _submit_change_events(self) -> None:
+        """
+        The loop of the thread which submits queued `get_change_events` requests, until it's handed
+        None.
+        """
+        while True:
+            inflight_packet = self._change_events_ready.get()
+            if inflight_packet is None:
+                return
+            client_status = bindings.tb_client_submit(ctypes.byref(self._client),
+                                                      ctypes.byref(inflight_packet.packet))
+            if client_status != bindings.ClientStatus.OK:
+                self._complete_closed(inflight_packet)
+                self._change_events_completed()
+
+    def _cancel_change_events(self) -> None:
+        """
+        Completes the queued `get_change_events` requests with `ClientClosedError`, once the client
+        has been closed.
+        """
+        if self._change_events_submitter is not None:
+            # Any requests it's still to submit fail, as the client is closed.
+            self._change_events_ready.put(None)
+            self._change_events_submitter.join()
+
+        with self._change_events_lock:
+            queued = list(self._change_events_queue)
+            self._change_events_queue.clear()
+        while not self._change_events_ready.empty():
+            ready = self._change_events_ready.get()
+            if ready is not None:
+                queued.append(ready)
+        for inflight_packet in queued:
+            self._complete_closed(inflight_packet)
 
-        operations_array_type = c_event_type * len(operations)
-        operations_array = operations_array_type(*map(c_event_type.from_param, operations))
+    @staticmethod
+    def _complete_closed(inflight_packet: InflightPacket) -> None:
+        if inflight_packet.on_completion is None:
+            raise TypeError("inflight_packet.on_completion not set")
+        inflight_packet.response = ClientClosedError()
+        inflight_packet.on_completion(inflight_packet)
 
-        packet.data_size = ctypes.sizeof(operations_array)
-        packet.data = ctypes.cast(operations_array, ctypes.c_void_p)
+    @classmethod
+    def echo(cls, *, reply: EchoReply | None = synthesize_reply, **options: Any) -> Self:
+        """
+        Returns a client which doesn't connect to any cluster: tb_client answers every request with
+        its own events, after the same encoding and FFI round trip as for a real one. `reply` then
+        turns those into the bytes of the operation's results, which are decoded as usual. By
+        default, every create succeeds and every lookup finds its id: see `synthesize_reply`. With
+        None, the events themselves are decoded, as the operation's event type.
 
-        return InflightPacket(
-            packet=packet,
-            response=None,
-            on_completion=None,
-            on_completion_context=None,
-            operation=operation,
-            c_event_type=c_event_type,
-            c_result_type=c_result_type)
+        `options` are passed to the constructor. Useful to load test code which embeds the client.
+        """
+        return cls(0, "0", _echo=True, _echo_reply=reply, **options)
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Returns how often packets and event buffers were reused from the pool, rather than
+        allocated.
+        """
+        return self._pool.stats()
 
     @staticmethod
     @bindings.OnCompletion  # type: ignore[misc]
@@ -192,20 +528,29 @@ class Client:
             # Can't use tb_assert here, as mypy complains later that it might be None.
             raise TypeError("inflight_packet.on_completion not set")
 
-        if packet[0].status == bindings.PacketStatus.OK.value:
-            c_result_type = inflight_packet.c_result_type
-            tb_assert(len_ % ctypes.sizeof(c_result_type) == 0)
-
-            # The memory referenced in bytes_ptr is only valid for the duration of this callback. Copy
-            # it to a fresh, Python owned buffer and do the conversion from the raw C type to the Python
-            # dataclass.
-            results_slice = ctypes.cast(
-                bytes_ptr,
-                ctypes.POINTER(c_result_type)
-            )[0:(len_ // ctypes.sizeof(c_result_type))]
-            results = [result.to_python() for result in results_slice]
+        on_request = self._on_request
+        completed_ns = 0
+        if on_request is not None:
+            completed_ns = time.perf_counter_ns()
 
-            inflight_packet.response = results
+        if packet[0].status == bindings.PacketStatus.OK.value:
+            # An exception escaping this callback would be swallowed by ctypes, leaving the caller
+            # waiting forever: hand it to the caller instead.
+            try:
+                if self._echo_reply is not None:
+                    reply = self._echo_reply(inflight_packet.operation,
+                                             ctypes.string_at(bytes_ptr, len_))
+                    reply_buffer = ctypes.create_string_buffer(reply, len(reply))
+                    bytes_ptr = ctypes.addressof(reply_buffer)
+                    len_ = len(reply)
+                inflight_packet.response = _decode_results(
+                    inflight_packet.result_format,
+                    inflight_packet.c_result_type,
+                    bytes_ptr,
+                    len_,
+                )
+            except Exception as error:
+                inflight_packet.response = error
 
         elif packet[0].status == bindings.PacketStatus.TOO_MUCH_DATA.value:
             inflight_packet.response = TooMuchDataError()
@@ -226,8 +571,295 @@ class Client:
             # INVALID_OPERATION and INVALID_DATA_SIZE are unexpected.
             inflight_packet.response = Exception("Unexpected PacketStatus {status}")
 
+        metrics = None
+        if on_request is not None:
+            # Measured before the caller is woken, as the packet may be reused from then on.
+            metrics = RequestMetrics(
+                operation=inflight_packet.operation,
+                batch_size=packet[0].data_size // ctypes.sizeof(inflight_packet.c_event_type),
+                status=bindings.PacketStatus(packet[0].status),
+                encode_ns=inflight_packet.encode_ns,
+                latency_ns=completed_ns - inflight_packet.submitted_ns,
+                decode_ns=time.perf_counter_ns() - completed_ns,
+                timestamp=timestamp,
+            )
+
+        if inflight_packet.operation == bindings.Operation.GET_CHANGE_EVENTS:
+            # Before waking the caller, as the packet (and its operation) may be reused from then
+            # on.
+            self._change_events_completed()
+
         inflight_packet.on_completion(inflight_packet)
 
+        if on_request is not None and metrics is not None:
+            # Like any other exception, one from the hook would be swallowed by ctypes.
+            try:
+                on_request(metrics)
+            except Exception:
+                logger.exception("on_request hook failed")
+
+
+def validate(operation: bindings.Operation, events: Any) -> None:
+    """
+    Checks that `events` can be submitted for `operation`, without submitting them: every integer
+    must fit its field, and buffers (eg, NumPy arrays) must have the event's layout. Raises
+    `IntegerOverflowError` or `ValueError` naming the first offending event otherwise.
+
+    The whole batch is checked in a single pass of the bulk encoder, so this costs about as much as
+    encoding it. Requests always run these checks as part of encoding, so there's nothing to skip
+    for trusted producers.
+    """
+    c_event_type, _ = bindings.OPERATION_CTYPES[operation]
+    if arrays.events_from_buffer(events, c_event_type) is None:
+        _pack_events(c_event_type, (c_event_type * len(events))(), events)
+
+
+def _pack_events(c_event_type: Any, buffer: Any, events: Any) -> None:
+    """
+    Packs `events` into `buffer`. The range of every field is checked by struct as it packs, so
+    there's no per-field Python overhead unless one is out of range.
+    """
+    try:
+        c_event_type.pack_array(buffer, events)
+    except struct.error as error:
+        # struct doesn't say which event or field is out of range: find the event, and run the
+        # per-field checks on it to raise a descriptive error. Fields that aren't range checked
+        # there (eg, flags) fall through.
+        scratch = (c_event_type * 1)()
+        for index, event in enumerate(events):
+            try:
+                c_event_type.pack_array(scratch, [event])
+            except struct.error:
+                try:
+                    c_event_type.from_param(event)
+                except IntegerOverflowError as event_error:
+                    raise IntegerOverflowError(f"events[{index}]: {event_error}") from error
+                raise IntegerOverflowError(f"events[{index}]: {error}") from error
+        raise IntegerOverflowError(str(error)) from error
+
+
+def _decode_results(result_format: ResultFormat, c_result_type: Any, bytes_ptr: Any,
+                    len_: int) -> Any:
+    tb_assert(len_ % ctypes.sizeof(c_result_type) == 0)
+
+    # The memory referenced in bytes_ptr is only valid for the duration of the completion callback.
+    # Copy it to a fresh, Python owned buffer.
+    if result_format == ResultFormat.NUMPY:
+        return arrays.results_to_numpy(c_result_type, bytes_ptr, len_)
+    if result_format == ResultFormat.VIEWS:
+        return views.RecordViews(c_result_type, ctypes.string_at(bytes_ptr, len_))
+    if result_format == ResultFormat.ERRORS:
+        return _decode_errors(c_result_type, ctypes.string_at(bytes_ptr, len_))
+
+    # Do the conversion from the raw C type to the Python dataclass.
+    results_slice = ctypes.cast(
+        bytes_ptr,
+        ctypes.POINTER(c_result_type)
+    )[0:(len_ // ctypes.sizeof(c_result_type))]
+    return [result.to_python() for result in results_slice]
+
+
+_EXISTS_STATUS = {
+    bindings.CCreateAccountResult: bindings.CreateAccountStatus.EXISTS,
+    bindings.CCreateTransferResult: bindings.CreateTransferStatus.EXISTS,
+}
+
+# Maps each byte of a status to 0 if it's 0xFF, as every byte of `CREATED` (0xFFFFFFFF) is, or 1.
+_NOT_CREATED = bytes(0 if byte == 0xFF else 1 for byte in range(256))
+
+
+def _decode_errors(c_result_type: Any, data: bytes) -> CreateResultsSummary:
+    """
+    Finds the results which aren't `CREATED` with a few passes over `data` in C, so that only they
+    are visited in Python, and decoded.
+    """
+    size = ctypes.sizeof(c_result_type)
+    tb_assert(size % 4 == 0 and c_result_type.status.offset % 4 == 0)
+    tb_assert(c_result_type.status.size == 4)
+    statuses = memoryview(data).cast("I")[c_result_type.status.offset // 4::size // 4].tobytes()
+    not_created = statuses.translate(_NOT_CREATED)
+
+    exists_status = _EXISTS_STATUS[c_result_type]
+    summary = CreateResultsSummary(created=len(data) // size)
+    position = not_created.find(1)
+    while position != -1:
+        index = position // 4
+        result = c_result_type.from_buffer_copy(data, index * size).to_python()
+        summary.errors[index] = result
+        summary.created -= 1
+        if result.status == exists_status:
+            summary.exists += 1
+        elif summary.first_failure is None:
+            summary.first_failure = index
+        position = not_created.find(1, (index + 1) * 4)
+    return summary
+
+
+def _merge_summaries(summaries: list[CreateResultsSummary]) -> CreateResultsSummary:
+    merged = CreateResultsSummary()
+    offset = 0
+    for summary in summaries:
+        merged.created += summary.created
+        merged.exists += summary.exists
+        if merged.first_failure is None and summary.first_failure is not None:
+            merged.first_failure = offset + summary.first_failure
+        for index, result in summary.errors.items():
+            merged.errors[offset + index] = result
+        offset += summary.created + len(summary.errors)
+    return merged
+
+
+# Operations which take a batch of independent events: these can be split into several requests,
+# or concatenated from several callers into one, as long as linked chains are kept together.
+_BATCHABLE_OPERATIONS = (
+    bindings.Operation.CREATE_ACCOUNTS,
+    bindings.Operation.CREATE_TRANSFERS,
+    bindings.Operation.LOOKUP_ACCOUNTS,
+    bindings.Operation.LOOKUP_TRANSFERS,
+)
+
+# Both AccountFlags.LINKED and TransferFlags.LINKED.
+_FLAG_LINKED = 1
+
+
+def _split_events(operation: bindings.Operation, events: Any, c_event_type: Any,
+                  batch_size_limit: int) -> list[Any]:
+    """
+    Splits `events` into chunks of at most `batch_size_limit` events, each submitted as its own
+    request. A chunk never ends in the middle of a linked chain, unless the chain alone is longer
+    than `batch_size_limit` (in which case it can't succeed anyway).
+
+    Events which aren't already a buffer are packed once, as a whole, before any chunk is
+    submitted: so an invalid event fails the batch without any of it being committed, and errors
+    name the event by its index in `events`. Each chunk then carries its share of the time that
+    took, as `_encode_ns`, for its `RequestMetrics`.
+    """
+    if operation not in _BATCHABLE_OPERATIONS:
+        return [events]
+
+    # Buffers are split without copying, as ctypes arrays over the same memory.
+    events_array = arrays.events_from_buffer(events, c_event_type)
+    encode_ns = 0
+    if events_array is None and len(events) > batch_size_limit:
+        encode_start_ns = time.perf_counter_ns()
+        events_array = (c_event_type * len(events))()
+        _pack_events(c_event_type, events_array, events)
+        encode_ns = time.perf_counter_ns() - encode_start_ns
+    if events_array is not None:
+        events = events_array
+    if len(events) <= batch_size_limit:
+        return [events]
+
+    linkable = operation in (bindings.Operation.CREATE_ACCOUNTS,
+                             bindings.Operation.CREATE_TRANSFERS)
+    chunks = []
+    start = 0
+    while start < len(events):
+        end = min(start + batch_size_limit, len(events))
+        if linkable and end < len(events):
+            # Move the end back to the start of the chain it would otherwise cut through.
+            chain_start = end
+            while chain_start > start and events[chain_start - 1].flags & _FLAG_LINKED:
+                chain_start -= 1
+            if chain_start > start:
+                end = chain_start
+
+        chunk_type = c_event_type * (end - start)
+        chunk = chunk_type.from_buffer(events, start * ctypes.sizeof(c_event_type))
+        if encode_ns != 0:
+            chunk._encode_ns = encode_ns * (end - start) // len(events)
+        chunks.append(chunk)
+        start = end
+    return chunks
+
+
+def _first_error(responses: list[Any]) -> Exception | None:
+    """
+    The first of `responses` which is an exception, for requests which failed.
+    """
+    for response in responses:
+        if isinstance(response, Exception):
+            return response
+    return None
+
+
+def _merge_results(result_format: ResultFormat, c_result_type: Any,
+                   responses: list[Any]) -> Any:
+    """
+    Concatenates the results of the requests a batch was split into, in order.
+    """
+    if result_format == ResultFormat.NUMPY:
+        import numpy as np
+        return np.concatenate(responses)
+    if result_format == ResultFormat.VIEWS:
+        return views.RecordViews.concatenate(c_result_type, responses)
+    if result_format == ResultFormat.ERRORS:
+        return _merge_summaries(responses)
+    return [result for response in responses for result in response]
+
+
+def _next_page_filter(filter: Any, page: list[Any], reversed_flag: int) -> Any:
+    """
+    Returns the filter for the page following `page`, which was returned for `filter`, or None if
+    it was empty. A page which is shorter than `filter.limit` isn't necessarily the last: the
+    cluster caps each reply to what fits in a message, which may be fewer results than asked for.
+    """
+    if len(page) == 0:
+        return None
+    if filter.flags & reversed_flag:
+        return dataclasses.replace(filter, timestamp_max=page[-1].timestamp - 1)
+    return dataclasses.replace(filter, timestamp_min=page[-1].timestamp + 1)
+
+
+def _time_slices(timestamp_min: int, timestamp_max: int, slices: int) -> list[tuple[int, int]]:
+    """
+    Splits the inclusive range [timestamp_min, timestamp_max] into up to `slices` disjoint,
+    inclusive ranges of (nearly) equal width, in ascending order.
+    """
+    tb_assert(timestamp_min <= timestamp_max)
+    width = timestamp_max - timestamp_min + 1
+    slices = min(slices, width)
+    bounds = [timestamp_min + (width * index) // slices for index in range(slices + 1)]
+    return [(bounds[index], bounds[index + 1] - 1) for index in range(slices)]
+
+
+class _ChangeEventsCursor:
+    """
+    The position within the change event stream for `iter_change_events`, and the backoff while
+    it is idle.
+    """
+
+    def __init__(self, timestamp_min: int, limit: int, idle_interval: float,
+                 idle_interval_max: float | None) -> None:
+        tb_assert(0 < limit <= CHANGE_EVENTS_MAX)
+        tb_assert(idle_interval > 0)
+        self.timestamp_min = timestamp_min
+        self.limit = limit
+        self.idle_interval = idle_interval
+        self.idle_interval_max = max(idle_interval, idle_interval_max or idle_interval)
+        self.idle_delay = idle_interval
+
+    def filter(self) -> bindings.ChangeEventsFilter:
+        return bindings.ChangeEventsFilter(
+            timestamp_min=self.timestamp_min,
+            timestamp_max=0,
+            limit=self.limit,
+        )
+
+    def advance(self, events: list[bindings.ChangeEvent]) -> float | None:
+        """
+        Moves past `events`. Returns how long to wait before polling again if there were none,
+        doubling each time up to the maximum.
+        """
+        if len(events) > 0:
+            self.timestamp_min = events[-1].timestamp + 1
+            self.idle_delay = self.idle_interval
+            return None
+
+        delay = self.idle_delay
+        self.idle_delay = min(self.idle_delay * 2, self.idle_interval_max)
+        return delay
+
 
 class ClientSync(Client, bindings.StateMachineMixin):
     def _on_completion(self, inflight_packet: InflightPacket) -> None:
@@ -235,31 +867,361 @@ class ClientSync(Client, bindings.StateMachineMixin):
             raise TypeError(repr(inflight_packet.on_completion_context))
         inflight_packet.on_completion_context.event.set()
 
+    def submit(self, operation: bindings.Operation, events: Any, *,
+               result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        """
+        Submits a batch of `events` for any operation, returning the results in `result_format`.
+        Operations which take a single filter still expect it to be wrapped in a list.
+        """
+        c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+        return self._submit(operation, events, c_event_type, c_result_type,
+                            result_format=result_format)
+
     def _submit(self, operation: bindings.Operation, operations: list[Any],
-                c_event_type: Any, c_result_type: Any) -> Any:
-        inflight_packet = self._acquire_packet(operation, operations, c_event_type, c_result_type)
+                c_event_type: Any, c_result_type: Any, *,
+                result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        chunks = _split_events(operation, operations, c_event_type, self._batch_size_limit)
+        if len(chunks) == 1:
+            return self._wait(*self._start(operation, chunks[0], c_event_type, c_result_type,
+                                           result_format))
+
+        packets = ((operation, chunk, c_event_type, c_result_type, result_format)
+                   for chunk in chunks)
+        responses = list(self._pipeline(packets, self._split_concurrency))
+        error = _first_error(responses)
+        if error is not None:
+            raise error
+        return _merge_results(result_format, c_result_type, responses)
+
+    def submit_many(self, requests: Iterable[tuple[bindings.Operation, Any]], *,
+                    inflight_max: int = 4,
+                    result_format: ResultFormat = ResultFormat.OBJECTS) -> Iterator[Any]:
+        """
+        Submits each `(operation, events)` of `requests`, keeping up to `inflight_max` requests in
+        flight from this thread, and yields their results in order.
+
+        Requests are only taken from `requests` as the window allows, so it can be a generator
+        reading a file of any size. Nothing is submitted until the returned iterator is consumed.
+        Requests which are larger than `batch_size_limit` are split as for `submit`.
+
+        If a request fails, its exception is yielded in place of its results, and the requests
+        after it carry on. An exception raised by `requests` itself ends the iteration, once the
+        results before it have been yielded.
+        """
+        tb_assert(inflight_max > 0)
+        # For each request taken so far, the number of packets it was split into.
+        packet_counts: collections.deque[tuple[int, Any]] = collections.deque()
+
+        def packets() -> Iterator[tuple[bindings.Operation, Any, Any, Any, ResultFormat] |
+                                  Exception]:
+            for operation, events in requests:
+                c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+                try:
+                    chunks = _split_events(operation, events, c_event_type,
+                                           self._batch_size_limit)
+                except Exception as error:
+                    # Failed to encode, so nothing is submitted for this request.
+                    packet_counts.append((1, c_result_type))
+                    yield error
+                    continue
+                packet_counts.append((len(chunks), c_result_type))
+                for chunk in chunks:
+                    yield operation, chunk, c_event_type, c_result_type, result_format
+
+        responses = []
+        for response in self._pipeline(packets(), inflight_max):
+            responses.append(response)
+            packet_count, c_result_type = packet_counts[0]
+            if len(responses) == packet_count:
+                packet_counts.popleft()
+                error = _first_error(responses)
+                if error is not None:
+                    yield error
+                elif packet_count == 1:
+                    yield responses[0]
+                else:
+                    yield _merge_results(result_format, c_result_type, responses)
+                responses = []
+
+    def _pipeline(self, packets: Iterable[tuple[bindings.Operation, Any, Any, Any, ResultFormat] |
+                                          Exception],
+                  inflight_max: int) -> Iterator[Any]:
+        """
+        Submits each of `packets`, keeping up to `inflight_max` in flight, and yields their
+        responses in order. A packet which fails (or is an exception already) yields its exception
+        in place of its response, and the packets after it carry on. Packets which were already
+        submitted are always waited for, even if the iterator is closed early.
+        """
+        inflight: collections.deque[tuple[InflightPacket, bindings.ClientStatus] | Exception] = \
+            collections.deque()
+
+        def collect(entry: tuple[InflightPacket, bindings.ClientStatus] | Exception) -> Any:
+            if isinstance(entry, Exception):
+                return entry
+            try:
+                return self._wait(*entry)
+            except Exception as error:
+                return error
+
+        packets_iterator = iter(packets)
+        try:
+            while True:
+                # Make room before taking the next packet, so that `packets` is consumed lazily.
+                if len(inflight) == inflight_max:
+                    yield collect(inflight.popleft())
+                try:
+                    packet = next(packets_iterator, None)
+                except Exception:
+                    # Raised once the responses of the packets before it have been yielded.
+                    while len(inflight) > 0:
+                        yield collect(inflight.popleft())
+                    raise
+                if packet is None:
+                    break
+                if isinstance(packet, Exception):
+                    inflight.append(packet)
+                    continue
+                try:
+                    inflight.append(self._start(*packet))
+                except Exception as error:
+                    inflight.append(error)
+
+            while len(inflight) > 0:
+                yield collect(inflight.popleft())
+        finally:
+            while len(inflight) > 0:
+                entry = inflight.popleft()
+                if not isinstance(entry, Exception):
+                    try:
+                        self._wait(*entry)
+                    except Exception:
+                        pass
+
+    def submit_future(self, operation: bindings.Operation, events: Any, *,
+                      result_format: ResultFormat = ResultFormat.OBJECTS
+                      ) -> concurrent.futures.Future[Any]:
+        """
+        Like `submit`, but returns immediately with a future of the results.
+        """
+        c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+        return self._submit_future(operation, events, c_event_type, c_result_type,
+                                   result_format=result_format)
+
+    def _submit_future(self, operation: bindings.Operation, operations: Any,
+                       c_event_type: Any, c_result_type: Any, *,
+                       result_format: ResultFormat = ResultFormat.OBJECTS
+                       ) -> concurrent.futures.Future[Any]:
+        """
+        The future is resolved directly by the completion callback, so no thread is blocked while
+        the request is in flight. Callbacks added with `add_done_callback` run on the client's
+        thread, and must not block, nor submit requests on this client (which tb_client doesn't
+        allow from its own thread).
+
+        Batches larger than `batch_size_limit` are split. Up to `split_concurrency` of their
+        requests are submitted at once; beyond that, the rest are submitted by a thread as earlier
+        ones complete.
+        """
+        chunks = _split_events(operation, operations, c_event_type, self._batch_size_limit)
+        if len(chunks) > self._split_concurrency:
+            return self._submit_future_pipelined(operation, chunks, c_event_type, c_result_type,
+                                                 result_format)
+
+        futures = [
+            self._start_future(operation, chunk, c_event_type, c_result_type, result_format)
+            for chunk in chunks
+        ]
+        if len(futures) == 1:
+            return futures[0]
+
+        merged: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        merged.set_running_or_notify_cancel()
+        remaining = [len(futures)]
+        remaining_lock = threading.Lock()
+
+        def on_done(_: concurrent.futures.Future[Any]) -> None:
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+
+            for future in futures:
+                error = future.exception()
+                if error is not None:
+                    merged.set_exception(error)
+                    return
+            try:
+                merged.set_result(_merge_results(result_format, c_result_type,
+                                                 [future.result() for future in futures]))
+            except Exception as error:
+                merged.set_exception(error)
+
+        for future in futures:
+            future.add_done_callback(on_done)
+        return merged
+
+    def _submit_future_pipelined(self, operation: bindings.Operation, chunks: list[Any],
+                                 c_event_type: Any, c_result_type: Any,
+                                 result_format: ResultFormat) -> concurrent.futures.Future[Any]:
+        """
+        Submits `chunks` through `_pipeline` from a thread of its own, since the completion
+        callback can't submit the next chunk itself.
+        """
+        merged: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        merged.set_running_or_notify_cancel()
+
+        def run() -> None:
+            packets = ((operation, chunk, c_event_type, c_result_type, result_format)
+                       for chunk in chunks)
+            try:
+                responses = list(self._pipeline(packets, self._split_concurrency))
+                error = _first_error(responses)
+                if error is not None:
+                    raise error
+                merged.set_result(_merge_results(result_format, c_result_type, responses))
+            except Exception as error:
+                merged.set_exception(error)
+
+        threading.Thread(target=run, name="tigerbeetle-split", daemon=True).start()
+        return merged
+
+    def _start_future(self, operation: bindings.Operation, operations: Any,
+                      c_event_type: Any, c_result_type: Any,
+                      result_format: ResultFormat) -> concurrent.futures.Future[Any]:
+        future: concurrent.futures.Future[Any] = concurrent.futures.Future()
+        # Once submitted, the request can't be cancelled.
+        future.set_running_or_notify_cancel()
+
+        inflight_packet = self._acquire_packet(operation, operations, c_event_type, c_result_type,
+                                               result_format)
+        self._inflight_packets[inflight_packet.packet.user_data] = inflight_packet
+
+        inflight_packet.on_completion = self._on_completion_future
+        inflight_packet.on_completion_context = CompletionContextFuture(future=future)
+
+        client_state = self._submit_inflight(inflight_packet)
+        if client_state == bindings.ClientStatus.INVALID:
+            del self._inflight_packets[inflight_packet.packet.user_data]
+            self._pool.release(inflight_packet)
+            future.set_exception(ClientClosedError())
+
+        return future
+
+    def _on_completion_future(self, inflight_packet: InflightPacket) -> None:
+        if not isinstance(inflight_packet.on_completion_context, CompletionContextFuture):
+            raise TypeError(repr(inflight_packet.on_completion_context))
+        del self._inflight_packets[inflight_packet.packet.user_data]
+
+        future = inflight_packet.on_completion_context.future
+        response = inflight_packet.response
+        self._pool.release(inflight_packet)
+        if isinstance(response, Exception):
+            future.set_exception(response)
+        else:
+            future.set_result(response)
+
+    def iter_account_transfers(self, filter: bindings.AccountFilter, *,
+                               page_size: int = BATCH_MAX) -> Iterator[bindings.Transfer]:
+        """
+        Yields every transfer matching `filter`, however many there are, fetching them in pages of
+        `page_size` (`filter.limit` is ignored). The next page is requested while the current one
+        is being consumed, and at most two pages are held in memory.
+        """
+        return self._iter_pages(bindings.Operation.GET_ACCOUNT_TRANSFERS, filter,
+                                bindings.AccountFilterFlags.REVERSED, page_size)
+
+    def iter_query_transfers(self, query_filter: bindings.QueryFilter, *,
+                             page_size: int = BATCH_MAX) -> Iterator[bindings.Transfer]:
+        """
+        Yields every transfer matching `query_filter`, as for `iter_account_transfers`.
+        """
+        return self._iter_pages(bindings.Operation.QUERY_TRANSFERS, query_filter,
+                                bindings.QueryFilterFlags.REVERSED, page_size)
+
+    def iter_change_events(self, *, timestamp_min: int = 0, limit: int = CHANGE_EVENTS_MAX,
+                           idle_interval: float = 1.0, idle_interval_max: float | None = None,
+                           checkpoint: Callable[[int], None] | None = None
+                           ) -> Iterator[bindings.ChangeEvent]:
+        """
+        Follows the change event stream from `timestamp_min`, yielding each `ChangeEvent` as it
+        happens, forever.
+
+        Once caught up, the stream is polled every `idle_interval` seconds, backing off by doubling
+        up to `idle_interval_max` while there are no new events.
+
+        `checkpoint` is called with the timestamp of the last event of each batch once all of the
+        batch has been consumed, just before the next batch is requested. After a restart, resuming
+        from the last checkpoint + 1 repeats none of the events which were fully processed.
+        """
+        cursor = _ChangeEventsCursor(timestamp_min, limit, idle_interval, idle_interval_max)
+        while True:
+            events = self.get_change_events(cursor.filter())
+            delay = cursor.advance(events)
+            if delay is not None:
+                time.sleep(delay)
+                continue
+
+            yield from events
+            if checkpoint is not None:
+                checkpoint(events[-1].timestamp)
+
+    def _iter_pages(self, operation: bindings.Operation, filter: Any, reversed_flag: int,
+                    page_size: int) -> Iterator[Any]:
+        tb_assert(page_size > 0)
+        c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+
+        filter = dataclasses.replace(filter, limit=page_size)
+        page_future: concurrent.futures.Future[Any] | None = \
+            self._submit_future(operation, [filter], c_event_type, c_result_type)
+        while page_future is not None:
+            page = page_future.result()
+
+            filter = _next_page_filter(filter, page, reversed_flag)
+            page_future = None
+            if filter is not None:
+                page_future = self._submit_future(operation, [filter], c_event_type,
+                                                  c_result_type)
+
+            yield from page
+
+    def _start(self, operation: bindings.Operation, operations: Any,
+               c_event_type: Any, c_result_type: Any,
+               result_format: ResultFormat) -> tuple[InflightPacket, bindings.ClientStatus]:
+        inflight_packet = self._acquire_packet(operation, operations, c_event_type, c_result_type,
+                                               result_format)
         self._inflight_packets[inflight_packet.packet.user_data] = inflight_packet
 
         inflight_packet.on_completion = self._on_completion
-        inflight_packet.on_completion_context = CompletionContextSync(event=threading.Event())
+        if isinstance(inflight_packet.on_completion_context, CompletionContextSync):
+            # Recycled along with the packet.
+            inflight_packet.on_completion_context.event.clear()
+        else:
+            inflight_packet.on_completion_context = CompletionContextSync(event=threading.Event())
+
+        client_state = self._submit_inflight(inflight_packet)
+        return inflight_packet, client_state
 
-        client_state = bindings.tb_client_submit(ctypes.byref(self._client), ctypes.byref(inflight_packet.packet))
+    def _wait(self, inflight_packet: InflightPacket, client_state: bindings.ClientStatus) -> Any:
+        if not isinstance(inflight_packet.on_completion_context, CompletionContextSync):
+            raise TypeError(repr(inflight_packet.on_completion_context))
         if client_state == bindings.ClientStatus.OK:
             inflight_packet.on_completion_context.event.wait()
 
         del self._inflight_packets[inflight_packet.packet.user_data]
+        response = inflight_packet.response
+        self._pool.release(inflight_packet)
 
         if client_state == bindings.ClientStatus.INVALID:
             raise ClientClosedError()
 
-        if isinstance(inflight_packet.response, Exception):
-            raise inflight_packet.response
+        if isinstance(response, Exception):
+            raise response
 
-        return inflight_packet.response
+        return response
 
     def close(self) -> None:
         tb_assert(self._client is not None)
         bindings.tb_client_deinit(ctypes.byref(self._client))
+        self._cancel_change_events()
 
         tb_assert(len(self._inflight_packets) == 0)
         del Client._clients[self._client_key]
@@ -271,6 +1233,170 @@ class ClientSync(Client, bindings.StateMachineMixin):
         self.close()
 
 
+@dataclass
+class _PendingBatch:
+    events: list[Any]
+    # The number of events submitted by each caller, in order.
+    counts: list[int]
+    sealed: bool = False
+    # One list of results per caller, or the exception the request failed with.
+    responses: list[Any] | Exception | None = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+def _chain_open(operation: bindings.Operation, events: list[Any]) -> bool:
+    """
+    Whether the last event has the LINKED flag set, so the chain would continue into whatever is
+    appended after it.
+    """
+    if operation in (bindings.Operation.CREATE_ACCOUNTS, bindings.Operation.CREATE_TRANSFERS):
+        return len(events) > 0 and bool(events[-1].flags & _FLAG_LINKED)
+    return False
+
+
+def _request_events(operation: bindings.Operation, events: list[Any]) -> list[Any]:
+    """
+    The events to send for a coalesced request. Lookups send each id only once, however many
+    callers asked for it: `_split_results` hands the result to each of them.
+    """
+    if operation in (bindings.Operation.LOOKUP_ACCOUNTS, bindings.Operation.LOOKUP_TRANSFERS):
+        return list(dict.fromkeys(events))
+    return events
+
+
+def _split_results(operation: bindings.Operation, events: list[Any], counts: list[int],
+                   results: list[Any]) -> list[list[Any]]:
+    """
+    Splits the results of a coalesced request back into one list per caller.
+    """
+    responses = []
+    start = 0
+    if operation in (bindings.Operation.CREATE_ACCOUNTS, bindings.Operation.CREATE_TRANSFERS):
+        # One result per event, in order.
+        tb_assert(len(results) == len(events))
+        for count in counts:
+            responses.append(results[start:start + count])
+            start += count
+    else:
+        # Lookups only return the objects which were found, in the order requested.
+        found = {result.id: result for result in results}
+        for count in counts:
+            ids = events[start:start + count]
+            responses.append([found[event_id] for event_id in ids if event_id in found])
+            start += count
+    return responses
+
+
+class BatcherSync(bindings.StateMachineMixin):
+    """
+    Coalesces concurrent requests from many threads into as few requests as possible.
+
+    The first caller of a batch waits up to `window` seconds for other threads to submit events for
+    the same operation (or until `batch_size_limit` events are pending), submits them all as a
+    single request on `client`, and hands each caller back its own results. A batch is sent early
+    when a caller leaves a linked chain open, so that chains never span callers.
+    `batch_size_limit` must fit within the cluster's request size limit: development clusters
+    default to `--limit-request=32KiB`, or 253 transfers.
+
+    Only `create_*` and `lookup_*` with lists of events are coalesced; everything else is submitted
+    directly. Ids which several callers of a coalesced lookup asked for are only sent once.
+    """
+
+    def __init__(self, client: ClientSync, *, window: float = 0.001,
+                 batch_size_limit: int = BATCH_MAX) -> None:
+        tb_assert(window >= 0)
+        tb_assert(0 < batch_size_limit <= BATCH_MAX)
+        self._client = client
+        self._window = window
+        self._batch_size_limit = batch_size_limit
+
+        self._condition = threading.Condition()
+        self._pending: dict[bindings.Operation, _PendingBatch] = {}
+
+    def submit(self, operation: bindings.Operation, events: Any, *,
+               result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        """
+        See `ClientSync.submit`.
+        """
+        c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+        return self._submit(operation, events, c_event_type, c_result_type,
+                            result_format=result_format)
+
+    def _submit(self, operation: bindings.Operation, operations: Any,
+                c_event_type: Any, c_result_type: Any, *,
+                result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        if (operation not in _BATCHABLE_OPERATIONS or
+                result_format != ResultFormat.OBJECTS or
+                not isinstance(operations, list) or
+                not 0 < len(operations) <= self._batch_size_limit):
+            return self._client._submit(operation, operations, c_event_type, c_result_type,
+                                        result_format=result_format)
+
+        # Raise invalid events to their own caller, rather than failing the whole batch.
+        validate(operation, operations)
+
+        chain_open = _chain_open(operation, operations)
+        with self._condition:
+            batch = self._pending.get(operation)
+            if (batch is not None and
+                    len(batch.events) + len(operations) > self._batch_size_limit):
+                # Doesn't fit: send the pending batch now, and start a new one.
+                self._seal(operation, batch)
+                batch = None
+
+            leader = batch is None
+            if batch is None:
+                batch = _PendingBatch(events=[], counts=[])
+                self._pending[operation] = batch
+
+            index = len(batch.counts)
+            batch.events.extend(operations)
+            batch.counts.append(len(operations))
+            if chain_open or len(batch.events) == self._batch_size_limit:
+                self._seal(operation, batch)
+
+            if leader:
+                self._condition.wait_for(lambda: batch.sealed, timeout=self._window)
+                self._seal(operation, batch)
+
+        if leader:
+            try:
+                results = self._client._submit(operation, _request_events(operation, batch.events),
+                                               c_event_type, c_result_type)
+                batch.responses = _split_results(operation, batch.events, batch.counts, results)
+            except Exception as error:
+                batch.responses = error
+            batch.done.set()
+        else:
+            batch.done.wait()
+
+        if isinstance(batch.responses, Exception):
+            raise batch.responses
+        if batch.responses is None:
+            raise TypeError("batch.responses not set")
+
+        return batch.responses[index]
+
+    def _submit_future(self, operation: bindings.Operation, operations: Any,
+                       c_event_type: Any, c_result_type: Any, *,
+                       result_format: ResultFormat = ResultFormat.OBJECTS
+                       ) -> concurrent.futures.Future[Any]:
+        # Futures don't block the caller, so there's nothing to gain by holding them back to be
+        # coalesced.
+        return self._client._submit_future(operation, operations, c_event_type, c_result_type,
+                                           result_format=result_format)
+
+    def _seal(self, operation: bindings.Operation, batch: _PendingBatch) -> None:
+        """
+        Stops `batch` from accepting new events, and wakes up its leader to send it.
+        Must be called with `self._condition` held.
+        """
+        batch.sealed = True
+        if self._pending.get(operation) is batch:
+            del self._pending[operation]
+        self._condition.notify_all()
+
+
 class ClientAsync(Client, bindings.AsyncStateMachineMixin):
     def _on_completion(self, inflight_packet: InflightPacket) -> None:
         """
@@ -290,34 +1416,220 @@ class ClientAsync(Client, bindings.AsyncStateMachineMixin):
             raise TypeError(repr(inflight_packet.on_completion_context))
         inflight_packet.on_completion_context.event.set()
 
+    async def submit(self, operation: bindings.Operation, events: Any, *,
+                     result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        """
+        Submits a batch of `events` for any operation, returning the results in `result_format`.
+        Operations which take a single filter still expect it to be wrapped in a list.
+        """
+        c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+        return await self._submit(operation, events, c_event_type, c_result_type,
+                                  result_format=result_format)
+
     async def _submit(self, operation: bindings.Operation, operations: Any,
-                      c_event_type: Any, c_result_type: Any) -> Any:
-        inflight_packet = self._acquire_packet(operation, operations, c_event_type, c_result_type)
+                      c_event_type: Any, c_result_type: Any, *,
+                      result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        chunks = _split_events(operation, operations, c_event_type, self._batch_size_limit)
+        if len(chunks) == 1:
+            return await self._submit_packet(operation, chunks[0], c_event_type, c_result_type,
+                                             result_format)
+
+        # Keep up to `split_concurrency` requests in flight. Every request is awaited, even if
+        # one fails.
+        semaphore = asyncio.Semaphore(self._split_concurrency)
+
+        async def submit_chunk(chunk: Any) -> Any:
+            async with semaphore:
+                return await self._submit_packet(operation, chunk, c_event_type, c_result_type,
+                                                 result_format)
+
+        responses = await asyncio.gather(*[submit_chunk(chunk) for chunk in chunks],
+                                         return_exceptions=True)
+        for response in responses:
+            if isinstance(response, BaseException):
+                raise response
+        return _merge_results(result_format, c_result_type, responses)
+
+    def iter_account_transfers(self, filter: bindings.AccountFilter, *,
+                               page_size: int = BATCH_MAX) -> AsyncIterator[bindings.Transfer]:
+        """
+        See `ClientSync.iter_account_transfers`.
+        """
+        return self._iter_pages(bindings.Operation.GET_ACCOUNT_TRANSFERS, filter,
+                                bindings.AccountFilterFlags.REVERSED, page_size)
+
+    def iter_query_transfers(self, query_filter: bindings.QueryFilter, *,
+                             page_size: int = BATCH_MAX) -> AsyncIterator[bindings.Transfer]:
+        """
+        See `ClientSync.iter_query_transfers`.
+        """
+        return self._iter_pages(bindings.Operation.QUERY_TRANSFERS, query_filter,
+                                bindings.QueryFilterFlags.REVERSED, page_size)
+
+    async def iter_change_events(self, *, timestamp_min: int = 0,
+                                 limit: int = CHANGE_EVENTS_MAX, idle_interval: float = 1.0,
+                                 idle_interval_max: float | None = None,
+                                 checkpoint: Callable[[int], None] | None = None
+                                 ) -> AsyncIterator[bindings.ChangeEvent]:
+        """
+        See `ClientSync.iter_change_events`.
+        """
+        cursor = _ChangeEventsCursor(timestamp_min, limit, idle_interval, idle_interval_max)
+        while True:
+            events = await self.get_change_events(cursor.filter())
+            delay = cursor.advance(events)
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+
+            for event in events:
+                yield event
+            if checkpoint is not None:
+                checkpoint(events[-1].timestamp)
+
+    async def _iter_pages(self, operation: bindings.Operation, filter: Any, reversed_flag: int,
+                          page_size: int) -> AsyncIterator[Any]:
+        async for page in self._pages(operation, filter, reversed_flag, page_size):
+            for result in page:
+                yield result
+
+    async def _pages(self, operation: bindings.Operation, filter: Any, reversed_flag: int,
+                     page_size: int) -> AsyncIterator[list[Any]]:
+        tb_assert(page_size > 0)
+        c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+
+        filter = dataclasses.replace(filter, limit=page_size)
+        page_task: asyncio.Future[Any] | None = asyncio.ensure_future(
+            self._submit(operation, [filter], c_event_type, c_result_type))
+        try:
+            while page_task is not None:
+                # Shielded, as cancelling the request itself would leave its packet behind.
+                page = await asyncio.shield(page_task)
+
+                filter = _next_page_filter(filter, page, reversed_flag)
+                page_task = None
+                if filter is not None:
+                    page_task = asyncio.ensure_future(
+                        self._submit(operation, [filter], c_event_type, c_result_type))
+
+                yield page
+        finally:
+            if page_task is not None:
+                # The iterator was abandoned with a page still being fetched: let it complete and
+                # discard the result.
+                page_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def export_transfers(self, query_filter: bindings.QueryFilter, *, slices: int = 16,
+                               concurrency: int = 4, ordered: bool = True,
+                               page_size: int = BATCH_MAX) -> AsyncIterator[bindings.Transfer]:
+        """
+        Yields every transfer matching `query_filter`, like `iter_query_transfers`, but splits the
+        filter's timestamp range into `slices` disjoint slices and pages up to `concurrency` of
+        them at once.
+
+        With `ordered`, the transfers are yielded in the same order as `iter_query_transfers`: the
+        slices are read back in turn, while the following ones are fetched ahead. Otherwise, pages
+        are yielded as soon as they arrive, from whichever slice. Either way, each of the up to
+        `concurrency` slices being fetched holds at most three pages (one in flight, one waiting to
+        be queued and one queued), so at most `3 * concurrency + 1` pages are held in memory,
+        including the one being yielded.
+        """
+        tb_assert(slices > 0)
+        tb_assert(concurrency > 0)
+        reversed_flag = bindings.QueryFilterFlags.REVERSED
+
+        # Narrow the range down to the transfers which actually exist, so the slices are even.
+        first = await self.query_transfers(dataclasses.replace(
+            query_filter, limit=1, flags=query_filter.flags & ~reversed_flag))
+        last = await self.query_transfers(dataclasses.replace(
+            query_filter, limit=1, flags=query_filter.flags | reversed_flag))
+        if len(first) == 0 or len(last) == 0:
+            return
+
+        slice_filters = [
+            dataclasses.replace(query_filter, timestamp_min=timestamp_min,
+                                timestamp_max=timestamp_max)
+            for timestamp_min, timestamp_max in
+            _time_slices(first[0].timestamp, last[0].timestamp, slices)
+        ]
+        if query_filter.flags & reversed_flag:
+            slice_filters.reverse()
+
+        # Slices are started in order, so the one being consumed always holds a permit.
+        semaphore = asyncio.Semaphore(concurrency)
+        shared_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=concurrency)
+        queues: list[asyncio.Queue[Any]] = [
+            asyncio.Queue(maxsize=1) if ordered else shared_queue for _ in slice_filters
+        ]
+
+        async def fetch(slice_filter: bindings.QueryFilter, queue: asyncio.Queue[Any]) -> None:
+            async with semaphore:
+                try:
+                    async for page in self._pages(bindings.Operation.QUERY_TRANSFERS,
+                                                  slice_filter, reversed_flag, page_size):
+                        await queue.put(page)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as error:
+                    await queue.put(error)
+                # The end of the slice.
+                await queue.put(None)
+
+        tasks = [
+            asyncio.ensure_future(fetch(slice_filter, queue))
+            for slice_filter, queue in zip(slice_filters, queues)
+        ]
+        try:
+            remaining = len(tasks)
+            queue_index = 0
+            while remaining > 0:
+                page = await queues[queue_index].get()
+                if page is None:
+                    remaining -= 1
+                    if ordered:
+                        queue_index += 1
+                    continue
+                if isinstance(page, Exception):
+                    raise page
+                for transfer in page:
+                    yield transfer
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _submit_packet(self, operation: bindings.Operation, operations: Any,
+                             c_event_type: Any, c_result_type: Any,
+                             result_format: ResultFormat) -> Any:
+        inflight_packet = self._acquire_packet(operation, operations, c_event_type, c_result_type,
+                                               result_format)
         self._inflight_packets[inflight_packet.packet.user_data] = inflight_packet
 
         inflight_packet.on_completion = self._on_completion
         inflight_packet.on_completion_context = CompletionContextAsync(
-            loop=asyncio.get_event_loop(),
+            loop=asyncio.get_running_loop(),
             event=asyncio.Event()
         )
 
-        client_state = bindings.tb_client_submit(ctypes.byref(self._client), ctypes.byref(inflight_packet.packet))
+        client_state = self._submit_inflight(inflight_packet)
         if client_state == bindings.ClientStatus.OK:
             await inflight_packet.on_completion_context.event.wait()
 
         del self._inflight_packets[inflight_packet.packet.user_data]
+        response = inflight_packet.response
+        self._pool.release(inflight_packet)
 
         if client_state == bindings.ClientStatus.INVALID:
             raise ClientClosedError()
 
-        if isinstance(inflight_packet.response, Exception):
-            raise inflight_packet.response
+        if isinstance(response, Exception):
+            raise response
 
-        return inflight_packet.response
+        return response
 
     async def close(self) -> None:
         tb_assert(self._client is not None)
         bindings.tb_client_deinit(ctypes.byref(self._client))
+        self._cancel_change_events()
 
         # tb_client_deinit internally clears any inflight requests, and calls their callbacks, so
         # the client needs to stick around until that's done.
@@ -342,28 +1654,275 @@ class ClientAsync(Client, bindings.AsyncStateMachineMixin):
         await self.close()
 
 
+@dataclass
+class _PendingBatchAsync:
+    events: list[Any]
+    # The number of events submitted by each caller, in order.
+    counts: list[int]
+    # One future per caller, resolved with its own results.
+    futures: list[asyncio.Future[Any]]
+    # The deadline to send the batch by, if it isn't filled up first.
+    handle: asyncio.Handle | None = None
+
+
+class BatcherAsync(bindings.AsyncStateMachineMixin):
+    """
+    Coalesces concurrent requests from many coroutines into as few requests as possible.
+
+    Requests for the same operation made within one iteration of the event loop (or within `window`
+    seconds, if set) are submitted as a single request on `client`, and each caller's await resolves
+    with its own results. As with `BatcherSync`, a batch is sent early when it reaches
+    `batch_size_limit` events or a caller leaves a linked chain open.
+
+    Only `create_*` and `lookup_*` with lists of events are coalesced, and lookups are deduplicated;
+    everything else is submitted directly.
+    """
+
+    def __init__(self, client: ClientAsync, *, window: float = 0,
+                 batch_size_limit: int = BATCH_MAX) -> None:
+        tb_assert(window >= 0)
+        tb_assert(0 < batch_size_limit <= BATCH_MAX)
+        self._client = client
+        self._window = window
+        self._batch_size_limit = batch_size_limit
+
+        # Batches are local to the event loop the requests were made from.
+        self._pending: dict[tuple[asyncio.AbstractEventLoop, bindings.Operation],
+                            _PendingBatchAsync] = {}
+        # Strong references to the tasks sending batches, which asyncio only keeps weakly.
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, operation: bindings.Operation, events: Any, *,
+                     result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        """
+        See `ClientAsync.submit`.
+        """
+        c_event_type, c_result_type = bindings.OPERATION_CTYPES[operation]
+        return await self._submit(operation, events, c_event_type, c_result_type,
+                                  result_format=result_format)
+
+    async def _submit(self, operation: bindings.Operation, operations: Any,
+                      c_event_type: Any, c_result_type: Any, *,
+                      result_format: ResultFormat = ResultFormat.OBJECTS) -> Any:
+        if (operation not in _BATCHABLE_OPERATIONS or
+                result_format != ResultFormat.OBJECTS or
+                not isinstance(operations, list) or
+                not 0 < len(operations) <= self._batch_size_limit):
+            return await self._client._submit(operation, operations, c_event_type, c_result_type,
+                                              result_format=result_format)
+
+        # Raise invalid events to their own caller, rather than failing the whole batch.
+        validate(operation, operations)
+
+        loop = asyncio.get_running_loop()
+        key = (loop, operation)
+        batch = self._pending.get(key)
+        if batch is not None and len(batch.events) + len(operations) > self._batch_size_limit:
+            # Doesn't fit: send the pending batch now, and start a new one.
+            self._send(key, batch, c_event_type, c_result_type)
+            batch = None
+
+        if batch is None:
+            batch = _PendingBatchAsync(events=[], counts=[], futures=[])
+            self._pending[key] = batch
+            if self._window == 0:
+                batch.handle = loop.call_soon(self._send, key, batch, c_event_type, c_result_type)
+            else:
+                batch.handle = loop.call_later(self._window, self._send, key, batch, c_event_type,
+                                               c_result_type)
+
+        future = loop.create_future()
+        batch.events.extend(operations)
+        batch.counts.append(len(operations))
+        batch.futures.append(future)
+        if (_chain_open(operation, operations) or
+                len(batch.events) == self._batch_size_limit):
+            self._send(key, batch, c_event_type, c_result_type)
+
+        return await future
+
+    def _send(self, key: tuple[asyncio.AbstractEventLoop, bindings.Operation],
+              batch: _PendingBatchAsync, c_event_type: Any, c_result_type: Any) -> None:
+        if self._pending.get(key) is not batch:
+            # Already sent.
+            return
+        del self._pending[key]
+        if batch.handle is not None:
+            batch.handle.cancel()
+
+        loop, operation = key
+        task = loop.create_task(self._send_batch(operation, batch, c_event_type, c_result_type))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, operation: bindings.Operation, batch: _PendingBatchAsync,
+                          c_event_type: Any, c_result_type: Any) -> None:
+        try:
+            results = await self._client._submit(operation,
+                                                 _request_events(operation, batch.events),
+                                                 c_event_type, c_result_type)
+            responses = _split_results(operation, batch.events, batch.counts, results)
+        except Exception as error:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for future, response in zip(batch.futures, responses):
+            # The caller may have been cancelled in the meantime.
+            if not future.done():
+                future.set_result(response)
+
+
+_LOG_LEVELS = {
+    bindings.LogLevel.ERR: logging.ERROR,
+    bindings.LogLevel.WARN: logging.WARNING,
+    bindings.LogLevel.INFO: logging.INFO,
+    bindings.LogLevel.DEBUG: logging.DEBUG,
+}
+
+
 @bindings.LogHandler  # type: ignore[misc]
 def log_handler(level_zig: bindings.LogLevel, message_ptr: Any, message_len: int) -> None:
-    level_python = {
-        bindings.LogLevel.ERR: logging.ERROR,
-        bindings.LogLevel.WARN: logging.WARNING,
-        bindings.LogLevel.INFO: logging.INFO,
-        bindings.LogLevel.DEBUG: logging.DEBUG,
-    }[level_zig]
-    logger.log(level_python, ctypes.string_at(message_ptr, message_len).decode("utf-8"))
+    level_python = _LOG_LEVELS[level_zig]
+    # Messages the logger would drop aren't decoded at all.
+    if logger.isEnabledFor(level_python):
+        logger.log(level_python, ctypes.string_at(message_ptr, message_len).decode("utf-8"))
+
+
+class _LogBuffer:
+    """
+    A ring buffer of log messages, filled by the native log callback on the client's thread and
+    drained into `logger` by a background thread, so that logging can't hold up completions. Once
+    full, the oldest messages are dropped.
+    """
+
+    def __init__(self, size: int) -> None:
+        self._messages: collections.deque[tuple[int, bytes]] = collections.deque(maxlen=size)
+        self._wakeup = threading.Event()
+        self._stopped = False
+        # `_dropped` is only written by the callback, and `_dropped_logged` only by the drain
+        # thread, so neither needs a lock.
+        self._dropped = 0
+        self._dropped_logged = 0
+        self.callback = bindings.LogHandler(self._append)
+        self._thread = threading.Thread(target=self._drain, name="tigerbeetle-log", daemon=True)
+        self._thread.start()
+
+    def _append(self, level_zig: bindings.LogLevel, message_ptr: Any, message_len: int) -> None:
+        level_python = _LOG_LEVELS[level_zig]
+        if not logger.isEnabledFor(level_python):
+            return
+        if len(self._messages) == self._messages.maxlen:
+            self._dropped += 1
+        # The message is only valid for the duration of the callback, so it's copied as is, and
+        # decoded later.
+        self._messages.append((level_python, ctypes.string_at(message_ptr, message_len)))
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _drain(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while len(self._messages) > 0:
+                level_python, message = self._messages.popleft()
+                logger.log(level_python, message.decode("utf-8"))
+
+            dropped = self._dropped
+            if dropped > self._dropped_logged:
+                logger.warning("dropped %d log messages, as the log buffer was full",
+                               dropped - self._dropped_logged)
+                self._dropped_logged = dropped
+
+            if self._stopped:
+                return
+
+    def stop(self) -> None:
+        """
+        Logs whatever is left in the buffer and stops the drain thread. The callback must have been
+        unregistered already.
+        """
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+
+
+# Whether a log handler has been registered, by `configure_logging` or the first client.
+_logging_configured = False
+_logging_lock = threading.Lock()
+# Whether debug messages are passed to the default `log_handler`, or None if it isn't registered
+# (yet, or because `configure_logging` was called).
+_log_debug: bool | None = None
+# The buffer registered by `configure_logging`, if any.
+_log_buffer: _LogBuffer | None = None
+
 
-tb_assert(bindings.tb_client_register_log_callback(log_handler, True) ==
-    bindings.RegisterLogCallbackStatus.SUCCESS)
+def _configure_logging_default() -> None:
+    """
+    Registers `log_handler` when the first client is constructed, rather than on import (which would
+    load the native library), unless `configure_logging` has been called already.
+
+    Debug messages are only passed from the native client while `logger` would log them, as
+    crossing into Python only to drop each of them is costly. Requests check for the level crossing
+    DEBUG (see `_check_log_debug`), and re-register the handler when it does.
+    """
+    global _logging_configured, _log_debug
+    with _logging_lock:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if not _logging_configured:
+            tb_assert(bindings.tb_client_register_log_callback(log_handler, debug) ==
+                bindings.RegisterLogCallbackStatus.SUCCESS)
+            _logging_configured = True
+            _log_debug = debug
+        elif _log_debug is not None and _log_debug != debug:
+            tb_assert(bindings.tb_client_register_log_callback(None, debug) ==
+                bindings.RegisterLogCallbackStatus.SUCCESS)
+            tb_assert(bindings.tb_client_register_log_callback(log_handler, debug) ==
+                bindings.RegisterLogCallbackStatus.SUCCESS)
+            _log_debug = debug
+
+
+def _check_log_debug() -> None:
+    """
+    Re-registers the default `log_handler` if `logger` has been raised to (or lowered from) DEBUG
+    since it was registered.
+    """
+    if _log_debug is not None and logger.isEnabledFor(logging.DEBUG) != _log_debug:
+        _configure_logging_default()
 
 
 def configure_logging(
     *,
     debug: bool,
     handler: Callable[[bindings.LogLevel, Any, int], None] = log_handler,
+    buffer_size: int = 0,
 ) -> None:
-    # First disable the existing log handler, before enabling the new one.
-    tb_assert(bindings.tb_client_register_log_callback(None, debug) ==
-        bindings.RegisterLogCallbackStatus.SUCCESS)
+    """
+    Registers `handler` for the native client's log messages, including debug messages if `debug`
+    is set. By default these are logged to the `tigerbeetle` logger, on the client's thread.
 
-    tb_assert(bindings.tb_client_register_log_callback(handler, debug) ==
-        bindings.RegisterLogCallbackStatus.SUCCESS)
+    With a `buffer_size`, the messages are instead copied into a ring buffer of up to that many, and
+    logged from a background thread, so that slow logging handlers can't hold up requests. If the
+    buffer fills up, the oldest messages are dropped (and the number dropped is logged).
+    """
+    global _logging_configured, _log_buffer, _log_debug
+    tb_assert(buffer_size >= 0)
+    tb_assert(buffer_size == 0 or handler is log_handler)
+    with _logging_lock:
+        if _logging_configured:
+            # First disable the existing log handler, before enabling the new one.
+            tb_assert(bindings.tb_client_register_log_callback(None, debug) ==
+                bindings.RegisterLogCallbackStatus.SUCCESS)
+        if _log_buffer is not None:
+            _log_buffer.stop()
+            _log_buffer = None
+
+        if buffer_size > 0:
+            _log_buffer = _LogBuffer(buffer_size)
+            handler = _log_buffer.callback
+        tb_assert(bindings.tb_client_register_log_callback(handler, debug) ==
+            bindings.RegisterLogCallbackStatus.SUCCESS)
+        _logging_configured = True
+        # The level is now up to the caller.
+        _log_debug = None
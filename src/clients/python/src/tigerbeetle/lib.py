@@ -1,8 +1,9 @@
 import ctypes
-import platform
+import enum
+import struct
 import sys
-from pathlib import Path
-from typing import Any
+import threading
+from typing import Any, Dict, Optional, Type, TypeVar
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
@@ -18,6 +19,10 @@ class IntegerOverflowError(ValueError):
 
 
 def _load_tbclient() -> ctypes.CDLL:
+    # Only needed here, and slow to import.
+    import platform
+    from pathlib import Path
+
     prefix = ""
     arch = ""
     system = ""
@@ -62,6 +67,22 @@ def _load_tbclient() -> ctypes.CDLL:
     return ctypes.CDLL(str(library_path))
 
 
+_tbclient: Optional[ctypes.CDLL] = None
+_tbclient_lock = threading.Lock()
+
+
+def load_tbclient() -> ctypes.CDLL:
+    """
+    Returns the native library, loading it on first use rather than on import, so that importing the
+    package stays cheap for programs which only sometimes construct a client.
+    """
+    global _tbclient
+    with _tbclient_lock:
+        if _tbclient is None:
+            _tbclient = _load_tbclient()
+        return _tbclient
+
+
 def validate_uint(*, bits: int, name: str, number: int) -> None:
     if number > 2**bits - 1:
         raise IntegerOverflowError(f"{name}=={number} is too large to fit in {bits} bits")
@@ -71,20 +92,52 @@ def validate_uint(*, bits: int, name: str, number: int) -> None:
 
 class c_uint128(ctypes.Structure):  # noqa: N801
     _fields_ = [("_low", ctypes.c_uint64), ("_high", ctypes.c_uint64)]  # noqa: RUF012
+    _struct = struct.Struct("<QQ")
 
     @classmethod
     def from_param(cls, obj: int) -> Self:
         return cls(_high=obj >> 64, _low=obj & 0xFFFFFFFFFFFFFFFF)
 
+    @classmethod
+    def pack_array(cls, buffer: Any, objs: Any) -> None:
+        pack_into = cls._struct.pack_into
+        for index, obj in enumerate(objs):
+            pack_into(buffer, index * 16, obj & 0xFFFFFFFFFFFFFFFF, obj >> 64)
+
     def to_python(self) -> int:
         return int(self._high << 64 | self._low)
 
+E = TypeVar("E", bound=enum.Enum)
+
+
+class EnumDecoder(Dict[int, E]):
+    """
+    Maps raw integers to the members of an `IntEnum`, or an `IntFlag` and any combination of its
+    flags, so that decoding is a dict lookup rather than a call to the enum (which is slow,
+    especially for composite flags). Each value is converted by the enum the first time it's seen,
+    and kept if it's valid, so the table costs nothing until it's used.
+    """
+
+    def __init__(self, enum_type: Type[E]) -> None:
+        super().__init__()
+        self._enum_type = enum_type
+        # Values with bits outside of the mask aren't kept, so the table stays bounded.
+        self._mask: Optional[int] = None
+        if issubclass(enum_type, enum.Flag):
+            self._mask = 0
+            for member in enum_type:
+                self._mask |= member.value
+
+    def __missing__(self, value: int) -> E:
+        member = self._enum_type(value)
+        if self._mask is None or value & ~self._mask == 0:
+            self[value] = member
+        return member
+
+
 def tb_assert(value: Any) -> None:
     """
     Python's built-in assert can be silently disabled if Python is run with -O.
     """
     if not value:
         raise AssertionError()
-
-
-tbclient = _load_tbclient()
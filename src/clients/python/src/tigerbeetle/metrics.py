@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import bisect
+import dataclasses
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from . import bindings
+
+# The upper bounds of the latency histogram's buckets, in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+@dataclass
+class RequestMetrics:
+    """
+    The measurements of a single request, as passed to a client's `on_request` hook.
+    """
+
+    operation: bindings.Operation
+    # The number of events in the request.
+    batch_size: int
+    status: bindings.PacketStatus
+    # The time spent packing the events into the request. Zero for buffers (eg, NumPy arrays),
+    # which are passed through as is. A list split into several requests is packed as a whole,
+    # and each request gets a share of that time in proportion to its events.
+    encode_ns: int
+    # The time from submitting the request until its completion: queueing within the client, the
+    # round trip to the cluster and the cluster's own processing.
+    latency_ns: int
+    # The time spent decoding the reply, on the client's thread.
+    decode_ns: int
+    # The cluster's timestamp for the reply, or 0 if the request failed.
+    timestamp: int
+
+
+@dataclass
+class OperationMetrics:
+    requests: int = 0
+    events: int = 0
+    # Requests which completed with a status other than `PacketStatus.OK`.
+    errors: int = 0
+    encode_ns: int = 0
+    latency_ns: int = 0
+    latency_max_ns: int = 0
+    decode_ns: int = 0
+    # The number of requests by latency, for each of `LATENCY_BUCKETS` and a last one for any
+    # slower.
+    latency_buckets: list[int] = dataclasses.field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+
+class MetricsRegistry:
+    """
+    Aggregates the `RequestMetrics` of every request per operation, in process. Pass `record` as
+    the `on_request` hook of one or more clients:
+
+        registry = tb.MetricsRegistry()
+        client = tb.ClientSync(cluster_id, addresses, on_request=registry.record)
+
+    Then either read the totals with `snapshot`, or serve `exposition` to Prometheus.
+    """
+
+    def __init__(self, namespace: str = "tigerbeetle") -> None:
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._operations: dict[bindings.Operation, OperationMetrics] = {}
+        self._latency_buckets_ns = [int(bound * 1e9) for bound in LATENCY_BUCKETS]
+
+    def record(self, metrics: RequestMetrics) -> None:
+        bucket = bisect.bisect_left(self._latency_buckets_ns, metrics.latency_ns)
+        with self._lock:
+            operation = self._operations.get(metrics.operation)
+            if operation is None:
+                operation = OperationMetrics()
+                self._operations[metrics.operation] = operation
+
+            operation.requests += 1
+            operation.events += metrics.batch_size
+            if metrics.status != bindings.PacketStatus.OK:
+                operation.errors += 1
+            operation.encode_ns += metrics.encode_ns
+            operation.latency_ns += metrics.latency_ns
+            operation.latency_max_ns = max(operation.latency_max_ns, metrics.latency_ns)
+            operation.decode_ns += metrics.decode_ns
+            operation.latency_buckets[bucket] += 1
+
+    def snapshot(self) -> dict[bindings.Operation, OperationMetrics]:
+        """
+        Returns a copy of the totals so far, for each operation which was submitted.
+        """
+        with self._lock:
+            return {
+                operation: dataclasses.replace(
+                    metrics, latency_buckets=list(metrics.latency_buckets))
+                for operation, metrics in self._operations.items()
+            }
+
+    def exposition(self) -> str:
+        """
+        Renders the totals so far in the Prometheus text exposition format.
+        """
+        prefix = self._namespace
+        counters: list[tuple[str, str, Callable[[OperationMetrics], float]]] = [
+            ("requests", "Requests completed.", lambda metrics: metrics.requests),
+            ("events", "Events submitted in completed requests.", lambda metrics: metrics.events),
+            ("request_errors", "Requests which completed with an error status.",
+             lambda metrics: metrics.errors),
+            ("encode_seconds", "Time spent encoding requests.",
+             lambda metrics: metrics.encode_ns / 1e9),
+            ("decode_seconds", "Time spent decoding replies.",
+             lambda metrics: metrics.decode_ns / 1e9),
+        ]
+
+        snapshot = sorted(self.snapshot().items(), key=lambda item: item[0].value)
+        lines = []
+        for name, help, value in counters:
+            lines.append(f"# HELP {prefix}_{name}_total {help}")
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for operation, metrics in snapshot:
+                labels = f'operation="{operation.name.lower()}"'
+                lines.append(f"{prefix}_{name}_total{{{labels}}} {value(metrics)}")
+
+        name = f"{prefix}_request_latency_seconds"
+        lines.append(f"# HELP {name} Time from submitting a request until its completion.")
+        lines.append(f"# TYPE {name} histogram")
+        for operation, metrics in snapshot:
+            labels = f'operation="{operation.name.lower()}"'
+            count = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, metrics.latency_buckets):
+                count += bucket_count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {metrics.requests}')
+            lines.append(f"{name}_sum{{{labels}}} {metrics.latency_ns / 1e9}")
+            lines.append(f"{name}_count{{{labels}}} {metrics.requests}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from .lib import tb_assert
+
+
+class IDGenerator:
+    """
+    Generator for Universally Unique and Sortable Identifiers as a 128-bit integers, based on ULIDs.
+
+    Keeps a monotonically increasing millisecond timestamp between calls to `.generate()`. Safe to
+    share between threads: IDs are strictly increasing across all of them.
+    """
+    _last_time_ms: int
+    _last_random: int
+
+    def __init__(self) -> None:
+        self._last_time_ms = time.time_ns() // (1000 * 1000)
+        self._last_random = int.from_bytes(os.urandom(10), 'little')
+        self._lock = threading.Lock()
+        assert self._last_time_ms < (1 << 48)
+        assert self._last_random < (1 << 80)
+
+    def generate(self) -> int:
+        with self._lock:
+            return self._generate()
+
+    def generate_many(self, count: int) -> range | list[int]:
+        """
+        Generates `count` IDs at once. Within a millisecond, IDs only differ by their random part,
+        which is incremented for each, so they are normally a range of consecutive integers.
+        """
+        tb_assert(count >= 0)
+        with self._lock:
+            time_ms = self._advance_time()
+            if self._last_random + count >= 2 ** 80:
+                # The random part would overflow into the timestamp: fall back to generating each
+                # ID individually, which handles that. This is astronomically unlikely.
+                return [self._generate() for _ in range(count)]
+
+            first = (time_ms << 80) | (self._last_random + 1)
+            self._last_random += count
+            return range(first, first + count)
+
+    def _generate(self) -> int:
+        time_ms = self._advance_time()
+
+        self._last_random += 1
+        if self._last_random == 2 ** 80:
+            time_ms += 1
+            self._last_time_ms = time_ms
+            self._last_random = 0
+            if time_ms == 1 << 48:
+                raise Exception('Timestamp bits overflow on monotonic increment')
+
+        return (time_ms << 80) | self._last_random
+
+    def _advance_time(self) -> int:
+        time_ms = time.time_ns() // (1000 * 1000)
+
+        # Ensure time_ms monotonically increases.
+        if time_ms <= self._last_time_ms:
+            time_ms = self._last_time_ms
+        else:
+            self._last_time_ms = time_ms
+            self._last_random = int.from_bytes(os.urandom(10), 'little')
+
+        return time_ms
+
+
+# Module-level singleton instance, shared by `tb.id()`, `tb.ids()` and `tb.ids_numpy()`.
+id_generator = IDGenerator()
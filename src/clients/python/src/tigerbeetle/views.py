@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import ctypes
+import functools
+import typing
+from typing import Any, Iterator, Sequence, overload
+
+from . import bindings
+from .lib import EnumDecoder, tb_assert
+
+
+@functools.lru_cache(maxsize=None)
+def _view_type(c_type: Any) -> Any:
+    """
+    Returns a `RecordView` subclass for `c_type`, holding the corresponding dataclass and, for each
+    field, its offset and size within the ctype and the `EnumDecoder` for the raw integer (or None
+    if it stays an `int`). Keeping these on the class avoids any per-record setup.
+    """
+    tb_assert(c_type.__name__.startswith("C"))
+    dataclass_type = getattr(bindings, c_type.__name__[1:])
+    field_types = typing.get_type_hints(dataclass_type)
+
+    fields = {}
+    for name, _ in c_type._fields_:
+        if name == "reserved":
+            continue
+        field = getattr(c_type, name)
+        field_type = field_types[name]
+        fields[name] = (field.offset, field.size,
+                        None if field_type is int else EnumDecoder(field_type))
+
+    return type(f"{dataclass_type.__name__}View", (RecordView,), {
+        "_dataclass": dataclass_type,
+        "_fields": fields,
+    })
+
+
+class RecordView:
+    """
+    A read-only view of a single `Account`, `Transfer`, etc within a reply. Fields are decoded on
+    first access and cached, so the cost scales with the fields actually used.
+    """
+
+    _dataclass: Any
+    _fields: dict[str, tuple[int, int, Any]]
+
+    def __init__(self, data: bytes, offset: int) -> None:
+        # Bypass __setattr__, which rejects writes.
+        attributes = self.__dict__
+        attributes["_data"] = data
+        attributes["_offset"] = offset
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for fields which haven't been decoded (cached in __dict__) yet.
+        try:
+            offset, size, decoder = self._fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+        start = self._offset + offset
+        value = int.from_bytes(self._data[start:start + size], "little")
+        if decoder is not None:
+            value = decoder[value]
+
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_python()!r})"
+
+    def to_python(self) -> Any:
+        """
+        Decodes every field, returning the corresponding dataclass (eg, `Account`).
+        """
+        return self._dataclass(**{name: getattr(self, name) for name in self._fields})
+
+
+class RecordViews(Sequence[RecordView]):
+    """
+    The results of a request as a sequence of lazily decoded `RecordView`s, all backed by a single
+    owned copy of the reply.
+    """
+
+    def __init__(self, c_type: Any, data: bytes) -> None:
+        self._view_type = _view_type(c_type)
+        self._data = data
+        self._size = ctypes.sizeof(c_type)
+        self._count = len(data) // self._size
+
+    @classmethod
+    def concatenate(cls, c_type: Any, sequences: list[RecordViews]) -> RecordViews:
+        """
+        Returns the records of all of `sequences`, in order, as a single sequence.
+        """
+        return cls(c_type, b"".join(sequence._data for sequence in sequences))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[RecordView]:
+        view_type = self._view_type
+        data = self._data
+        for offset in range(0, self._count * self._size, self._size):
+            yield view_type(data, offset)
+
+    @overload
+    def __getitem__(self, index: int) -> RecordView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[RecordView]: ...
+
+    def __getitem__(self, index: int | slice) -> RecordView | list[RecordView]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        view: RecordView = self._view_type(self._data, index * self._size)
+        return view
@@ -1,7 +1,12 @@
+import asyncio
+import concurrent.futures
+import itertools
+import logging
 import os
 import sys
+import threading
 import time
-from dataclasses import asdict
+from dataclasses import asdict, replace
 
 import pytest
 
@@ -62,6 +67,71 @@ def test_range_check_code_on_account_to_be_u16(client):
     accounts = client.lookup_accounts([account.id])
     assert accounts == []
 
+def test_range_check_amount_on_transfer_to_be_u128(client):
+    transfer = tb.Transfer(id=tb.id(), debit_account_id=1, credit_account_id=2, amount=2**128,
+                           ledger=1, code=1)
+
+    with pytest.raises(tb.IntegerOverflowError):
+        client.create_transfers([transfer])
+
+    with pytest.raises(tb.IntegerOverflowError):
+        client.create_transfers([tb.Transfer(**{ **asdict(transfer), "amount": -1 })])
+
+    with pytest.raises(tb.IntegerOverflowError):
+        client.lookup_transfers([2**128])
+
+    assert client.lookup_transfers([transfer.id]) == []
+
+def test_validate():
+    transfers = [tb.Transfer(id=tb.id(), debit_account_id=1, credit_account_id=2, amount=1,
+                             ledger=1, code=1) for _ in range(3)]
+    tb.validate(tb.Operation.CREATE_TRANSFERS, transfers)
+    tb.validate(tb.Operation.LOOKUP_TRANSFERS, [2**128 - 1])
+
+    transfers[1] = replace(transfers[1], amount=2**128)
+    with pytest.raises(tb.IntegerOverflowError, match=r"events\[1\]: amount==\d+ is too large"):
+        tb.validate(tb.Operation.CREATE_TRANSFERS, transfers)
+    with pytest.raises(tb.IntegerOverflowError, match=r"events\[2\]"):
+        tb.validate(tb.Operation.LOOKUP_TRANSFERS, [0, 1, -1])
+
+    np = pytest.importorskip("numpy")
+    tb.validate(tb.Operation.CREATE_TRANSFERS,
+                np.zeros(3, dtype=tb.numpy_dtype(tb.bindings.CTransfer)))
+    with pytest.raises(ValueError):
+        tb.validate(tb.Operation.CREATE_TRANSFERS,
+                    np.zeros(3, dtype=tb.numpy_dtype(tb.bindings.CAccount)))
+
+def test_enum_decoder():
+    flags = tb.TransferFlags.LINKED | tb.TransferFlags.PENDING | tb.TransferFlags.IMPORTED
+    transfer = tb.bindings.CTransfer.from_param(tb.Transfer(id=1, flags=flags))
+    assert type(transfer.to_python().flags) is tb.TransferFlags
+    assert transfer.to_python().flags == flags
+
+    decode = tb.lib.EnumDecoder(tb.CreateTransferStatus)
+    assert decode[0xFFFFFFFF] is tb.CreateTransferStatus.CREATED
+    with pytest.raises(ValueError):
+        decode[0xFFFFFFFE]
+
+    # Values are only kept once seen, and only if valid.
+    decode = tb.lib.EnumDecoder(tb.AccountFlags)
+    assert len(decode) == 0
+    assert decode[int(tb.AccountFlags.LINKED)] is tb.AccountFlags.LINKED
+    assert decode[1 << 31] == 1 << 31
+    assert list(decode) == [tb.AccountFlags.LINKED]
+
+def test_import_is_lazy():
+    import subprocess
+
+    # Importing the package alone doesn't load the native library: the first client does.
+    script = "\n".join([
+        "import tigerbeetle as tb",
+        "assert tb.lib._tbclient is None",
+        "assert 'tb_client_init' not in vars(tb.bindings)",
+        "tb.ClientSync.echo().close()",
+        "assert tb.lib._tbclient is not None",
+    ])
+    subprocess.run([sys.executable, "-c", script], check=True)
+
 def test_create_accounts(client):
     results = client.create_accounts([account_a])
     assert len(results) == 1
@@ -1394,6 +1464,880 @@ def test_import_accounts_and_transfers(client):
     assert len(transfers) == 1
     assert transfers[0].timestamp == transfers_results[0].timestamp
 
+def test_create_from_numpy_array(client):
+    np = pytest.importorskip("numpy")
+
+    accounts = np.zeros(2, dtype=tb.numpy_dtype(tb.bindings.CAccount))
+    accounts["id"] = [[tb.id() & (2**64 - 1), 1], [tb.id() & (2**64 - 1), 1]]
+    accounts["ledger"] = 1
+    accounts["code"] = 718
+    account_results = client.create_accounts(accounts)
+    assert [result.status for result in account_results] == [tb.CreateAccountStatus.CREATED] * 2
+
+    transfers = np.zeros(3, dtype=tb.numpy_dtype(tb.bindings.CTransfer))
+    transfers["id"][:, 0] = [tb.id() & (2**64 - 1) for _ in range(3)]
+    transfers["id"][:, 1] = 2**64 - 1
+    transfers["debit_account_id"] = accounts["id"][0]
+    transfers["credit_account_id"] = accounts["id"][1]
+    transfers["amount"] = [[1, 0], [2, 0], [0, 1]]
+    transfers["ledger"] = 1
+    transfers["code"] = 1
+    transfers["flags"] = [tb.TransferFlags.LINKED, tb.TransferFlags.NONE, tb.TransferFlags.NONE]
+    transfer_results = client.create_transfers(transfers)
+    assert [result.status for result in transfer_results] == [tb.CreateTransferStatus.CREATED] * 3
+
+    # Raw bytes work too, as long as the size is a multiple of the event size.
+    transfer_ids = [int(low) | (int(high) << 64) for low, high in transfers["id"]]
+    transfers_lookup = client.lookup_transfers(
+        b"".join(id.to_bytes(16, "little") for id in transfer_ids))
+    assert [transfer.id for transfer in transfers_lookup] == transfer_ids
+    assert [transfer.amount for transfer in transfers_lookup] == [1, 2, 2**64]
+    assert transfers_lookup[0].flags == tb.TransferFlags.LINKED
+
+    with pytest.raises(ValueError):
+        client.lookup_transfers(b"\x00" * 17)
+
+    # The layout is validated once for the whole array.
+    with pytest.raises(ValueError):
+        client.create_transfers(np.zeros(1, dtype=[("id", "<u8", (2,)), ("amount", "<u8", (2,))]))
+
+    # Ids as `(n, 2)` u64s or `(n, 16)` bytes are passed through as is.
+    account_ids = [int(low) | (int(high) << 64) for low, high in accounts["id"]]
+    accounts_lookup = client.lookup_accounts(np.ascontiguousarray(accounts["id"]))
+    assert [account.id for account in accounts_lookup] == account_ids
+    accounts_lookup = client.lookup_accounts(accounts["id"].copy().view(np.uint8))
+    assert [account.id for account in accounts_lookup] == account_ids
+
+def test_create_from_numpy_array_of_values(client):
+    np = pytest.importorskip("numpy")
+
+    # Arrays of plain values or of objects hold events, not their bytes.
+    account_ids = np.array([tb.id() & (2**64 - 1) for _ in range(2)], dtype=np.uint64)
+    accounts = np.array([tb.Account(id=int(id), ledger=1, code=718) for id in account_ids],
+                        dtype=object)
+    account_results = client.create_accounts(accounts)
+    assert [result.status for result in account_results] == [tb.CreateAccountStatus.CREATED] * 2
+
+    accounts_lookup = client.lookup_accounts(account_ids)
+    assert [account.id for account in accounts_lookup] == account_ids.tolist()
+
+def test_result_format_numpy(client):
+    np = pytest.importorskip("numpy")
+
+    account_ids = [account_a.id, account_b.id]
+    accounts = client.lookup_accounts(account_ids)
+    accounts_array = client.submit(tb.Operation.LOOKUP_ACCOUNTS, account_ids,
+                                   result_format=tb.ResultFormat.NUMPY)
+    assert accounts_array.dtype == tb.numpy_dtype(tb.bindings.CAccount)
+    assert len(accounts_array) == 2
+    assert [int(low) for low, _ in accounts_array["id"]] == account_ids
+    assert list(accounts_array["code"]) == [account.code for account in accounts]
+    assert list(accounts_array["timestamp"]) == [account.timestamp for account in accounts]
+
+    filter = tb.AccountFilter(
+        account_id=account_a.id,
+        user_data_128=0,
+        user_data_64=0,
+        user_data_32=0,
+        code=0,
+        timestamp_min=0,
+        timestamp_max=0,
+        limit=BATCH_MAX,
+        flags=tb.AccountFilterFlags.CREDITS | tb.AccountFilterFlags.DEBITS,
+    )
+    transfers = client.get_account_transfers(filter)
+    transfers_array = client.submit(tb.Operation.GET_ACCOUNT_TRANSFERS, [filter],
+                                    result_format=tb.ResultFormat.NUMPY)
+    assert len(transfers_array) == len(transfers) > 0
+    assert list(transfers_array["timestamp"]) == [transfer.timestamp for transfer in transfers]
+    assert [int(low) | (int(high) << 64) for low, high in transfers_array["amount"]] == \
+        [transfer.amount for transfer in transfers]
+
+    empty = client.submit(tb.Operation.LOOKUP_ACCOUNTS, [], result_format=tb.ResultFormat.NUMPY)
+    assert isinstance(empty, np.ndarray) and len(empty) == 0
+
+def test_result_format_views(client):
+    accounts = client.lookup_accounts([account_a.id, account_b.id])
+    account_views = client.submit(tb.Operation.LOOKUP_ACCOUNTS, [account_a.id, account_b.id],
+                                  result_format=tb.ResultFormat.VIEWS)
+    assert isinstance(account_views, tb.RecordViews)
+    assert len(account_views) == 2
+
+    view = account_views[0]
+    assert "credits_posted" not in view.__dict__
+    assert view.credits_posted == accounts[0].credits_posted
+    assert "credits_posted" in view.__dict__
+    assert view.id == account_a.id
+    assert view.flags == accounts[0].flags
+    assert isinstance(view.flags, tb.AccountFlags)
+    assert [view.to_python() for view in account_views] == accounts
+    assert account_views[-1].code == account_b.code
+    assert [view.id for view in account_views[1:]] == [account_b.id]
+
+    with pytest.raises(IndexError):
+        account_views[2]
+    with pytest.raises(AttributeError):
+        view.reserved
+    with pytest.raises(AttributeError):
+        view.code = 1
+
+def test_result_format_errors():
+    # Split into several requests, so the indexes of later ones are offset.
+    client = tb.ClientSync(cluster_id=0, replica_addresses=replica_addresses,
+                           batch_size_limit=10)
+    accounts = [replace(account_a, id=tb.id()) for _ in range(25)]
+    client.create_accounts(accounts[:3])
+    accounts[14] = replace(accounts[14], ledger=0)
+    accounts[21] = replace(accounts[21], code=0)
+
+    summary = client.submit(tb.Operation.CREATE_ACCOUNTS, accounts,
+                            result_format=tb.ResultFormat.ERRORS)
+    assert isinstance(summary, tb.CreateResultsSummary)
+    assert summary.created == 20
+    assert summary.exists == 3
+    assert summary.first_failure == 14
+    assert {index: result.status for index, result in summary.errors.items()} == {
+        0: tb.CreateAccountStatus.EXISTS,
+        1: tb.CreateAccountStatus.EXISTS,
+        2: tb.CreateAccountStatus.EXISTS,
+        14: tb.CreateAccountStatus.LEDGER_MUST_NOT_BE_ZERO,
+        21: tb.CreateAccountStatus.CODE_MUST_NOT_BE_ZERO,
+    }
+
+    summary = client.submit(tb.Operation.CREATE_ACCOUNTS, [replace(account_a, id=tb.id())],
+                            result_format=tb.ResultFormat.ERRORS)
+    assert summary == tb.CreateResultsSummary(created=1)
+
+    with pytest.raises(ValueError):
+        client.submit(tb.Operation.LOOKUP_ACCOUNTS, [accounts[0].id],
+                      result_format=tb.ResultFormat.ERRORS)
+    client.close()
+
+def test_batcher_sync(client, monkeypatch):
+    requests = []
+    submit = client._submit
+    def submit_counted(operation, operations, *args, **kwargs):
+        requests.append(len(operations))
+        return submit(operation, operations, *args, **kwargs)
+    monkeypatch.setattr(client, "_submit", submit_counted)
+
+    batcher = tb.BatcherSync(client, window=0.05)
+    callers = 16
+
+    def create_and_lookup(caller):
+        account = replace(account_a, id=tb.id())
+        # Every other caller submits a linked chain, which fails as a whole.
+        if caller % 2 == 0:
+            accounts = [account]
+            expected = []
+        else:
+            accounts = [
+                replace(account, flags=tb.AccountFlags.LINKED),
+                replace(account_a, id=tb.id(), ledger=0),
+            ]
+            expected = [
+                tb.CreateAccountStatus.LINKED_EVENT_FAILED,
+                tb.CreateAccountStatus.LEDGER_MUST_NOT_BE_ZERO,
+            ]
+
+        results = batcher.create_accounts(accounts)
+        assert len(results) == len(accounts)
+        assert [result.status for result in results if
+                result.status != tb.CreateAccountStatus.CREATED] == expected
+
+        found = batcher.lookup_accounts([tb.id(), account.id, account.id])
+        return [result.id for result in found] == ([account.id] * 2 if caller % 2 == 0 else [])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=callers) as executor:
+        assert all(executor.map(create_and_lookup, range(callers)))
+
+    # Each caller's duplicate id is only looked up once.
+    assert sum(requests) == (callers // 2) * 3 + callers * 2
+    assert len(requests) < callers * 2
+
+    # An open chain isn't merged with events from other callers.
+    results = batcher.create_accounts([replace(account_a, id=tb.id(), flags=tb.AccountFlags.LINKED)])
+    assert [result.status for result in results] == [tb.CreateAccountStatus.LINKED_EVENT_CHAIN_OPEN]
+
+    # An invalid event only fails its own caller.
+    def create(account):
+        return batcher.create_accounts([account])
+
+    accounts = [replace(account_a, id=tb.id()) for _ in range(4)]
+    accounts[2] = replace(accounts[2], code=2**16)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(accounts)) as executor:
+        futures = [executor.submit(create, account) for account in accounts]
+    with pytest.raises(tb.IntegerOverflowError):
+        futures[2].result()
+    for index in (0, 1, 3):
+        assert [result.status for result in futures[index].result()] == \
+            [tb.CreateAccountStatus.CREATED]
+
+def test_batcher_async():
+    async def run():
+        client = tb.ClientAsync(cluster_id=0, replica_addresses=replica_addresses)
+        requests = []
+        submit = client._submit
+        async def submit_counted(operation, operations, *args, **kwargs):
+            requests.append(len(operations))
+            return await submit(operation, operations, *args, **kwargs)
+        client._submit = submit_counted
+
+        batcher = tb.BatcherAsync(client)
+        accounts = [replace(account_a, id=tb.id()) for _ in range(8)]
+        accounts[3] = replace(accounts[3], ledger=0)
+
+        results = await asyncio.gather(*[
+            batcher.create_accounts([account]) for account in accounts
+        ])
+        assert [[result.status for result in caller_results] for caller_results in results] == [
+            [tb.CreateAccountStatus.LEDGER_MUST_NOT_BE_ZERO] if index == 3 else
+            [tb.CreateAccountStatus.CREATED]
+            for index in range(len(accounts))
+        ]
+        assert requests == [len(accounts)]
+
+        found = await asyncio.gather(*[
+            batcher.lookup_accounts([account.id]) for account in accounts
+        ])
+        assert [[account.id for account in caller_found] for caller_found in found] == [
+            [] if index == 3 else [account.id] for index, account in enumerate(accounts)
+        ]
+        assert requests == [len(accounts)] * 2
+
+        # Overlapping lookups send each id once, and every caller gets its own results.
+        ids = [account.id for account in accounts]
+        found = await asyncio.gather(
+            batcher.lookup_accounts(ids[:3]),
+            batcher.lookup_accounts(ids[2:5] + ids[2:3]),
+            batcher.lookup_accounts(ids[4:]),
+        )
+        assert [[account.id for account in caller_found] for caller_found in found] == \
+            [ids[:3], ids[2:3] + ids[4:5] + ids[2:3], ids[4:]]
+        assert requests[2] == len(accounts)
+        del requests[2]
+
+        # An open chain is sent straight away, without waiting for the rest of the batch.
+        linked = replace(account_a, id=tb.id(), flags=tb.AccountFlags.LINKED)
+        results = await asyncio.gather(
+            batcher.create_accounts([linked]),
+            batcher.create_accounts([replace(account_a, id=tb.id())]),
+        )
+        assert [result.status for result in results[0]] == [
+            tb.CreateAccountStatus.LINKED_EVENT_CHAIN_OPEN,
+        ]
+        assert [result.status for result in results[1]] == [tb.CreateAccountStatus.CREATED]
+        assert requests[2:] == [1, 1]
+
+        # An invalid event only fails its own caller.
+        accounts = [replace(account_a, id=tb.id()) for _ in range(4)]
+        accounts[2] = replace(accounts[2], code=2**16)
+        results = await asyncio.gather(*[
+            batcher.create_accounts([account]) for account in accounts
+        ], return_exceptions=True)
+        assert isinstance(results[2], tb.IntegerOverflowError)
+        assert [[result.status for result in results[index]] for index in (0, 1, 3)] == \
+            [[tb.CreateAccountStatus.CREATED]] * 3
+        assert requests[4:] == [3]
+
+        await client.close()
+
+    asyncio.run(run())
+
+def test_split_oversized_batches(monkeypatch):
+    client = tb.ClientSync(cluster_id=0, replica_addresses=replica_addresses,
+                           batch_size_limit=10, split_concurrency=2)
+    requests = []
+    inflight = []
+    start = client._start
+    def start_counted(operation, operations, *args, **kwargs):
+        requests.append(len(operations))
+        inflight.append(len(client._inflight_packets))
+        return start(operation, operations, *args, **kwargs)
+    monkeypatch.setattr(client, "_start", start_counted)
+
+    accounts = [replace(account_a, id=tb.id()) for _ in range(35)]
+    # A linked chain across the first split point fails as a whole.
+    for index in range(7, 12):
+        accounts[index] = replace(accounts[index], flags=tb.AccountFlags.LINKED)
+    accounts[12] = replace(accounts[12], ledger=0)
+
+    results = client.create_accounts(accounts)
+    assert requests == [7, 10, 10, 8]
+    assert len(results) == len(accounts)
+    assert [result.status for result in results[7:13]] == \
+        [tb.CreateAccountStatus.LINKED_EVENT_FAILED] * 5 + \
+        [tb.CreateAccountStatus.LEDGER_MUST_NOT_BE_ZERO]
+    assert all(result.status == tb.CreateAccountStatus.CREATED for result in
+               results[:7] + results[13:])
+
+    ids = [account.id for account in accounts]
+    found = client.lookup_accounts(ids)
+    assert [account.id for account in found] == ids[:7] + ids[13:]
+    found_views = client.submit(tb.Operation.LOOKUP_ACCOUNTS, ids,
+                                result_format=tb.ResultFormat.VIEWS)
+    assert [view.to_python() for view in found_views] == found
+
+    # Futures keep to split_concurrency too.
+    requests.clear()
+    inflight.clear()
+    found_future = client.submit_future(tb.Operation.LOOKUP_ACCOUNTS, ids)
+    assert found_future.result() == found
+    assert requests == [10, 10, 10, 5]
+    assert max(inflight) < 2
+
+    # An invalid event fails the whole batch before any of it is submitted.
+    requests.clear()
+    accounts = [replace(account_a, id=tb.id()) for _ in range(25)]
+    accounts[24] = replace(accounts[24], code=2**16)
+    with pytest.raises(tb.IntegerOverflowError, match=r"events\[24\]"):
+        client.create_accounts(accounts)
+    assert requests == []
+    assert client.lookup_accounts([account.id for account in accounts]) == []
+
+    client.close()
+
+def test_split_oversized_batches_async():
+    async def run():
+        client = tb.ClientAsync(cluster_id=0, replica_addresses=replica_addresses,
+                                batch_size_limit=10)
+        accounts = [replace(account_a, id=tb.id()) for _ in range(25)]
+        results = await client.create_accounts(accounts)
+        assert [result.status for result in results] == \
+            [tb.CreateAccountStatus.CREATED] * len(accounts)
+
+        found = await client.lookup_accounts([account.id for account in accounts])
+        assert [account.id for account in found] == [account.id for account in accounts]
+
+        await client.close()
+
+    asyncio.run(run())
+
+def test_submit_many(client):
+    accounts = [replace(account_a, id=tb.id()) for _ in range(20)]
+    taken = []
+    def requests():
+        for index in range(0, len(accounts), 4):
+            taken.append(index)
+            yield tb.Operation.CREATE_ACCOUNTS, accounts[index:index + 4]
+        yield tb.Operation.LOOKUP_ACCOUNTS, [account.id for account in accounts]
+
+    results = client.submit_many(requests(), inflight_max=2)
+    assert taken == []
+
+    for index in range(0, len(accounts), 4):
+        assert [result.status for result in next(results)] == [tb.CreateAccountStatus.CREATED] * 4
+        # Only up to inflight_max requests are taken ahead of the results consumed.
+        assert len(taken) <= index // 4 + 2
+    assert [account.id for account in next(results)] == [account.id for account in accounts]
+    with pytest.raises(StopIteration):
+        next(results)
+
+    # An error is yielded in place of its request's results, and the requests after it carry on.
+    results = list(client.submit_many([
+        (tb.Operation.LOOKUP_ACCOUNTS, [accounts[0].id]),
+        (tb.Operation.LOOKUP_ACCOUNTS, [-1]),
+        (tb.Operation.LOOKUP_ACCOUNTS, [accounts[1].id]),
+        # Too large for a single request, so encoded before any of it is submitted.
+        (tb.Operation.LOOKUP_ACCOUNTS, [accounts[2].id] * tb.BATCH_MAX + [-1]),
+        (tb.Operation.LOOKUP_ACCOUNTS, [accounts[3].id]),
+    ], inflight_max=2))
+    assert len(results) == 5
+    assert [account.id for account in results[0]] == [accounts[0].id]
+    assert isinstance(results[1], tb.IntegerOverflowError)
+    assert [account.id for account in results[2]] == [accounts[1].id]
+    assert isinstance(results[3], tb.IntegerOverflowError)
+    assert [account.id for account in results[4]] == [accounts[3].id]
+    assert len(client._inflight_packets) == 0
+
+    # An error from the requests themselves ends the iteration, after the results before it.
+    def failing_requests():
+        yield tb.Operation.LOOKUP_ACCOUNTS, [accounts[0].id]
+        yield tb.Operation.LOOKUP_ACCOUNTS, [accounts[1].id]
+        raise RuntimeError("requests failed")
+
+    results = client.submit_many(failing_requests(), inflight_max=4)
+    assert [account.id for account in next(results)] == [accounts[0].id]
+    assert [account.id for account in next(results)] == [accounts[1].id]
+    with pytest.raises(RuntimeError):
+        next(results)
+    assert len(client._inflight_packets) == 0
+
+def test_futures(client):
+    accounts_future = client.lookup_accounts_future([account_a.id, account_b.id])
+    balances_future = client.get_account_balances_future(tb.AccountFilter(
+        account_id=account_a.id,
+        user_data_128=0,
+        user_data_64=0,
+        user_data_32=0,
+        code=0,
+        timestamp_min=0,
+        timestamp_max=0,
+        limit=BATCH_MAX,
+        flags=tb.AccountFilterFlags.CREDITS | tb.AccountFilterFlags.DEBITS,
+    ))
+    assert isinstance(accounts_future, concurrent.futures.Future)
+    assert not accounts_future.cancel()
+
+    accounts = accounts_future.result()
+    assert [account.id for account in accounts] == [account_a.id, account_b.id]
+    assert isinstance(balances_future.result(), list)
+    assert len(client._inflight_packets) == 0
+
+    # Oversized batches are split, and resolve a single future.
+    client._batch_size_limit = 2
+    ids = [account_a.id, tb.id(), account_b.id, account_a.id, account_b.id]
+    found = client.lookup_accounts_future(ids).result()
+    assert [account.id for account in found] == [account_a.id, account_b.id] * 2
+
+    results = client.submit_future(tb.Operation.LOOKUP_ACCOUNTS, [account_a.id],
+                                   result_format=tb.ResultFormat.VIEWS).result()
+    assert results[0].id == account_a.id
+
+def test_iter_transfers(client, monkeypatch):
+    accounts = [replace(account_a, id=tb.id()), replace(account_b, id=tb.id())]
+    assert all(result.status == tb.CreateAccountStatus.CREATED for result in
+               client.create_accounts(accounts))
+
+    code = 4242
+    transfers = [tb.Transfer(
+        id=tb.id(),
+        debit_account_id=accounts[0].id,
+        credit_account_id=accounts[1].id,
+        amount=1,
+        ledger=1,
+        code=code,
+    ) for _ in range(25)]
+    assert all(result.status == tb.CreateTransferStatus.CREATED for result in
+               client.create_transfers(transfers))
+    ids = [transfer.id for transfer in transfers]
+
+    filter = tb.AccountFilter(
+        account_id=accounts[0].id,
+        user_data_128=0,
+        user_data_64=0,
+        user_data_32=0,
+        code=0,
+        timestamp_min=0,
+        timestamp_max=0,
+        limit=1,
+        flags=tb.AccountFilterFlags.DEBITS,
+    )
+    assert [transfer.id for transfer in client.iter_account_transfers(filter, page_size=10)] == ids
+    assert [transfer.id for transfer in client.iter_account_transfers(filter)] == ids
+
+    filter = replace(filter, flags=filter.flags | tb.AccountFilterFlags.REVERSED)
+    assert [transfer.id for transfer in client.iter_account_transfers(filter, page_size=5)] == \
+        ids[::-1]
+
+    query_filter = tb.QueryFilter(
+        user_data_128=0,
+        user_data_64=0,
+        user_data_32=0,
+        ledger=1,
+        code=code,
+        timestamp_min=0,
+        timestamp_max=0,
+        limit=1,
+        flags=tb.QueryFilterFlags.NONE,
+    )
+    assert [transfer.id for transfer in
+            client.iter_query_transfers(query_filter, page_size=10)][-len(ids):] == ids
+
+    # Abandoning the iterator part way leaves nothing behind.
+    iterator = client.iter_query_transfers(query_filter, page_size=10)
+    next(iterator)
+    iterator.close()
+
+    # A page shorter than page_size, as when the cluster caps its reply, isn't the last one.
+    submit_future = client._submit_future
+    def submit_future_capped(operation, operations, *args, **kwargs):
+        operations = [replace(operations[0], limit=min(operations[0].limit, 3))]
+        return submit_future(operation, operations, *args, **kwargs)
+    monkeypatch.setattr(client, "_submit_future", submit_future_capped)
+    assert [transfer.id for transfer in client.iter_account_transfers(filter, page_size=10)] == \
+        ids[::-1]
+    monkeypatch.undo()
+
+    async def run():
+        client = tb.ClientAsync(cluster_id=0, replica_addresses=replica_addresses)
+        found = [transfer.id async for transfer in
+                 client.iter_account_transfers(filter, page_size=7)]
+        assert found == ids[::-1]
+        await client.close()
+
+    asyncio.run(run())
+
+def test_export_transfers(client):
+    accounts = [replace(account_a, id=tb.id()), replace(account_b, id=tb.id())]
+    client.create_accounts(accounts)
+    code = 4343
+    transfers = [tb.Transfer(
+        id=tb.id(),
+        debit_account_id=accounts[0].id,
+        credit_account_id=accounts[1].id,
+        amount=1,
+        ledger=1,
+        code=code,
+    ) for _ in range(30)]
+    assert all(result.status == tb.CreateTransferStatus.CREATED for result in
+               client.create_transfers(transfers))
+    ids = [transfer.id for transfer in transfers]
+
+    query_filter = tb.QueryFilter(
+        user_data_128=0,
+        user_data_64=0,
+        user_data_32=0,
+        ledger=1,
+        code=code,
+        timestamp_min=0,
+        timestamp_max=0,
+        limit=1,
+        flags=tb.QueryFilterFlags.NONE,
+    )
+
+    async def export(query_filter, **kwargs):
+        client = tb.ClientAsync(cluster_id=0, replica_addresses=replica_addresses)
+        exported = [transfer.id async for transfer in
+                    client.export_transfers(query_filter, page_size=3, **kwargs)]
+        await client.close()
+        return exported
+
+    assert asyncio.run(export(query_filter, slices=4, concurrency=2)) == ids
+    assert asyncio.run(export(query_filter, slices=100)) == ids
+    assert sorted(asyncio.run(export(query_filter, slices=5, ordered=False))) == sorted(ids)
+
+    reversed_filter = replace(query_filter, flags=tb.QueryFilterFlags.REVERSED)
+    assert asyncio.run(export(reversed_filter, slices=3)) == ids[::-1]
+
+    empty_filter = replace(query_filter, code=code + 1)
+    assert asyncio.run(export(empty_filter)) == []
+
+    # Abandoning the export part way leaves nothing behind.
+    async def export_partially():
+        client = tb.ClientAsync(cluster_id=0, replica_addresses=replica_addresses)
+        exported = client.export_transfers(query_filter, page_size=2, slices=5)
+        assert (await exported.__anext__()).id == ids[0]
+        await exported.aclose()
+        await client.close()
+
+    asyncio.run(export_partially())
+
+def test_get_change_events(client, monkeypatch):
+    accounts = [replace(account_a, id=tb.id()), replace(account_b, id=tb.id())]
+    client.create_accounts(accounts)
+
+    def create_transfers(count):
+        transfers = [tb.Transfer(
+            id=tb.id(),
+            debit_account_id=accounts[0].id,
+            credit_account_id=accounts[1].id,
+            amount=1,
+            ledger=1,
+            code=1,
+        ) for _ in range(count)]
+        results = client.create_transfers(transfers)
+        assert all(result.status == tb.CreateTransferStatus.CREATED for result in results)
+        return transfers, results[0].timestamp
+
+    transfers, timestamp_min = create_transfers(3)
+    events = client.get_change_events(tb.ChangeEventsFilter(
+        timestamp_min=timestamp_min,
+        timestamp_max=0,
+        limit=tb.CHANGE_EVENTS_MAX,
+    ))
+    assert [event.transfer_id for event in events] == [transfer.id for transfer in transfers]
+    assert events[0].type == tb.ChangeEventType.SINGLE_PHASE
+    assert events[-1].debit_account_id == accounts[0].id
+    assert events[-1].debit_account_debits_posted == 3
+
+    # Following the stream backs off while idle, until new events arrive.
+    delays = []
+    more_transfers = []
+    def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 4:
+            more_transfers.extend(create_transfers(2)[0])
+    monkeypatch.setattr(tb.client.time, "sleep", sleep)
+
+    checkpoints = []
+    stream = client.iter_change_events(timestamp_min=timestamp_min, idle_interval=0.01,
+                                       idle_interval_max=0.04, checkpoint=checkpoints.append)
+    assert [event.transfer_id for event in itertools.islice(stream, 3)] == \
+        [transfer.id for transfer in transfers]
+    assert checkpoints == []
+
+    assert [event.transfer_id for event in itertools.islice(stream, 2)] == \
+        [transfer.id for transfer in more_transfers]
+    assert checkpoints == [events[-1].timestamp]
+    assert delays == [0.01, 0.02, 0.04, 0.04]
+    stream.close()
+
+def test_get_change_events_concurrent(client):
+    # tb_client only allows one get_change_events request in flight: the client queues the others.
+    accounts = [replace(account_a, id=tb.id()), replace(account_b, id=tb.id())]
+    client.create_accounts(accounts)
+    transfer = tb.Transfer(id=tb.id(), debit_account_id=accounts[0].id,
+                           credit_account_id=accounts[1].id, amount=1, ledger=1, code=1)
+    results = client.create_transfers([transfer])
+    change_events_filter = tb.ChangeEventsFilter(timestamp_min=results[0].timestamp,
+                                                 timestamp_max=0, limit=1)
+
+    futures = [client.get_change_events_future(change_events_filter) for _ in range(4)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        futures += [executor.submit(client.get_change_events, change_events_filter)
+                    for _ in range(4)]
+    for future in futures:
+        assert [event.transfer_id for event in future.result()] == [transfer.id]
+
+    # The queued requests are all submitted by a single thread.
+    assert [thread.name for thread in threading.enumerate()].count("tigerbeetle-change-events") <= 1
+
+def test_get_change_events_concurrent_async(client):
+    results = client.create_accounts([replace(account_a, id=tb.id())])
+    change_events_filter = tb.ChangeEventsFilter(timestamp_min=results[0].timestamp,
+                                                 timestamp_max=0, limit=1)
+
+    async def run():
+        async with tb.ClientAsync(cluster_id=0, replica_addresses=replica_addresses) as client:
+            return await asyncio.gather(*[
+                client.get_change_events(change_events_filter) for _ in range(4)
+            ])
+
+    assert asyncio.run(run()) == [[]] * 4
+
+def test_account_cache(client, monkeypatch):
+    accounts = [replace(account_a, id=tb.id()), replace(account_b, id=tb.id())]
+    client.create_accounts(accounts)
+    ids = [account.id for account in accounts]
+
+    lookups = []
+    lookup_accounts = client.lookup_accounts
+    def lookup_accounts_counted(ids):
+        lookups.append(ids)
+        return lookup_accounts(ids)
+    monkeypatch.setattr(client, "lookup_accounts", lookup_accounts_counted)
+
+    cache = tb.AccountCache(client, maxsize=1)
+    assert cache.lookup_accounts(ids + [tb.id()]) == lookup_accounts(ids)
+    assert cache.lookup_accounts(ids[1:]) == lookup_accounts(ids[1:])
+    # Only one account's balances fit, but the immutable fields are kept.
+    assert [account.id for account in cache.lookup_immutable(ids)] == ids
+    assert cache.lookup_accounts(ids[:1]) == lookup_accounts(ids[:1])
+    assert len(lookups) == 2
+    assert cache.stats() == tb.AccountCacheStats(hits=3, misses=4, evictions=2)
+
+    # Change events invalidate the balances of both accounts involved.
+    result = client.create_transfers([tb.Transfer(
+        id=tb.id(),
+        debit_account_id=ids[0],
+        credit_account_id=ids[1],
+        amount=7,
+        ledger=1,
+        code=1,
+    )])[0]
+    cache.apply_change_events(client.get_change_events(tb.ChangeEventsFilter(
+        timestamp_min=result.timestamp,
+        timestamp_max=result.timestamp,
+        limit=1,
+    )))
+    assert cache.stats().invalidations == 1
+    assert cache.lookup_accounts(ids[:1])[0].debits_posted == 7
+    assert len(lookups) == 3
+
+    # Concurrent misses for the same account are coalesced.
+    cache = tb.AccountCache(client, ttl=60)
+    started = threading.Event()
+    def lookup_accounts_slow(ids):
+        started.set()
+        time.sleep(0.1)
+        return lookup_accounts_counted(ids)
+    monkeypatch.setattr(client, "lookup_accounts", lookup_accounts_slow)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(cache.lookup_accounts, ids)
+        started.wait()
+        others = [executor.submit(cache.lookup_accounts, ids[:1]) for _ in range(3)]
+        assert [account.id for account in first.result()] == ids
+        assert all([account.id for account in other.result()] == ids[:1] for other in others)
+    assert lookups[3:] == [ids]
+    assert cache.stats().coalesced == 3
+
+def test_packet_pool():
+    with tb.ClientSync(cluster_id=0, replica_addresses=replica_addresses) as client:
+        accounts = [replace(account_a, id=tb.id()) for _ in range(20)]
+        results = client.create_accounts(accounts[:2])
+        assert [account.id for account in client.lookup_accounts([accounts[0].id])] == \
+            [accounts[0].id]
+        # Reuses the packet and the buffer of the first request, which held fewer events.
+        results += client.create_accounts(accounts[2:12])
+        results += client.create_accounts_future(accounts[12:20]).result()
+        assert all(result.status == tb.CreateAccountStatus.CREATED for result in results)
+        assert client.lookup_accounts([account.id for account in accounts]) == [
+            replace(account, timestamp=result.timestamp)
+            for account, result in zip(accounts, results)
+        ]
+        assert client.lookup_accounts([accounts[0].id])[0].id == accounts[0].id
+        assert client.pool_stats() == tb.PoolStats(
+            packet_hits=5, packet_misses=1, buffer_hits=3, buffer_misses=3)
+
+    async def submit_async():
+        async with tb.ClientAsync(cluster_id=0, replica_addresses=replica_addresses,
+                                  packet_pool_size=1, buffer_pool_size=0) as client:
+            await asyncio.gather(*[client.lookup_accounts([accounts[0].id]) for _ in range(4)])
+            assert (await client.lookup_accounts([accounts[0].id]))[0].id == accounts[0].id
+            return client.pool_stats()
+    assert asyncio.run(submit_async()) == tb.PoolStats(
+        packet_hits=1, packet_misses=4, buffer_hits=0, buffer_misses=5)
+
+def test_request_metrics():
+    registry = tb.MetricsRegistry()
+    requests = []
+    def on_request(metrics):
+        requests.append(metrics)
+        registry.record(metrics)
+        raise Exception("logged, and otherwise ignored")
+
+    with tb.ClientSync(cluster_id=0, replica_addresses=replica_addresses,
+                       on_request=on_request) as client:
+        accounts = [replace(account_a, id=tb.id()) for _ in range(3)]
+        results = client.create_accounts(accounts)
+        client.lookup_accounts([accounts[0].id])
+        client.lookup_accounts_future([accounts[1].id]).result()
+
+    assert [(metrics.operation, metrics.batch_size, metrics.status) for metrics in requests] == [
+        (tb.Operation.CREATE_ACCOUNTS, 3, tb.PacketStatus.OK),
+        (tb.Operation.LOOKUP_ACCOUNTS, 1, tb.PacketStatus.OK),
+        (tb.Operation.LOOKUP_ACCOUNTS, 1, tb.PacketStatus.OK),
+    ]
+    assert requests[0].timestamp >= results[-1].timestamp
+    assert all(metrics.encode_ns > 0 and metrics.latency_ns > 0 and metrics.decode_ns > 0
+               for metrics in requests)
+
+    snapshot = registry.snapshot()
+    assert snapshot[tb.Operation.LOOKUP_ACCOUNTS].requests == 2
+    assert snapshot[tb.Operation.LOOKUP_ACCOUNTS].events == 2
+    assert snapshot[tb.Operation.CREATE_ACCOUNTS].errors == 0
+    assert sum(snapshot[tb.Operation.CREATE_ACCOUNTS].latency_buckets) == 1
+
+    exposition = registry.exposition()
+    assert 'tigerbeetle_requests_total{operation="lookup_accounts"} 2\n' in exposition
+    assert 'tigerbeetle_request_latency_seconds_bucket{operation="create_accounts",le="+Inf"} 1\n' \
+        in exposition
+
+    # Each request of a split list gets a share of the time spent packing the whole list.
+    requests.clear()
+    with tb.ClientSync(cluster_id=0, replica_addresses=replica_addresses,
+                       batch_size_limit=10, on_request=on_request) as client:
+        client.create_accounts([replace(account_a, id=tb.id()) for _ in range(25)])
+    assert sorted(metrics.batch_size for metrics in requests) == [5, 10, 10]
+    assert all(metrics.encode_ns > 0 for metrics in requests)
+
+def test_echo_client():
+    with tb.ClientSync.echo() as client:
+        transfers = [tb.Transfer(id=tb.id(), amount=1) for _ in range(3)]
+        results = client.create_transfers(transfers)
+        assert [result.status for result in results] == [tb.CreateTransferStatus.CREATED] * 3
+        assert results[0].timestamp < results[1].timestamp < results[2].timestamp
+
+        ids = [1, 2**128 - 1]
+        accounts = client.lookup_accounts(ids)
+        assert [account.id for account in accounts] == ids
+        assert all(account.ledger == 1 and account.timestamp > 0 for account in accounts)
+        assert client.query_transfers(tb.QueryFilter(
+            user_data_128=0, user_data_64=0, user_data_32=0, ledger=1, code=0, timestamp_min=0,
+            timestamp_max=0, limit=10, flags=tb.QueryFilterFlags.NONE)) == []
+
+    # Without a reply, the events themselves are decoded.
+    with tb.ClientSync.echo(reply=None) as client:
+        assert client.lookup_accounts(ids) == ids
+        assert client.create_transfers(transfers) == transfers
+
+    def reply(operation, events):
+        assert operation == tb.Operation.CREATE_ACCOUNTS
+        assert events == bytes(tb.bindings.CAccount.from_param(account_a))
+        return bytes(tb.bindings.CCreateAccountResult(timestamp=1,
+                                                      status=tb.CreateAccountStatus.EXISTS))
+
+    async def create_async():
+        async with tb.ClientAsync.echo(reply=reply, batch_size_limit=1) as client:
+            return await client.create_accounts([account_a])
+    assert asyncio.run(create_async()) == [
+        tb.CreateAccountResult(timestamp=1, status=tb.CreateAccountStatus.EXISTS)]
+
+def test_log_buffer(caplog):
+    caplog.set_level(logging.DEBUG, logger="tigerbeetle")
+    tb.configure_logging(debug=True, buffer_size=1024)
+    try:
+        tb.ClientSync.echo().close()
+    finally:
+        # Drains the buffer.
+        tb.configure_logging(debug=True)
+    records = [record for record in caplog.records if "init:" in record.getMessage()]
+    assert len(records) > 0
+    assert all(record.threadName == "tigerbeetle-log" for record in records)
+
+    # Once full, the oldest messages are dropped (how many depends on how soon the buffer is
+    # drained), and counted.
+    caplog.clear()
+    log_buffer = tb.client._LogBuffer(2)
+    for message in [b"one", b"two", b"three", b"four"]:
+        log_buffer._append(tb.LogLevel.INFO, message, len(message))
+    log_buffer.stop()
+    messages = [record.getMessage() for record in caplog.records]
+    logged = [message for message in messages if not message.startswith("dropped")]
+    dropped = sum(int(message.split()[1]) for message in messages if message.startswith("dropped"))
+    assert logged[-2:] == ["three", "four"]
+    assert len(logged) + dropped == 4
+
+def test_log_debug_level_change(caplog):
+    """The default handler follows the logger crossing DEBUG after the first client exists."""
+    caplog.set_level(logging.INFO, logger="tigerbeetle")
+    # As if `configure_logging` had not been called, and the first client registered the handler.
+    tb.client._log_debug = False
+    try:
+        with tb.ClientSync.echo() as client:
+            client.lookup_accounts([1])
+            assert tb.client._log_debug is False
+
+            caplog.set_level(logging.DEBUG, logger="tigerbeetle")
+            client.lookup_accounts([1])
+            assert tb.client._log_debug is True
+
+            caplog.set_level(logging.INFO, logger="tigerbeetle")
+            client.lookup_accounts([1])
+            assert tb.client._log_debug is False
+    finally:
+        tb.configure_logging(debug=True)
+    assert tb.client._log_debug is None
+
+def test_atomic_integer():
+    """Increments from multiple threads are unique, and all counted, whenever the value is read."""
+    counter = tb.client.AtomicInteger()
+    samples = [[] for _ in range(8)]
+
+    def increment(thread_samples):
+        for index in range(1000):
+            thread_samples.append(counter.increment())
+            if index % 100 == 0:
+                assert counter.value() <= 8 * 1000
+
+    threads = [threading.Thread(target=increment, args=(s,)) for s in samples]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for thread_samples in samples:
+        assert thread_samples == sorted(thread_samples)
+    values = [value for thread_samples in samples for value in thread_samples]
+    assert len(set(values)) == 8 * 1000
+    assert counter.value() == 8 * 1000
+
+    # Reading the value doesn't change it.
+    assert counter.value() == 8 * 1000
+    assert counter.increment() == 8 * 1000 + 1
+    assert tb.client.AtomicInteger(41).value() == 41
+
 def test_accept_zero_length_create_accounts(client):
     results = client.create_accounts([])
     assert results == []
@@ -1495,3 +2439,52 @@ def test_ids_increasing():
         id = tb.id()
         assert id_previous < id
         id_previous = id
+
+def test_ids_batch():
+    """Batches of IDs are strictly increasing, and follow IDs generated before them."""
+    id_previous = tb.id()
+    for count in [0, 1, 2, 1_000]:
+        ids = tb.ids(count)
+        assert len(ids) == count
+        for id in ids:
+            assert id_previous < id
+            id_previous = id
+    assert id_previous < tb.id()
+
+def test_ids_threads():
+    """IDs generated concurrently from multiple threads are unique."""
+    samples = [[] for _ in range(8)]
+
+    def generate(thread_samples):
+        for _ in range(100):
+            thread_samples.append(tb.id())
+            thread_samples.extend(tb.ids(10))
+
+    threads = [threading.Thread(target=generate, args=(s,)) for s in samples]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for thread_samples in samples:
+        assert thread_samples == sorted(thread_samples)
+    ids = [id for thread_samples in samples for id in thread_samples]
+    assert len(ids) == len(set(ids)) == 8 * 100 * 11
+
+def test_ids_numpy():
+    np = pytest.importorskip("numpy")
+
+    id_previous = tb.id()
+    ids = tb.ids_numpy(1_000)
+    assert ids.shape == (1_000, 2)
+    assert ids.dtype == np.dtype("<u8")
+
+    ids_python = [int(low) | (int(high) << 64) for low, high in ids]
+    for id in ids_python:
+        assert id_previous < id
+        id_previous = id
+
+    transfers = np.zeros(1_000, dtype=tb.numpy_dtype(tb.bindings.CTransfer))
+    transfers["id"] = ids
+    assert [tb.bindings.CTransfer.from_buffer_copy(transfer.tobytes()).to_python().id
+            for transfer in transfers[:3]] == ids_python[:3]